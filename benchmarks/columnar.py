@@ -0,0 +1,134 @@
+"""Benchmark do caminho colunar (ROW_FORMAT 'arrow') x tuplas posicionais.
+
+Mede preparação + limpeza de NUL + codificação do COPY texto para uma tabela
+larga numérica e uma larga de texto (com NUL, espaços nas bordas e NULL).
+Com --target os dois resultados são gravados via COPY em um PostgreSQL e o
+conteúdo das tabelas é comparado, provando que os dados são os mesmos.
+
+Uso: python -m benchmarks.columnar [--rows N] [--columns C] [--repeat R]
+                                   [--target postgresql+psycopg2://...]
+"""
+import argparse
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import (
+    BigInteger, Column, Float, Integer, MetaData, Numeric, String, Table, create_engine, text
+)
+
+from src.infrastructure.loaders.arrow_copy_encoder import ArrowCopyEncoder
+from src.infrastructure.loaders.copy_encoder import TextCopyEncoder
+from src.infrastructure.processors.batch_processor import BatchProcessor
+from src.infrastructure.repositories.target_repository import TargetRepository
+from src.infrastructure.transformers.columnar_transformer import ColumnarTransformer
+from src.infrastructure.transformers.data_transformer import DataTransformer
+
+_KINDS = ('numeric', 'text')
+
+def _wide_table(metadata: MetaData, name: str, kind: str, columns: int) -> Table:
+    """Tabela só com números (inteiros, float, decimal) ou só com texto."""
+    types = [BigInteger, Float, Numeric(18, 4)] if kind == 'numeric' else [String(60)]
+    return Table(
+        name, metadata,
+        Column('id', Integer, primary_key=True),
+        *[Column(f"c{i}", types[i % len(types)]) for i in range(1, columns)]
+    )
+
+def _value(kind: str, row: int, position: int) -> Any:
+    if kind == 'numeric':
+        choice = position % 3
+        if choice == 0:
+            return row * position
+        return row / 7 if choice == 1 else Decimal(row * position) / 8
+    if (row + position) % 50 == 0:
+        return None
+    if (row + position) % 97 == 0:
+        return f" valor\x00 {row}-{position}\t"
+    return f"valor {row}-{position}\\x\n"
+
+def _source_rows(kind: str, rows: int, columns: int) -> List[tuple]:
+    """Linhas posicionais como o cursor entrega."""
+    return [(i, *[_value(kind, i, position) for position in range(1, columns)]) for i in range(rows)]
+
+def _best(step: Callable[[], Any], repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        step()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def _checksum(engine: Any, table: Table) -> str:
+    with engine.connect() as conn:
+        return conn.execute(text(
+            f"SELECT md5(string_agg(t::text, '|' ORDER BY t.id)) FROM {table.name} t"
+        )).scalar()
+
+def run(rows: int, columns: int, repeat: int,
+        target: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    processor = BatchProcessor(rows, DataTransformer())
+    transformer = DataTransformer()
+    columnar = ColumnarTransformer()
+    text_encoder = TextCopyEncoder()
+    arrow_encoder = ArrowCopyEncoder()
+    engine = create_engine(target) if target else None
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for kind in _KINDS:
+        metadata = MetaData()
+        table = _wide_table(metadata, f"bench_columnar_{kind}", kind, columns)
+        column_names = [col.name for col in table.columns]
+        batch = _source_rows(kind, rows, columns)
+
+        def row_path() -> List[Any]:
+            rows_data = processor.prepare_batch_rows(list(batch), len(column_names))
+            transformer.clean_batch(table, rows_data)
+            return rows_data
+
+        def arrow_path() -> Any:
+            return columnar.clean_batch(columnar.to_batch(table, batch))[0]
+
+        paths = {
+            'tuple': (row_path, lambda data: text_encoder.encode(data, column_names).read()),
+            'arrow': (arrow_path, lambda data: arrow_encoder.encode(data).read()),
+        }
+        for row_format, (prepare, encode) in paths.items():
+            seconds = _best(lambda: encode(prepare()), repeat)
+            results[f"{kind}/{row_format}"] = {'rows_per_second': rows / seconds, 'seconds': seconds}
+
+        if engine is not None:
+            checksums = []
+            repository = TargetRepository(engine)
+            for row_format, (prepare, _) in paths.items():
+                metadata.drop_all(engine)
+                metadata.create_all(engine)
+                if not repository.copy_batch(table, prepare()):
+                    raise RuntimeError(f"COPY falhou para {kind}/{row_format}")
+                checksums.append(_checksum(engine, table))
+            metadata.drop_all(engine)
+            results[f"{kind}/arrow"]['same_data'] = checksums[0] == checksums[1]
+
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--columns', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--target', help="URI do PostgreSQL para conferir os dados gravados")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.columns, args.repeat, args.target)
+    for case, result in results.items():
+        line = f"{case:<14} {result['rows_per_second']:>12,.0f} registros/s  {result['seconds']:.3f}s"
+        if 'same_data' in result:
+            line += f"  dados iguais: {'sim' if result['same_data'] else 'NÃO'}"
+        print(line)
+
+    for kind in _KINDS:
+        speedup = results[f"{kind}/arrow"]['rows_per_second'] / results[f"{kind}/tuple"]['rows_per_second']
+        print(f"{kind}: arrow {speedup:.2f}x o caminho por tuplas")
+
+if __name__ == "__main__":
+    main()
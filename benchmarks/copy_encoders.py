@@ -0,0 +1,84 @@
+"""Microbenchmark dos codificadores de COPY (texto x binário).
+
+Uso: python -m benchmarks.copy_encoders [--rows N] [--repeat R]
+"""
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import BigInteger, Boolean, Integer, Numeric, Text, LargeBinary
+from sqlalchemy.dialects.postgresql import TIMESTAMP
+
+from src.infrastructure.loaders.copy_encoder import TextCopyEncoder
+from src.infrastructure.loaders.binary_copy_encoder import BinaryCopyEncoder
+
+def _numeric_table(rows: int) -> Tuple[List[Any], List[Tuple[Any, ...]]]:
+    """Tabela com muitas colunas numéricas, como as de lançamentos financeiros."""
+    types = [BigInteger()] + [Numeric(18, 4)] * 8 + [Integer(), Boolean(), TIMESTAMP()]
+    start = datetime(2020, 1, 1)
+    data = [
+        (i,)
+        + tuple(Decimal(random.randint(-10**12, 10**12)).scaleb(-4) for _ in range(8))
+        + (random.randint(0, 10**6), bool(i % 2), start + timedelta(seconds=i))
+        for i in range(rows)
+    ]
+    return types, data
+
+def _varbinary_table(rows: int) -> Tuple[List[Any], List[Tuple[Any, ...]]]:
+    """Tabela com colunas VARBINARY (BYTEA) de alguns KB por linha."""
+    types = [BigInteger(), LargeBinary(), LargeBinary(), Text()]
+    data = [
+        (i, os.urandom(2048), os.urandom(512), f"documento-{i}")
+        for i in range(rows)
+    ]
+    return types, data
+
+def _measure(encode: Callable[[], Any], repeat: int) -> Tuple[float, int]:
+    """Retorna o melhor tempo entre as repetições e o tamanho do payload gerado."""
+    best = float('inf')
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        payload = encode().read()
+        best = min(best, time.perf_counter() - started)
+        size = len(payload)
+    return best, size
+
+def run(rows: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    random.seed(42)
+    results: Dict[str, Dict[str, float]] = {}
+
+    for name, build in (('numeric', _numeric_table), ('varbinary', _varbinary_table)):
+        types, data = build(rows)
+        column_names = [f"c{i}" for i in range(len(types))]
+        text_encoder = TextCopyEncoder()
+        binary_encoder = BinaryCopyEncoder(types)
+
+        for label, encoder in (('text', text_encoder), ('binary', binary_encoder)):
+            seconds, size = _measure(lambda: encoder.encode(data, column_names), repeat)
+            results[f"{name}/{label}"] = {
+                'rows_per_second': rows / seconds,
+                'megabytes': size / 1_000_000,
+                'seconds': seconds,
+            }
+
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for case, result in run(args.rows, args.repeat).items():
+        print(
+            f"{case:<18} {result['rows_per_second']:>12,.0f} registros/s"
+            f"  {result['megabytes']:>8.1f} MB  {result['seconds']:.3f}s"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Benchmark do pipeline completo (DataMigration) sobre dados sintéticos.
+
+Gera a origem com benchmarks.synthetic em um SQLite temporário, cria as
+tabelas no destino (outro SQLite temporário ou um PostgreSQL local) e migra
+os dados com a configuração MIGRATION_* do ambiente. Por tabela, mede os
+registros/s de cada estágio (fetch, transform, load) e o pico de RSS do
+processo enquanto a tabela é migrada; por fase (reflexão, criação, carga,
+finalização), a duração e o pico de RSS.
+
+O resultado pode ser gravado como baseline JSON. Com --compare a execução
+termina com código 1 se algum estágio ficou mais lento, ou alguma tabela
+usou mais memória, que a baseline além da tolerância.
+
+ATENÇÃO: com --target as tabelas sintéticas e as de controle da migração
+existentes no destino são apagadas; use um banco dedicado.
+
+Uso: python -m benchmarks.pipeline [--target URI] [--rows N] [--repeat R]
+     [--output resultado.json] [--save-baseline base.json]
+     [--compare base.json] [--tolerance 0.15]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import sqlalchemy
+from sqlalchemy import MetaData, create_engine
+from sqlalchemy.dialects.postgresql import BYTEA
+from sqlalchemy.ext.compiler import compiles
+
+from benchmarks.synthetic import build_schema, generate
+from src.application.services.data_migration import DataMigration
+from src.config.settings import Config
+from src.infrastructure.database.postgre_connection import PostgreConn
+from src.infrastructure.database.sql_server_connection import SQLServerConn
+from src.infrastructure.reporting.rss_sampler import RssSampler
+
+# Configuração que altera o resultado: uma comparação só vale com os mesmos valores
+_SETTINGS = (
+    'BATCH_SIZE', 'ADAPTIVE_BATCH', 'PAGINATION_MODE', 'EXTRACTION_MODE', 'LOAD_METHOD',
+    'ROW_FORMAT', 'PIPELINE_ENABLED', 'DEFERRED_CONSTRAINTS', 'UNLOGGED_TABLES', 'ERROR_MODE',
+    'BATCH_MEMORY_MB', 'BATCH_MAX_MB', 'LOB_INLINE_MB',
+)
+
+# Estágios mais curtos que isso na baseline são ruído de medição e não são comparados
+_MIN_COMPARED_SECONDS = 0.05
+
+@compiles(BYTEA, 'sqlite')
+def _bytea_on_sqlite(type_: BYTEA, compiler: Any, **kw: Any) -> str:
+    # Destino SQLite: os tipos do PostgreSQL sem equivalente direto viram BLOB
+    return 'BLOB'
+
+def _reset_target(target_uri: str) -> None:
+    """Apaga do destino as tabelas sintéticas e as tabelas de controle da migração."""
+    names = set(build_schema().tables) | {Config.CHECKPOINT_TABLE, Config.WATERMARK_TABLE}
+    engine = create_engine(target_uri)
+    try:
+        metadata = MetaData(schema=os.getenv("POSTGRES_SCHEMA"))
+        metadata.reflect(engine, only=lambda name, _: name in names)
+        metadata.drop_all(engine)
+    finally:
+        engine.dispose()
+
+def _migrate_once(source_uri: str, target_uri: str, expected: Dict[str, int]) -> Dict[str, Any]:
+    """Uma execução completa; devolve as métricas por tabela e por fase."""
+    sampler = RssSampler()
+    phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        with sampler.label(f"phase:{name}"):
+            yield
+        phases[name] = time.perf_counter() - started
+
+    sampler.start()
+    try:
+        with phase('reflect'):
+            src = SQLServerConn(source_uri)
+            src.get_db_metadata()
+            creation_order = src.repository.get_tables_in_order()
+            creation_order.reverse()
+        tgt = PostgreConn(target_uri)
+        with phase('create_tables'):
+            tgt.create_tables(src, creation_order, deferred=Config.DEFERRED_CONSTRAINTS,
+                              unlogged=Config.UNLOGGED_TABLES)
+        data_migration = DataMigration(src, tgt)
+        with phase('migrate'):
+            stats = data_migration.migrate_data()
+        if Config.DEFERRED_CONSTRAINTS or Config.UNLOGGED_TABLES:
+            with phase('finalize'):
+                tgt.finalize_tables(src, creation_order, stats['failed_tables'])
+        src.engine.dispose()
+        tgt.engine.dispose()
+    finally:
+        sampler.stop()
+
+    table_metrics = stats['table_metrics']
+    incomplete = [
+        table_name for table_name, count in expected.items()
+        if table_metrics.get(table_name, {}).get('records') != count
+    ]
+    if stats['failed_tables'] or incomplete:
+        raise RuntimeError(
+            f"Migração incompleta: falhas {stats['failed_tables']}, registros divergentes {incomplete}"
+        )
+
+    tables = {}
+    for table_name, metrics in table_metrics.items():
+        tables[table_name] = {
+            'records': metrics['records'],
+            'rows_per_second': metrics['records'] / metrics['seconds'] if metrics['seconds'] else None,
+            'peak_rss_mb': metrics.get('peak_rss_bytes', 0) / 1_000_000,
+            'stages': {
+                stage: {
+                    'rows_per_second': stage_metrics['rows'] / stage_metrics['seconds']
+                    if stage_metrics['seconds'] else None,
+                    'seconds': stage_metrics['seconds'],
+                }
+                for stage, stage_metrics in metrics['stages'].items()
+            },
+        }
+    return {
+        'tables': tables,
+        'phases': {
+            name: {'seconds': seconds, 'peak_rss_mb': sampler.peak_megabytes(f"phase:{name}")}
+            for name, seconds in phases.items()
+        },
+    }
+
+def _best(a: Optional[float], b: Optional[float], higher: bool) -> Optional[float]:
+    if a is None or b is None:
+        return a if b is None else b
+    return max(a, b) if higher else min(a, b)
+
+def _merge_best(best: Optional[Dict[str, Any]], result: Dict[str, Any]) -> Dict[str, Any]:
+    """Melhor valor de cada métrica entre as repetições (maior vazão, menor tempo e memória)."""
+    if best is None:
+        return result
+    for table_name, metrics in result['tables'].items():
+        current = best['tables'][table_name]
+        current['rows_per_second'] = _best(current['rows_per_second'], metrics['rows_per_second'], True)
+        current['peak_rss_mb'] = _best(current['peak_rss_mb'], metrics['peak_rss_mb'], False)
+        for stage, stage_metrics in metrics['stages'].items():
+            current_stage = current['stages'].setdefault(stage, stage_metrics)
+            current_stage['rows_per_second'] = _best(
+                current_stage['rows_per_second'], stage_metrics['rows_per_second'], True
+            )
+            current_stage['seconds'] = _best(current_stage['seconds'], stage_metrics['seconds'], False)
+    for name, metrics in result['phases'].items():
+        current = best['phases'][name]
+        current['seconds'] = _best(current['seconds'], metrics['seconds'], False)
+        current['peak_rss_mb'] = _best(current['peak_rss_mb'], metrics['peak_rss_mb'], False)
+    return best
+
+def run(rows: int, repeat: int, target_uri: Optional[str] = None, seed: int = 42,
+        columns: int = 60) -> Dict[str, Any]:
+    """Gera a origem, migra repeat vezes e devolve o melhor resultado de cada métrica."""
+    # Execução isolada: sem relatório de métricas nem snapshot de reflexão entre as repetições
+    Config.METRICS_REPORT = ''
+    Config.METRICS_PROMETHEUS_FILE = ''
+    Config.REFLECTION_SNAPSHOT = ''
+    # Uma tabela por vez, para o pico de RSS ser atribuído à tabela certa
+    Config.WORKERS = 1
+
+    workdir = tempfile.mkdtemp(prefix='migration-bench-')
+    try:
+        source_uri = f"sqlite:///{os.path.join(workdir, 'source.db')}"
+        expected = generate(source_uri, rows, seed, columns)
+        best: Optional[Dict[str, Any]] = None
+        for attempt in range(repeat):
+            if target_uri:
+                _reset_target(target_uri)
+                uri = target_uri
+            else:
+                uri = f"sqlite:///{os.path.join(workdir, f'target_{attempt}.db')}"
+            best = _merge_best(best, _migrate_once(source_uri, uri, expected))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'benchmark': 'pipeline',
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'parameters': {
+            'rows': rows,
+            'columns': columns,
+            'seed': seed,
+            'repeat': repeat,
+            'target': sqlalchemy.engine.make_url(target_uri).get_backend_name() if target_uri else 'sqlite',
+            'settings': {name.lower(): getattr(Config, name) for name in _SETTINGS},
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'sqlalchemy': sqlalchemy.__version__,
+            'platform': platform.platform(),
+        },
+        **best,
+    }
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Regressões de result em relação à baseline: vazão menor ou pico de RSS maior que a tolerância."""
+    params = {key: value for key, value in result['parameters'].items() if key != 'repeat'}
+    base_params = {key: value for key, value in baseline['parameters'].items() if key != 'repeat'}
+    if params != base_params:
+        return [f"parâmetros diferentes da baseline: {base_params} x {params}"]
+
+    regressions = []
+    for table_name, base in baseline['tables'].items():
+        current = result['tables'].get(table_name)
+        if current is None:
+            regressions.append(f"{table_name}: ausente no resultado")
+            continue
+        for stage, base_stage in base['stages'].items():
+            if base_stage['seconds'] < _MIN_COMPARED_SECONDS:
+                continue
+            expected = base_stage.get('rows_per_second')
+            measured = current['stages'].get(stage, {}).get('rows_per_second')
+            if expected and (measured is None or measured < expected * (1 - tolerance)):
+                regressions.append(
+                    f"{table_name}/{stage}: {measured or 0:,.0f} registros/s (baseline {expected:,.0f})"
+                )
+        if base['peak_rss_mb'] and current['peak_rss_mb'] > base['peak_rss_mb'] * (1 + tolerance):
+            regressions.append(
+                f"{table_name}: pico de RSS {current['peak_rss_mb']:.1f} MB "
+                f"(baseline {base['peak_rss_mb']:.1f} MB)"
+            )
+    return regressions
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--target', help="URI do destino (ex.: PostgreSQL local); padrão SQLite temporário")
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--columns', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="Grava o resultado em JSON")
+    parser.add_argument('--save-baseline', help="Grava o resultado como baseline")
+    parser.add_argument('--compare', help="Compara com a baseline e falha se houver regressão")
+    parser.add_argument('--tolerance', type=float, default=0.15)
+    args = parser.parse_args()
+
+    result = run(args.rows, args.repeat, args.target, args.seed, args.columns)
+
+    print()
+    for table_name, metrics in result['tables'].items():
+        stages = '  '.join(
+            f"{stage} {stage_metrics['rows_per_second'] or 0:>10,.0f}/s"
+            for stage, stage_metrics in metrics['stages'].items()
+        )
+        print(f"{table_name:<16} {metrics['records']:>9,} registros  {stages}"
+              f"  pico {metrics['peak_rss_mb']:>7.1f} MB")
+    for name, metrics in result['phases'].items():
+        print(f"fase {name:<14} {metrics['seconds']:>8.3f}s  pico {metrics['peak_rss_mb']:>7.1f} MB")
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            _write_json(path, result)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSÃO {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"Sem regressões em relação a {args.compare} (tolerância {args.tolerance:.0%})")
+
+if __name__ == "__main__":
+    main()
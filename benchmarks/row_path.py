@@ -0,0 +1,113 @@
+"""Benchmark do caminho das linhas: dicionário por linha x tuplas posicionais.
+
+Mede preparação + carga (codificação do COPY texto e INSERT via executemany
+em SQLite em memória) para uma tabela larga, com tempo e pico de alocação.
+
+Uso: python -m benchmarks.row_path [--rows N] [--columns C] [--repeat R]
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, create_engine, select
+
+from src.infrastructure.loaders.copy_encoder import TextCopyEncoder
+from src.infrastructure.processors.batch_processor import BatchProcessor
+from src.infrastructure.repositories.target_repository import TargetRepository
+from src.infrastructure.transformers.data_transformer import DataTransformer
+
+def _wide_table(metadata: MetaData, name: str, columns: int) -> Table:
+    """Tabela com colunas inteiras, texto e float alternadas."""
+    types = [Integer, String(40), Float]
+    return Table(
+        name, metadata,
+        Column('id', Integer, primary_key=True),
+        *[Column(f"c{i}", types[i % 3]) for i in range(1, columns)]
+    )
+
+def _source_rows(engine: Any, table: Table, rows: int) -> List[Any]:
+    """Popula a tabela de origem e devolve as linhas (Row) como o cursor entrega."""
+    values = []
+    for i in range(rows):
+        row: Dict[str, Any] = {'id': i}
+        for position, col in enumerate(table.columns):
+            if position == 0:
+                continue
+            kind = position % 3
+            row[col.name] = i * position if kind == 0 else (f"valor {i}-{position}" if kind == 1 else i / 7)
+        values.append(row)
+    with engine.begin() as conn:
+        conn.execute(table.insert(), values)
+    with engine.connect() as conn:
+        return conn.execute(select(table)).fetchall()
+
+def _measure(step: Callable[[], Any], reset: Callable[[], None], repeat: int) -> Tuple[float, int]:
+    """Melhor tempo entre as repetições e pico de memória alocada em uma execução."""
+    best = float('inf')
+    for _ in range(repeat):
+        reset()
+        started = time.perf_counter()
+        step()
+        best = min(best, time.perf_counter() - started)
+
+    reset()
+    tracemalloc.start()
+    step()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def run(rows: int, columns: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    engine = create_engine('sqlite://')
+    metadata = MetaData()
+    source = _wide_table(metadata, 'origem', columns)
+    target = _wide_table(metadata, 'destino', columns)
+    metadata.create_all(engine)
+
+    batch = _source_rows(engine, source, rows)
+    column_names = [col.name for col in target.columns]
+    processor = BatchProcessor(rows, DataTransformer())
+    repository = TargetRepository(engine)
+    encoder = TextCopyEncoder()
+
+    prepare = {
+        'dict': lambda: processor.prepare_batch_data(batch, column_names),
+        'tuple': lambda: processor.prepare_batch_rows(batch, len(column_names)),
+    }
+
+    def clear_target() -> None:
+        with engine.begin() as conn:
+            conn.execute(target.delete())
+
+    results: Dict[str, Dict[str, float]] = {}
+    for row_format, prepare_rows in prepare.items():
+        loads = {
+            'copy_encode': (lambda: encoder.encode(prepare_rows(), column_names).read(), lambda: None),
+            'insert': (lambda: repository.insert_batch(target, prepare_rows()), clear_target),
+        }
+        for load_name, (step, reset) in loads.items():
+            seconds, peak = _measure(step, reset, repeat)
+            results[f"{load_name}/{row_format}"] = {
+                'rows_per_second': rows / seconds,
+                'peak_megabytes': peak / 1_000_000,
+                'seconds': seconds,
+            }
+
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=50_000)
+    parser.add_argument('--columns', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    for case, result in run(args.rows, args.columns, args.repeat).items():
+        print(
+            f"{case:<18} {result['rows_per_second']:>12,.0f} registros/s"
+            f"  pico {result['peak_megabytes']:>8.1f} MB  {result['seconds']:.3f}s"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""Gerador de schemas e dados sintéticos para os benchmarks do pipeline.
+
+Cria na origem (SQLite ou outro banco local) tabelas que cobrem os tipos
+comuns do SQL Server e os casos que pesam na migração: tabela larga, colunas LOB,
+textos com caracteres NUL, cadeia de FKs e chave primária composta. Os
+dados dependem apenas da semente e do número de linhas, então duas
+execuções com os mesmos parâmetros geram bancos idênticos.
+
+Uso: python -m benchmarks.synthetic --source sqlite:///origem.db [--rows N] [--seed S]
+"""
+import argparse
+import random
+import warnings
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import (
+    CHAR, DECIMAL, Boolean, Column, DateTime, Float, ForeignKey, Integer, LargeBinary, MetaData,
+    Numeric, String, Table, Text, create_engine, exc
+)
+from sqlalchemy.types import TypeEngine
+
+# Linhas inseridas por comando na origem
+_INSERT_CHUNK = 5_000
+
+_EPOCH = datetime(2020, 1, 1)
+
+# Tipo declarado na origem e gerador de valores de cada tipo comum do SQL Server.
+# SQLite não reflete VARBINARY nem BIT, por isso BLOB e BOOLEAN
+_COLUMN_KINDS: Dict[str, Callable[[], TypeEngine]] = {
+    'INTEGER': Integer,
+    'DATETIME': DateTime,
+    'VARCHAR': lambda: String(60),
+    'VARBINARY': LargeBinary,
+    'CHAR': lambda: CHAR(8),
+    'TEXT': Text,
+    'BIT': Boolean,
+    'FLOAT': Float,
+    'NUMERIC': lambda: Numeric(12, 2),
+    'DECIMAL': lambda: DECIMAL(18, 4),
+}
+
+def _value(kind: str, rng: random.Random, row: int) -> Any:
+    """Valor sintético de uma coluna do tipo kind (10% nulos)."""
+    if rng.random() < 0.1:
+        return None
+    if kind == 'INTEGER':
+        return rng.randint(-2**31, 2**31 - 1)
+    if kind == 'DATETIME':
+        return _EPOCH + timedelta(seconds=rng.randint(0, 10**8), microseconds=rng.randint(0, 999_999))
+    if kind == 'VARCHAR':
+        return f"valor {row} " + 'x' * rng.randint(0, 40)
+    if kind == 'VARBINARY':
+        return rng.randbytes(rng.randint(1, 32))
+    if kind == 'CHAR':
+        return f"{row % 10**8:08d}"
+    if kind == 'TEXT':
+        return f"linha {row}\tcom tab\ne quebra " * rng.randint(1, 4)
+    if kind == 'BIT':
+        return rng.random() < 0.5
+    if kind == 'FLOAT':
+        return rng.uniform(-1e6, 1e6)
+    if kind == 'NUMERIC':
+        return Decimal(rng.randint(-10**9, 10**9)) / 100
+    return Decimal(rng.randint(-10**13, 10**13)) / 10_000
+
+def _nul_text(rng: random.Random, row: int) -> str:
+    """Texto com caracteres NUL em posições aleatórias em metade das linhas."""
+    text = f"mensagem {row} " + 'y' * rng.randint(0, 60)
+    if row % 2 == 0:
+        position = rng.randint(0, len(text))
+        text = text[:position] + '\x00' + text[position:]
+    return text
+
+def build_schema(columns: int = 60, chain_length: int = 3) -> MetaData:
+    """Schema sintético da origem."""
+    metadata = MetaData()
+    kinds = sorted(_COLUMN_KINDS)
+    Table(
+        'wide_rows', metadata,
+        Column('id', Integer, primary_key=True),
+        *[Column(f"{kinds[i % len(kinds)].lower()}_{i}", _COLUMN_KINDS[kinds[i % len(kinds)]]())
+          for i in range(1, columns)]
+    )
+    Table(
+        'lob_documents', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('title', String(200)),
+        Column('body', Text),
+        Column('attachment', LargeBinary),
+    )
+    Table(
+        'nul_messages', metadata,
+        Column('id', Integer, primary_key=True),
+        Column('subject', String(120)),
+        Column('body', Text),
+    )
+    for level in range(1, chain_length + 1):
+        Table(
+            f"chain_{level}", metadata,
+            Column('id', Integer, primary_key=True),
+            Column('parent_id', Integer, ForeignKey(f"chain_{level - 1}.id")) if level > 1
+            else Column('parent_id', Integer),
+            Column('name', String(60)),
+            Column('created', DateTime),
+        )
+    Table(
+        'order_items', metadata,
+        Column('order_id', Integer, primary_key=True),
+        Column('line', Integer, primary_key=True),
+        Column('product', String(40), nullable=False),
+        Column('quantity', Integer, nullable=False),
+        Column('price', Numeric(12, 2)),
+    )
+    return metadata
+
+def _rows(table: Table, rows: int, rng: random.Random) -> List[Dict[str, Any]]:
+    name = table.name
+    if name == 'wide_rows':
+        kinds = {col.name: col.name.rsplit('_', 1)[0].upper() for col in table.columns if col.name != 'id'}
+        return [
+            dict({column: _value(kind, rng, i) for column, kind in kinds.items()}, id=i)
+            for i in range(1, rows + 1)
+        ]
+    if name == 'lob_documents':
+        # Documentos de 16 KB a 128 KB: cada batch pesa mais pelo tamanho que pelas linhas
+        values = []
+        for i in range(1, rows + 1):
+            size = rng.randint(16, 128) * 1024
+            values.append({
+                'id': i,
+                'title': f"documento {i}",
+                'body': ('conteúdo longo ' * (size // 15 + 1))[:size],
+                'attachment': rng.randbytes(size),
+            })
+        return values
+    if name == 'nul_messages':
+        return [
+            {'id': i, 'subject': _nul_text(rng, i)[:120], 'body': _nul_text(rng, i + 1)}
+            for i in range(1, rows + 1)
+        ]
+    if name.startswith('chain_'):
+        level = int(name.split('_')[1])
+        return [
+            {
+                'id': i,
+                'parent_id': rng.randint(1, rows) if level > 1 else None,
+                'name': f"nível {level} item {i}",
+                'created': _value('DATETIME', rng, i),
+            }
+            for i in range(1, rows + 1)
+        ]
+    # order_items: até 5 linhas por pedido
+    values = []
+    order_id = 0
+    while len(values) < rows:
+        order_id += 1
+        for line in range(1, rng.randint(1, 5) + 1):
+            values.append({
+                'order_id': order_id,
+                'line': line,
+                'product': f"produto {rng.randint(1, 5000)}",
+                'quantity': rng.randint(1, 50),
+                'price': Decimal(rng.randint(1, 10**7)) / 100,
+            })
+    return values[:rows]
+
+def table_rows(rows: int) -> Dict[str, int]:
+    """Linhas de cada tabela para o tamanho base rows (LOBs e tabela larga são menores)."""
+    return {
+        'wide_rows': max(1, rows // 2),
+        'lob_documents': max(1, rows // 100),
+        'nul_messages': rows,
+        'chain_1': max(1, rows // 10),
+        'chain_2': max(1, rows // 10),
+        'chain_3': max(1, rows // 10),
+        'order_items': rows,
+    }
+
+def generate(source_uri: str, rows: int, seed: int = 42, columns: int = 60) -> Dict[str, int]:
+    """Cria o schema sintético em source_uri (apagando as tabelas existentes) e o popula.
+
+    Devolve as linhas geradas por tabela.
+    """
+    metadata = build_schema(columns)
+    counts = table_rows(rows)
+    engine = create_engine(source_uri)
+    try:
+        metadata.drop_all(engine)
+        metadata.create_all(engine)
+        with warnings.catch_warnings():
+            # SQLite grava NUMERIC como float; a perda é irrelevante para o benchmark
+            warnings.simplefilter('ignore', exc.SAWarning)
+            for table in metadata.sorted_tables:
+                # Uma semente por tabela: o conteúdo de uma não depende das outras
+                rng = random.Random(f"{seed}:{table.name}")
+                values = _rows(table, counts[table.name], rng)
+                with engine.begin() as conn:
+                    for start in range(0, len(values), _INSERT_CHUNK):
+                        conn.execute(table.insert(), values[start:start + _INSERT_CHUNK])
+    finally:
+        engine.dispose()
+    return counts
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--source', required=True, help="URI do banco de origem (ex.: sqlite:///origem.db)")
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--columns', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    for table_name, count in generate(args.source, args.rows, args.seed, args.columns).items():
+        print(f"{table_name:<16} {count:>10,} registros")
+
+if __name__ == "__main__":
+    main()
@@ -1,44 +1,121 @@
 from src.infrastructure.factories.database_connection_factory import DatabaseConnectionFactory
 from src.infrastructure.database.sql_server_connection import SQLServerConn
 from src.infrastructure.database.postgre_connection import PostgreConn
+from src.infrastructure.database.staged_source_connection import StagedSourceConn
+from src.infrastructure.factories.repository_factory import RepositoryFactory
 from src.infrastructure.factories.database_connection_factory import DatabaseConnectionFactory
 from src.application.services.data_migration import DataMigration 
+from src.application.services.data_validation import DataValidation
+from src.application.services.data_staging import DataStaging
+from src.config.settings import Config
 
+import argparse
 import logging
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Migração de dados do SQL Server para o PostgreSQL")
+    parser.add_argument(
+        '--resume', action='store_true',
+        help="Retoma uma migração interrompida a partir dos checkpoints gravados no destino"
+    )
+    parser.add_argument(
+        '--incremental', action='store_true',
+        help="Copia apenas as linhas alteradas desde a última execução (rowversion/data)"
+    )
+    parser.add_argument(
+        '--replay-dead-letters', action='store_true',
+        help="Reinsere as linhas rejeitadas gravadas em MIGRATION_DEAD_LETTER_DIR"
+    )
+    parser.add_argument(
+        '--validate', action='store_true',
+        help="Compara o conteúdo de origem e destino por hashes de faixas da chave primária"
+    )
+    staging = parser.add_mutually_exclusive_group()
+    staging.add_argument(
+        '--extract-to', metavar='DIR',
+        help="Extrai as tabelas da origem para arquivos colunares em DIR, sem carregar o destino"
+    )
+    staging.add_argument(
+        '--load-from', metavar='DIR',
+        help="Carrega no destino as tabelas extraídas em DIR, sem acessar o SQL Server"
+    )
+    args = parser.parse_args()
+    if args.load_from and (args.incremental or args.validate):
+        # A sincronização e a validação consultam a origem por chave: precisam do SQL Server
+        parser.error("--load-from não pode ser combinado com --incremental ou --validate")
+    return args
+
 def main() -> None:
+    args = parse_args()
+    
     try:
-        # Criar conexões usando factory
-        src_connection: SQLServerConn = DatabaseConnectionFactory.create_from_config('sql_server')
+        if args.extract_to:
+            src_connection: SQLServerConn = DatabaseConnectionFactory.create_from_config('sql_server')
+            print("Retrieving MetaData")
+            src_connection.get_db_metadata()
+            
+            print(f"Extraindo tabelas para {args.extract_to}...")
+            staging = RepositoryFactory.create_staging_repository(args.extract_to)
+            results = DataStaging(src_connection, staging, resume=args.resume).extract_all()
+            return
+        
+        # Criar conexões usando factory; com --load-from a origem são os arquivos do staging
+        if args.load_from:
+            src_connection = StagedSourceConn(RepositoryFactory.create_staging_repository(args.load_from))
+        else:
+            src_connection = DatabaseConnectionFactory.create_from_config('sql_server')
         tgt_connection: PostgreConn = DatabaseConnectionFactory.create_from_config('postgresql')
         
         print("Retrieving MetaData")
         # Carregar metadados
         src_connection.get_db_metadata()
-
+        
+        if args.incremental:
+            print("Iniciando sincronização incremental...")
+            data_migration = DataMigration(src_connection, tgt_connection)
+            stats = data_migration.sync_changes()
+            return
+        
+        if args.replay_dead_letters:
+            print("Reprocessando linhas rejeitadas...")
+            data_migration = DataMigration(src_connection, tgt_connection)
+            stats = data_migration.replay_dead_letters()
+            return
+        
+        if args.validate:
+            print("Validando conteúdo...")
+            results = DataValidation(src_connection, tgt_connection).validate_all()
+            return
+        
         # Obter ordem de criação usando repositório
         creation_order = src_connection.repository.get_tables_in_order()
         # Reverter ordem para criação (pais primeiro)
         creation_order.reverse()
         
         # Criar tabelas
-        tgt_connection.create_tables(src_connection, creation_order)
-
+        tgt_connection.create_tables(src_connection, creation_order,
+                                     deferred=Config.DEFERRED_CONSTRAINTS,
+                                     unlogged=Config.UNLOGGED_TABLES)
+        
         print("Iniciando migração de dados...")
-        data_migration = DataMigration(src_connection, tgt_connection)
+        data_migration = DataMigration(src_connection, tgt_connection, resume=args.resume)
         stats = data_migration.migrate_data()
-
+        
+        if Config.DEFERRED_CONSTRAINTS or Config.UNLOGGED_TABLES:
+            # Estrutura adiada: PKs, índices, FKs, LOGGED, ANALYZE e sequências
+            tgt_connection.finalize_tables(src_connection, creation_order, stats['failed_tables'])
+        
         #data_migration.validator.validate_migration() 
     
     except Exception as e:
         logging.exception("Falha catastrófica na migração", e)
-
+    
     finally:
         # Garantir que conexões sejam fechadas
         if 'src_engine' in locals():
             src_connection.engine.dispose()
         if 'tgt_engine' in locals():
             tgt_connection.engine.dispose()
-    
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
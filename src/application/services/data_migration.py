@@ -1,34 +1,112 @@
 from src.domain.services.migration_stats import MigrationStats
 from src.infrastructure.validators.migration_validator import MigrationValidator
 from src.infrastructure.transformers.data_transformer import DataTransformer
+from src.infrastructure.transformers.columnar_transformer import ColumnarTransformer
 from src.infrastructure.processors.batch_processor import BatchProcessor
+from src.infrastructure.processors.pipeline import BatchPipeline
+from src.infrastructure.processors.batch_sizer import BatchSizeHints
+from src.infrastructure.reporting.metrics_reporter import MetricsReporter, estimate_payload_bytes
+from src.infrastructure.reporting.rss_sampler import RssSampler
 from src.infrastructure.database.sql_server_connection import SQLServerConn
 from src.infrastructure.database.postgre_connection import PostgreConn
+from src.infrastructure.database.staged_source_connection import StagedSourceConn
+from src.infrastructure.serializers.arrow_codec import is_record_batch
+from src.infrastructure.repositories.source_repository import PHYSLOC_COLUMN
+from src.infrastructure.repositories.checkpoint_repository import (
+    STATUS_COMPLETED, STATUS_FAILED
+)
+from src.infrastructure.factories.database_connection_factory import DatabaseConnectionFactory
+from src.infrastructure.factories.repository_factory import RepositoryFactory
+from src.infrastructure.factories.profiler_factory import ProfilerFactory
+from src.domain.interfaces.batch_hook import (
+    STAGE_FETCH, STAGE_LOAD, STAGE_NUL_RETRY, STAGE_TRANSFORM
+)
+from src.application.services.table_scheduler import TableScheduler
 from src.config.settings import Config
 
-from typing import Dict,Tuple, Any
+from typing import Dict,Tuple, Any, Callable, List, Iterator, Optional, Set
+import threading
+import time
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
 from sqlalchemy import Table
+from sqlalchemy.engine import Connection
+
+# Gera o callback que grava o checkpoint na transação do batch: (posição, registros) -> callback
+CheckpointWriter = Callable[[Any, int], Callable[[Connection], None]]
+# Callback do checkpoint de um batch a partir do número de linhas efetivamente gravadas
+ProgressWriter = Callable[[int], Callable[[Connection], None]]
+# Grava um batch no destino: (tabela, dados, callback na transação) -> sucesso
+BatchLoader = Callable[[Table, List[Dict[str, Any]], Optional[Callable[[Connection], None]]], bool]
+# LOBs de um batch lidos à parte: (chave primária, coluna)
+DeferredLobs = List[Tuple[Tuple[Any, ...], str]]
+
+_MEGABYTE = 1024 * 1024
+
+class BatchFailedError(Exception):
+    """Batch não gravado nem recuperado (ERROR_MODE 'skip' ou falha da bisseção).
+    
+    A cópia da fonte para nesse batch: o checkpoint fica no último batch
+    gravado e --resume continua dele, sem pular as linhas que faltaram.
+    """
 
 class DataMigration:
-    def __init__(self, src: SQLServerConn, tgt: PostgreConn) -> None:
+    def __init__(self, src: SQLServerConn, tgt: PostgreConn,
+                 stats: Optional[MigrationStats] = None,
+                 progress_position: Optional[int] = None,
+                 resume: bool = False) -> None:
         self.source_conn = src
         self.target_conn = tgt
         
         # Usar repositórios ao invés de engines diretos
         self.source_repository = src.repository
         self.target_repository = tgt.repository
+        self.checkpoint_repository = tgt.checkpoint_repository
+        self.watermark_repository = tgt.watermark_repository
+        self.dead_letter_repository = RepositoryFactory.create_dead_letter_repository()
+        
+        # Com resume=True tabelas concluídas são puladas e as parciais continuam do checkpoint
+        self.resume = resume
         
         # Injeção de dependências
-        self.stats = MigrationStats()
+        self.stats = stats if stats is not None else MigrationStats()
         self.validator = MigrationValidator(src.engine, tgt.engine)
         self.transformer = DataTransformer()
-        self.batch_processor = BatchProcessor(Config.BATCH_SIZE, self.transformer)
+        # Batches Arrow (ROW_FORMAT 'arrow'): conversão e limpeza por coluna
+        self.columnar = ColumnarTransformer() if Config.ROW_FORMAT == 'arrow' else None
+        self.type_converter = tgt.type_converter
+        self.batch_processor = BatchProcessor(
+            Config.BATCH_SIZE, self.transformer,
+            adaptive=Config.ADAPTIVE_BATCH,
+            size_hints=BatchSizeHints(Config.BATCH_SIZE_HINTS).load() if Config.ADAPTIVE_BATCH else None,
+            max_bytes=self._batch_max_bytes()
+        )
+        
+        # Workers da migração paralela em threads (um por thread, com engines próprias)
+        self.progress_position = progress_position
+        
+        # Tabelas com NUL conhecido (configuradas ou detectadas nesta execução):
+        # seus batches são limpos antes da carga, evitando a tentativa que falharia
+        self._nul_tables: Set[str] = set(Config.NUL_TABLES)
+        # Registros estimados por tabela (catálogo), lidos uma vez e compartilhados
+        self._estimated_counts: Optional[Dict[str, int]] = None
+        self._worker_local = threading.local()
+        self._workers: List['DataMigration'] = []
+        self._workers_lock = threading.Lock()
+        # Profilers do caminho dos batches (MIGRATION_PROFILE_HOOKS); None quando desativados
+        self.hooks = ProfilerFactory.create_from_config()
+        # Pico de RSS do processo por tabela (compartilhado com os workers em threads)
+        self.rss_sampler = RssSampler()
+        # Limite dos LOBs lidos junto com o batch, por tabela (None: lidos inteiros)
+        self._lob_limits: Dict[str, Optional[int]] = {}
     
     def migrate_data(self) -> Dict[str, Any]:
         """Orquestra o processo de migração usando repositórios."""
+        reporter = self._metrics_reporter()
         try:
             self.stats.start_migration()
+            reporter.start()
             
             # Usar repositório para obter ordem de migração
             migration_order = self.source_repository.get_tables_in_order()
@@ -37,12 +115,73 @@ class DataMigration:
                 print("Nenhuma tabela para migrar")
                 return self.stats.get_stats()
             
+            self.checkpoint_repository.ensure_table()
+            self.watermark_repository.ensure_table()
+            self._load_estimated_counts()
+            
             # Usar repositório para controlar constraints
             self.target_repository.disable_constraints()
             
+            if Config.WORKERS > 1:
+                self._migrate_tables_parallel(migration_order)
+            else:
+                for idx, table_name in enumerate(migration_order, 1):
+                    print(f"\n[{idx}/{len(migration_order)}] Processando {table_name}...")
+                    success, records = self._migrate_table(table_name)
+                    
+                    if success:
+                        self.stats.add_successful_table(table_name, records)
+                    else:
+                        self.stats.add_failed_table(table_name)
+            
+            self.target_repository.enable_constraints()
+            self._save_batch_size_hints()
+            
+            for method, throughput in self.stats.get_stats()['load_throughput'].items():
+                print(f"Carga via {method}: {throughput['records_per_second']:,.0f} registros/s")
+            
+            for table_name, columns in self.stats.get_stats()['cleaned_values'].items():
+                for column, count in columns.items():
+                    print(f"NUL removido de {count:,} valores em {table_name}.{column}")
+            
+            for table_name, count in self.stats.get_stats()['dead_letters'].items():
+                print(f"{count:,} registros de {table_name} rejeitados; "
+                      f"veja {Config.DEAD_LETTER_DIR} e use --replay-dead-letters")
+        
+        except Exception as e:
+            print(f"Erro na migração: {e}")
+            raise
+        finally:
+            self.stats.end_migration()
+            reporter.stop()
+            self.rss_sampler.stop()
+            if self.hooks is not None:
+                self.hooks.close()
+        
+        return self.stats.get_stats()
+    
+    def sync_changes(self) -> Dict[str, Any]:
+        """Sincroniza apenas as linhas alteradas desde a última marca d'água de cada tabela.
+        
+        Usado após a carga completa, até o cut-over: as alterações são aplicadas
+        por upsert na chave primária. Exclusões na origem não são propagadas.
+        """
+        reporter = self._metrics_reporter()
+        try:
+            self.stats.start_migration()
+            reporter.start()
+            
+            migration_order = self.source_repository.get_tables_in_order()
+            if not migration_order:
+                print("Nenhuma tabela para sincronizar")
+                return self.stats.get_stats()
+            
+            self.watermark_repository.ensure_table()
+            self.target_repository.disable_constraints()
+            
             for idx, table_name in enumerate(migration_order, 1):
-                print(f"\n[{idx}/{len(migration_order)}] Processando {table_name}...")
-                success, records = self._migrate_table(table_name)
+                print(f"\n[{idx}/{len(migration_order)}] Sincronizando {table_name}...")
+                success, records = self._measuring_rss(table_name, self._sync_table)
                 
                 if success:
                     self.stats.add_successful_table(table_name, records)
@@ -50,103 +189,998 @@ class DataMigration:
                     self.stats.add_failed_table(table_name)
             
             self.target_repository.enable_constraints()
-            
+            self._save_batch_size_hints()
+        
         except Exception as e:
-            print(f"Erro na migração: {e}")
+            print(f"Erro na sincronização: {e}")
             raise
         finally:
             self.stats.end_migration()
+            reporter.stop()
+            self.rss_sampler.stop()
+            if self.hooks is not None:
+                self.hooks.close()
+        
+        return self.stats.get_stats()
+    
+    def _sync_table(self, table_name: str) -> Tuple[bool, int]:
+        """Copia as alterações de uma tabela no intervalo (marca d'água, máximo atual]."""
+        if self.hooks is not None:
+            self.hooks.table_start(table_name)
+        try:
+            source_table = self.source_repository.get_table_metadata(table_name)
+            target_table = self.target_repository.get_table_metadata(table_name)
+            
+            change_column = self.source_repository.get_change_column(
+                source_table, Config.INCREMENTAL_COLUMNS.get(table_name)
+            )
+            pk_columns = self.source_repository.get_primary_key_columns(source_table)
+            if change_column is None or not pk_columns:
+                print(f"{table_name}: sem coluna de alteração ou chave primária. Pulando.")
+                self.stats.add_table_with_issues(table_name, "no_incremental_key")
+                return True, 0
+            
+            watermark = self.watermark_repository.get_watermark(table_name)
+            low = None
+            if watermark is not None and watermark['column_name'] == change_column:
+                low = watermark['value']
+            else:
+                print(f"{table_name}: sem marca d'água para {change_column}; lendo a tabela inteira")
+            
+            high = self.source_repository.get_max_change_value(source_table, change_column)
+            if high is None or high == low:
+                print(f"{table_name}: sem alterações")
+                return True, 0
+            
+            # Ordena pela coluna de alteração, com a chave primária como desempate
+            key_columns = [change_column] + [name for name in pk_columns if name != change_column]
+            column_names = [col.name for col in target_table.columns]
+            
+            def upsert(table: Table, data: List[Dict[str, Any]],
+                       on_loaded: Optional[Callable[[Connection], None]]) -> bool:
+                return self.target_repository.upsert_batch(table, data, pk_columns, on_loaded)
+            
+            def changed_batches() -> Iterator[Tuple[List[Any], Any]]:
+                last_key = None
+                while True:
+                    batch = self.source_repository.fetch_changes_after(
+                        source_table, key_columns, self.batch_processor.batch_size_for(table_name),
+                        low, high, last_key, self._batch_max_bytes(),
+                        self._lob_inline_bytes(source_table)
+                    )
+                    if not batch:
+                        break
+                    last_key = self.source_repository.get_row_key(batch[-1], key_columns)
+                    yield batch, last_key
+            
+            started = time.perf_counter()
+            with tqdm(desc=f"  → {table_name}", unit="registros",
+                      position=self.progress_position,
+                      leave=self.progress_position is None) as pbar:
+                synced = self._migrate_batches(
+                    source_table, target_table, column_names,
+                    self._timed_fetches(table_name, changed_batches()), pbar, loader=upsert
+                )
+            self.stats.set_table_result(table_name, synced, time.perf_counter() - started)
+            
+            self._log_batch_size(table_name)
+            self.watermark_repository.save_watermark(table_name, change_column, high)
+            print(f"{table_name}: {synced:,} registros sincronizados")
+            return True, synced
+        
+        except Exception as e:
+            print(f"Erro ao sincronizar {table_name}: {str(e)}")
+            return False, 0
+        finally:
+            if self.hooks is not None:
+                self.hooks.table_end(table_name)
+    
+    def replay_dead_letters(self) -> Dict[str, Any]:
+        """Reprocessa as linhas rejeitadas gravadas no dead letter, após corrigida a causa.
+        
+        O arquivo de cada tabela é lido em lotes de BATCH_SIZE, inseridos com o
+        mesmo isolamento por bisseção; as linhas que ainda falham vão para um
+        novo arquivo, que substitui o original só depois do commit da sessão.
+        Se o processo parar antes, o arquivo original continua pendente.
+        """
+        reporter = self._metrics_reporter()
+        try:
+            self.stats.start_migration()
+            reporter.start()
             
+            table_names = self.dead_letter_repository.tables()
+            if not table_names:
+                print("Nenhuma linha rejeitada para reprocessar")
+                return self.stats.get_stats()
+            
+            self.target_repository.disable_constraints()
+            
+            for idx, table_name in enumerate(table_names, 1):
+                print(f"\n[{idx}/{len(table_names)}] Reprocessando {table_name}...")
+                success, records = self._replay_table(table_name)
+                
+                if success:
+                    self.stats.add_successful_table(table_name, records)
+                else:
+                    self.stats.add_failed_table(table_name)
+            
+            self.target_repository.enable_constraints()
+        
+        except Exception as e:
+            print(f"Erro no reprocessamento: {e}")
+            raise
+        finally:
+            self.stats.end_migration()
+            reporter.stop()
+        
         return self.stats.get_stats()
     
+    def _replay_table(self, table_name: str) -> Tuple[bool, int]:
+        """Reinsere as linhas rejeitadas de uma tabela; sucesso se nenhuma voltar a falhar."""
+        try:
+            target_table = self.target_repository.get_table_metadata(table_name)
+            self.dead_letter_repository.begin_replay(table_name)
+            entries = self.dead_letter_repository.read(table_name)
+            
+            loaded = total = 0
+            with self.target_repository.load_session():
+                while True:
+                    chunk = [row for row, _ in islice(entries, Config.BATCH_SIZE)]
+                    if not chunk:
+                        break
+                    total += len(chunk)
+                    rejected = self.target_repository.insert_isolating(target_table, chunk)
+                    if rejected is None:
+                        rejected = [(index, "Falha na transação do reprocessamento")
+                                    for index in range(len(chunk))]
+                    
+                    if rejected:
+                        failed = [(chunk[index], error) for index, error in rejected]
+                        self.target_repository.after_commit(
+                            lambda failed=failed: self.dead_letter_repository.write_retry(
+                                target_table, failed
+                            )
+                        )
+                        self.stats.add_dead_letters(table_name, len(rejected))
+                    loaded += len(chunk) - len(rejected)
+            
+            # Sessão confirmada: o arquivo reprocessado dá lugar ao das novas falhas
+            self.dead_letter_repository.archive(table_name)
+            print(f"{table_name}: {loaded:,} de {total:,} registros recuperados")
+            return loaded == total, loaded
+        
+        except Exception as e:
+            print(f"Erro ao reprocessar {table_name}: {str(e)}")
+            return False, 0
+    
+    def _metrics_reporter(self) -> MetricsReporter:
+        """Relatório JSON e arquivo do Prometheus atualizados durante a execução."""
+        return MetricsReporter(self.stats, Config.METRICS_REPORT, Config.METRICS_PROMETHEUS_FILE,
+                               Config.METRICS_INTERVAL_SECONDS)
+    
+    def _log_batch_size(self, table_name: str) -> None:
+        """Registra o tamanho de batch adaptativo alcançado pela tabela."""
+        if not self.batch_processor.adaptive:
+            return
+        batch_size = self.batch_processor.batch_size_for(table_name)
+        self.stats.set_batch_size(table_name, batch_size)
+        print(f"{table_name}: batch adaptativo final de {batch_size:,} registros")
+    
+    def _save_batch_size_hints(self) -> None:
+        """Grava os tamanhos finais para semear a próxima execução."""
+        if Config.ADAPTIVE_BATCH:
+            BatchSizeHints(Config.BATCH_SIZE_HINTS).save(self.stats.get_stats()['batch_sizes'])
+    
+    def _migrate_tables_parallel(self, table_names: List[str]) -> None:
+        """Migra tabelas em paralelo, despachando cada uma quando suas FKs estão prontas."""
+        scheduler = TableScheduler(Config.WORKERS, Config.EXECUTOR, Config.TABLE_ORDERING)
+        dependencies = TableScheduler.build_dependencies(
+            self.source_repository.get_all_tables_metadata()
+        )
+        completed = 0
+        
+        def on_complete(table_name: str, result: Any, error: Optional[BaseException]) -> None:
+            nonlocal completed
+            completed += 1
+            
+            if error is not None:
+                print(f"Erro ao migrar {table_name}: {error}")
+                success, records = False, 0
+            else:
+                success, records, worker_stats = result
+                if worker_stats:
+                    self.stats.merge_worker_stats(worker_stats)
+            
+            if success:
+                self.stats.add_successful_table(table_name, records)
+            else:
+                self.stats.add_failed_table(table_name)
+            print(f"[{completed}/{len(table_names)}] {table_name} "
+                  f"{'concluída' if success else 'falhou'}")
+        
+        print(f"Migrando {len(table_names)} tabelas com {Config.WORKERS} workers "
+              f"({Config.EXECUTOR}, ordenação {Config.TABLE_ORDERING})")
+        
+        if Config.EXECUTOR == 'process':
+            scheduler.run(
+                table_names, dependencies, _migrate_table_in_process, on_complete,
+                initializer=_init_process_worker, initargs=(self.resume, self._staging_directory()),
+                weights=self._estimated_counts
+            )
+            return
+        
+        try:
+            scheduler.run(table_names, dependencies, self._migrate_table_in_thread, on_complete,
+                          weights=self._estimated_counts)
+        finally:
+            for worker in self._workers:
+                worker.target_repository.enable_constraints()
+                if worker.source_conn.engine is not None:
+                    worker.source_conn.engine.dispose()
+                worker.target_conn.engine.dispose()
+            self._workers.clear()
+    
+    def _staging_directory(self) -> Optional[str]:
+        """Diretório do staging quando a origem são os arquivos da extração (--load-from)."""
+        if isinstance(self.source_conn, StagedSourceConn):
+            return self.source_conn.staging.directory
+        return None
+    
+    def _migrate_table_in_thread(self, table_name: str) -> Tuple[bool, int, None]:
+        """Migra uma tabela com o worker (engines próprias) da thread atual."""
+        worker = getattr(self._worker_local, 'migration', None)
+        if worker is None:
+            with self._workers_lock:
+                worker = DataMigration(
+                    self.source_conn.clone(), self.target_conn.clone(),
+                    stats=self.stats, progress_position=len(self._workers),
+                    resume=self.resume
+                )
+                self._workers.append(worker)
+            worker.target_repository.disable_constraints()
+            worker._nul_tables = self._nul_tables
+            worker.hooks = self.hooks
+            worker.rss_sampler = self.rss_sampler
+            worker._estimated_counts = self._estimated_counts
+            self._worker_local.migration = worker
+        
+        success, records = worker._migrate_table(table_name)
+        return success, records, None
+    
     def _migrate_table(self, table_name: str) -> Tuple[bool, int]:
-        """Migra uma única tabela usando repositórios."""
+        """Migra uma única tabela usando repositórios, registrando o pico de RSS."""
+        return self._measuring_rss(table_name, self._migrate_table_rows)
+    
+    def _measuring_rss(self, table_name: str,
+                       run: Callable[[str], Tuple[bool, int]]) -> Tuple[bool, int]:
+        """Executa run(table_name) e registra o pico de RSS do processo enquanto ela rodou.
+        
+        Com workers em threads as tabelas simultâneas compartilham o processo:
+        o pico de cada uma inclui a memória das outras.
+        """
+        self.rss_sampler.start()
+        with self.rss_sampler.label(table_name):
+            result = run(table_name)
+        self.stats.set_peak_rss(table_name, self.rss_sampler.peak(table_name))
+        return result
+    
+    def _migrate_table_rows(self, table_name: str) -> Tuple[bool, int]:
+        if self.hooks is not None:
+            self.hooks.table_start(table_name)
         try:
+            checkpoints = self.checkpoint_repository.get_checkpoints(table_name) if self.resume else {}
+            if checkpoints and Config.UNLOGGED_TABLES:
+                checkpoints = self._discard_lost_progress(table_name, checkpoints)
+            if any(cp['status'] == STATUS_COMPLETED for cp in checkpoints.values()):
+                records = sum(cp['rows_loaded'] for cp in checkpoints.values())
+                print(f"{table_name}: concluída em execução anterior. Pulando.")
+                return True, records
+            
             # Usar repositórios para obter metadados
             source_table = self.source_repository.get_table_metadata(table_name)
             target_table = self.target_repository.get_table_metadata(table_name)
             
-            # Usar repositório para contar registros
-            total_records = self.source_repository.count_records(source_table)
+            # Estimativa usada só no progresso e no planejamento (sharding)
+            total_records = self._estimate_records(source_table)
             
             if total_records == 0:
-                print(f"Tabela {table_name} está vazia. Pulando.")
-                return True, 0
+                # Sem estatística (tabela não analisada): confirma antes de pular
+                if not self.source_repository.has_rows(source_table):
+                    print(f"Tabela {table_name} está vazia. Pulando.")
+                    self.checkpoint_repository.mark_table(table_name, STATUS_COMPLETED)
+                    return True, 0
+                total_records = self.source_repository.count_records(source_table)
             
-            print(f"Migrando {table_name}: {total_records:,} registros")
-
-            migrated = self._migrate_table_data(source_table, target_table, total_records)
+            print(f"Migrando {table_name}: ~{total_records:,} registros")
+            
+            started = time.perf_counter()
+            migrated = self._migrate_table_data(source_table, target_table, total_records,
+                                                checkpoints)
+            self.stats.set_table_result(table_name, migrated, time.perf_counter() - started)
+            self._log_batch_size(table_name)
             
             # Validar usando repositório
             target_count = self.target_repository.count_records(target_table)
             if target_count == migrated:
                 print(f"{table_name}: {migrated:,} registros migrados com sucesso")
+                self.checkpoint_repository.mark_table(table_name, STATUS_COMPLETED)
                 return True, migrated
             else:
                 print(f"{table_name}: Falha na validação")
+                self.checkpoint_repository.mark_table(table_name, STATUS_FAILED)
                 return False, 0
-                
+        
+        except BatchFailedError as e:
+            # Checkpoint mantido: --resume retoma a partir do batch com falha
+            print(f"Erro ao migrar {table_name}: {str(e)}; retome com --resume")
+            self.checkpoint_repository.mark_table(table_name, STATUS_FAILED)
+            return False, 0
         except Exception as e:
             print(f"Erro ao migrar {table_name}: {str(e)}")
             return False, 0
+        finally:
+            if self.hooks is not None:
+                self.hooks.table_end(table_name)
+    
+    def _load_estimated_counts(self) -> None:
+        """Lê do catálogo, em uma consulta, a estimativa de registros de todas as tabelas."""
+        if Config.ROW_COUNT_MODE != 'estimate':
+            self._estimated_counts = {}
+            return
+        try:
+            self._estimated_counts = self.source_repository.get_estimated_counts()
+        except Exception as e:
+            print(f"Estatísticas do catálogo indisponíveis, usando COUNT(*): {e}")
+            self._estimated_counts = {}
+    
+    def _estimate_records(self, source_table: Table) -> int:
+        """Registros estimados da tabela; COUNT(*) se o catálogo não tiver a tabela."""
+        if self._estimated_counts is None:
+            self._load_estimated_counts()
+        estimate = self._estimated_counts.get(source_table.name)
+        if estimate is None:
+            return self.source_repository.count_records(source_table)
+        return estimate
     
     def _migrate_table_data(self, source_table: Table, target_table: Table,
-                           total_records: int) -> int:
-        """Coordena a migração de dados de uma tabela usando repositórios."""
-        # Usar repositório para obter chaves primárias
-        pk_columns = self.source_repository.get_primary_key_columns(source_table)
-        order_column = pk_columns[0] if pk_columns else source_table.columns.keys()[0]
+                           total_records: int,
+                           checkpoints: Optional[Dict[int, Dict[str, Any]]] = None) -> int:
+        """Coordena a migração de dados de uma tabela usando repositórios.
+        
+        Com checkpoints de uma execução anterior, cada faixa continua da última
+        posição gravada; o retorno inclui os registros já carregados antes.
+        """
         column_names = [col.name for col in target_table.columns]
+        key_columns = self._get_pagination_key(source_table)
+        position_kind = self._position_kind(key_columns)
         
-        migrated = 0
+        if checkpoints and self._can_resume(checkpoints, position_kind):
+            shards = [checkpoints[shard] for shard in sorted(checkpoints)]
+            key_ranges = [self._decoded_key_range(cp['key_range']) for cp in shards]
+            starts = [cp['position'] for cp in shards]
+            loaded = [cp['rows_loaded'] for cp in shards]
+            print(f"{source_table.name}: retomando com {sum(loaded):,} registros já carregados")
+        else:
+            if checkpoints:
+                # Posição gravada não serve para o modo atual: recomeça a tabela do zero
+                print(f"{source_table.name}: checkpoint incompatível; recarregando a tabela")
+                self.target_repository.truncate_table(target_table.name)
+            self._record_initial_watermark(source_table)
+            key_ranges = self._plan_key_ranges(source_table, key_columns, total_records)
+            self.checkpoint_repository.start_table(source_table.name, position_kind, key_ranges)
+            starts = [None] * len(key_ranges)
+            loaded = [0] * len(key_ranges)
         
-        with tqdm(total=total_records, desc=f"  → {source_table.name}", 
-                 unit="registros") as pbar:
+        with tqdm(total=total_records, initial=sum(loaded), desc=f"  → {source_table.name}", 
+                 unit="registros", position=self.progress_position,
+                 leave=self.progress_position is None) as pbar:
             
-            offset = 0
-            while offset < total_records:
-                try:
-                    # Usar repositório para buscar batch
-                    batch = self.source_repository.fetch_batch(
-                        source_table, order_column, 
-                        self.batch_processor.batch_size, offset
+            if len(key_ranges) == 1:
+                batches = self._iter_source_batches(source_table, key_columns,
+                                                    key_ranges[0], starts[0])
+                return self._migrate_batches(
+                    source_table, target_table, column_names, batches, pbar,
+                    checkpoint=self._checkpoint_writer(source_table.name, 0, position_kind,
+                                                       key_ranges[0]),
+                    loaded=loaded[0]
+                )
+            
+            # Tabela grande: cada faixa da chave é copiada em paralelo
+            print(f"{source_table.name}: dividida em {len(key_ranges)} faixas de chave")
+            pbar_lock = threading.Lock()
+            with ThreadPoolExecutor(max_workers=len(key_ranges),
+                                    thread_name_prefix=f"shard-{source_table.name}") as pool:
+                futures = [
+                    pool.submit(
+                        self._migrate_batches, source_table, target_table, column_names,
+                        self._iter_source_batches(source_table, key_columns,
+                                                  key_range, starts[shard]),
+                        pbar, pbar_lock,
+                        self._checkpoint_writer(source_table.name, shard, position_kind,
+                                                key_range),
+                        loaded[shard]
                     )
-                    
-                    if not batch:
-                        break
-                    
+                    for shard, key_range in enumerate(key_ranges)
+                ]
+                return sum(future.result() for future in futures)
+    
+    def _record_initial_watermark(self, source_table: Table) -> None:
+        """Grava a marca d'água antes da carga completa, se a tabela tiver coluna de alteração.
+        
+        O valor é lido antes da cópia: alterações feitas durante a carga ficam
+        acima da marca e são reaplicadas (upsert) na primeira sincronização.
+        """
+        change_column = self.source_repository.get_change_column(
+            source_table, Config.INCREMENTAL_COLUMNS.get(source_table.name)
+        )
+        if change_column is None:
+            return
+        
+        high = self.source_repository.get_max_change_value(source_table, change_column)
+        self.watermark_repository.save_watermark(source_table.name, change_column, high)
+    
+    def _position_kind(self, key_columns: List[str]) -> str:
+        """Tipo da posição gerada por _iter_source_batches no modo configurado.
+        
+        'key' (última chave) e 'offset' permitem retomar; 'count' (stream sem
+        ordenação) só informa quantos registros foram lidos.
+        """
+        if Config.EXTRACTION_MODE == 'stream':
+            ordered = bool(key_columns) and PHYSLOC_COLUMN not in key_columns
+            return 'key' if ordered else 'count'
+        return 'key' if key_columns else 'offset'
+    
+    def _discard_lost_progress(self, table_name: str,
+                               checkpoints: Dict[int, Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        """Ignora os checkpoints de uma tabela UNLOGGED esvaziada pelo PostgreSQL.
+        
+        Após uma queda do servidor as tabelas UNLOGGED voltam vazias, mas os
+        checkpoints (tabela comum) continuam; sem este teste a tabela seria
+        pulada ou retomada do meio.
+        """
+        if not any(cp['rows_loaded'] for cp in checkpoints.values()):
+            return checkpoints
+        target_table = self.target_repository.get_table_metadata(table_name)
+        if self.target_repository.has_rows(target_table):
+            return checkpoints
+        print(f"{table_name}: tabela UNLOGGED vazia apesar do checkpoint "
+              f"(dados perdidos em queda do servidor). Recarregando do início.")
+        return {}
+    
+    @staticmethod
+    def _can_resume(checkpoints: Dict[int, Dict[str, Any]], position_kind: str) -> bool:
+        """Indica se os checkpoints gravados podem ser retomados no modo atual."""
+        return position_kind != 'count' and all(
+            cp['position_kind'] == position_kind for cp in checkpoints.values()
+        )
+    
+    @staticmethod
+    def _decoded_key_range(key_range: Optional[Tuple[Any, Any]]) -> Optional[Tuple[Any, Any]]:
+        """Converte a faixa lida do checkpoint; (None, None) é a tabela inteira."""
+        if key_range is None or (key_range[0] is None and key_range[1] is None):
+            return None
+        return key_range[0], key_range[1]
+    
+    def _checkpoint_writer(self, table_name: str, shard: int, position_kind: str,
+                           key_range: Optional[Tuple[Any, Any]]) -> CheckpointWriter:
+        """Cria o gerador de callbacks que gravam o progresso da faixa."""
+        def writer(position: Any, rows_loaded: int) -> Callable[[Connection], None]:
+            return lambda conn: self.checkpoint_repository.save_progress(
+                conn, table_name, shard, position_kind, position, rows_loaded, key_range
+            )
+        return writer
+    
+    def _plan_key_ranges(self, source_table: Table, key_columns: List[str],
+                         total_records: int) -> List[Optional[Tuple[Any, Any]]]:
+        """Divide a tabela em faixas da chave quando ela passa do limite configurado.
+        
+        Retorna [None] (tabela inteira) quando não há sharding.
+        """
+        if (Config.SHARD_COUNT < 2
+                or total_records < Config.SHARD_THRESHOLD_ROWS
+                or not key_columns
+                or PHYSLOC_COLUMN in key_columns):
+            return [None]
+        
+        boundaries = self.source_repository.get_shard_boundaries(
+            source_table, key_columns[0], Config.SHARD_COUNT
+        )
+        if not boundaries:
+            return [None]
+        
+        return list(zip([None] + boundaries, boundaries + [None]))
+    
+    def _migrate_batches(self, source_table: Table, target_table: Table,
+                         column_names: List[str], batches: Iterator[Tuple[List[Any], Any]],
+                         pbar: tqdm, pbar_lock: Optional[threading.Lock] = None,
+                         checkpoint: Optional[CheckpointWriter] = None,
+                         loaded: int = 0, loader: Optional[BatchLoader] = None) -> int:
+        """Carrega os batches de uma fonte (tabela inteira ou uma faixa da chave).
+        
+        loaded é o total já carregado da fonte em execução anterior; o retorno
+        é o total acumulado, gravado no checkpoint junto com cada batch. loader
+        substitui a carga padrão (ex.: upsert na sincronização incremental).
+        """
+        if Config.PIPELINE_ENABLED:
+            return self._migrate_batches_pipelined(source_table, target_table, column_names,
+                                                   batches, pbar, pbar_lock, checkpoint, loaded,
+                                                   loader)
+        
+        migrated = loaded
+        
+        # Uma conexão fixa grava todos os batches desta fonte
+        with self.target_repository.load_session():
+            for batch, position in batches:
+                try:
                     # Preparar dados
-                    batch_data = self.batch_processor.prepare_batch_data(batch, column_names)
-                    
-                    # Tentar inserir primeiro sem transformação
-                    try:
-                        success = self.target_repository.insert_batch(target_table, batch_data)
-                        if success:
-                            status = "success"
-                        else:
-                            raise Exception("Falha na inserção")
-                    except ValueError as e:
-                        if "NUL (0x00)" in str(e):
-                            # Aplicar transformação e tentar novamente
-                            transformed_data, _ = self.transformer.transform_batch(batch_data)
-                            success = self.target_repository.insert_batch(
-                                target_table, transformed_data
-                            )
-                            status = "transformed" if success else "failed"
-                        else:
-                            raise
-                    
-                    if status == "transformed":
-                        self.stats.add_table_with_issues(source_table.name, "null_chars")
-                    
-                    batch_size = len(batch)
-                    migrated += batch_size
-                    offset += batch_size
-                    pbar.update(batch_size)
-                    
+                    batch_data = self._prepare_batch(source_table, target_table, batch, column_names)
+                    progress = self._lob_writer(source_table, target_table,
+                                                self._deferred_lobs(source_table, batch),
+                                                self._progress_writer(checkpoint, position, migrated))
+                    migrated += self._load_prepared_batch(source_table, target_table, batch_data,
+                                                          len(batch), pbar, pbar_lock, progress,
+                                                          loader)
+                
                 except Exception as e:
-                    print(f"Erro no batch {offset}-{offset+self.batch_processor.batch_size}: {e}")
-                    offset += self.batch_processor.batch_size
-                    continue
+                    self.stats.add_failed_batch(source_table.name)
+                    raise BatchFailedError(f"batch até {position} não gravado: {e}") from e
+        
+        return migrated
+    
+    def _migrate_batches_pipelined(self, source_table: Table, target_table: Table,
+                                   column_names: List[str],
+                                   batches: Iterator[Tuple[List[Any], Any]],
+                                   pbar: tqdm, pbar_lock: Optional[threading.Lock] = None,
+                                   checkpoint: Optional[CheckpointWriter] = None,
+                                   loaded: int = 0,
+                                   loader: Optional[BatchLoader] = None) -> int:
+        """Mesmo fluxo de _migrate_batches, com cada estágio em sua própria thread.
+        
+        A busca do próximo batch na origem acontece enquanto o anterior é
+        preparado e gravado no destino.
+        """
+        migrated = loaded
+        # A carga roda na thread do estágio load, que associa a sessão a si mesma
+        session = self.target_repository.load_session()
+        
+        def transform(item: Tuple[List[Any], Any]
+                      ) -> Tuple[List[Dict[str, Any]], int, Any, DeferredLobs]:
+            batch, position = item
+            try:
+                return (self._prepare_batch(source_table, target_table, batch, column_names),
+                        len(batch), position, self._deferred_lobs(source_table, batch))
+            except Exception as e:
+                self.stats.add_failed_batch(source_table.name)
+                raise BatchFailedError(f"batch até {position} não gravado: {e}") from e
         
-        return migrated
\ No newline at end of file
+        def load(item: Tuple[List[Dict[str, Any]], int, Any, DeferredLobs]) -> None:
+            nonlocal migrated
+            batch_data, batch_size, position, lobs = item
+            session.bind()
+            try:
+                progress = self._lob_writer(source_table, target_table, lobs,
+                                            self._progress_writer(checkpoint, position, migrated))
+                migrated += self._load_prepared_batch(source_table, target_table, batch_data,
+                                                      batch_size, pbar, pbar_lock, progress,
+                                                      loader)
+            except Exception as e:
+                self.stats.add_failed_batch(source_table.name)
+                raise BatchFailedError(f"batch até {position} não gravado: {e}") from e
+        
+        pipeline = BatchPipeline(Config.PIPELINE_MAX_IN_FLIGHT, name=source_table.name)
+        try:
+            timings = pipeline.run(batches, transform, load)
+        finally:
+            session.close()
+        self.stats.add_stage_timings(source_table.name, timings)
+        
+        # O estágio com mais tempo ocupado é o gargalo da tabela
+        summary = ", ".join(
+            f"{stage} {timing['busy']:.1f}s ocupado/{timing['idle']:.1f}s ocioso"
+            for stage, timing in timings.items()
+        )
+        print(f"{source_table.name}: {summary}")
+        return migrated
+    
+    @staticmethod
+    def _progress_writer(checkpoint: Optional[CheckpointWriter], position: Any,
+                         migrated: int) -> Optional[ProgressWriter]:
+        """Liga o checkpoint à posição do batch; o total gravado só é conhecido na carga."""
+        if checkpoint is None:
+            return None
+        return lambda rows: checkpoint(position, migrated + rows)
+    
+    def _deferred_lobs(self, source_table: Table, batch: List[Any]) -> DeferredLobs:
+        """LOBs do batch grandes demais para virem na leitura (copiados depois, em partes)."""
+        return self.source_repository.get_deferred_lobs(
+            source_table, batch, self._lob_inline_bytes(source_table)
+        )
+    
+    def _lob_writer(self, source_table: Table, target_table: Table, lobs: DeferredLobs,
+                    progress: Optional[ProgressWriter]) -> Optional[ProgressWriter]:
+        """Acrescenta a cópia dos LOBs lidos à parte à transação do batch, antes do checkpoint.
+        
+        A linha é gravada com o LOB vazio e atualizada na mesma transação: o
+        checkpoint só avança com os valores completos.
+        """
+        if not lobs:
+            return progress
+        
+        def writer(rows: int) -> Callable[[Connection], None]:
+            checkpoint = progress(rows) if progress else None
+            
+            def on_loaded(conn: Connection) -> None:
+                self._stream_lobs(source_table, target_table, lobs, conn)
+                if checkpoint is not None:
+                    checkpoint(conn)
+            return on_loaded
+        return writer
+    
+    def _stream_lobs(self, source_table: Table, target_table: Table, lobs: DeferredLobs,
+                     conn: Connection) -> None:
+        """Copia cada LOB da origem para o destino em partes de LOB_CHUNK_MB.
+        
+        Só uma parte por vez fica em memória. NUL é removido das partes de
+        texto (o PostgreSQL não o aceita), sem o strip do caminho por linhas.
+        """
+        started = time.perf_counter()
+        key_columns = self.source_repository.get_primary_key_columns(source_table)
+        chunk_size = max(1, int(Config.LOB_CHUNK_MB * _MEGABYTE))
+        cleaned: Dict[str, int] = {}
+        written = 0
+        for key, column in lobs:
+            chunks = self.source_repository.fetch_lob_chunks(source_table, column, key, chunk_size)
+            written += self.target_repository.write_lob(
+                conn, target_table, column, key_columns, key,
+                self._without_nul(chunks, column, cleaned)
+            )
+        if cleaned:
+            self.stats.add_cleaned_values(source_table.name, cleaned)
+        self.stats.record_stage(source_table.name, 'lob', time.perf_counter() - started,
+                                len(lobs), written)
+    
+    @staticmethod
+    def _without_nul(chunks: Iterator[Any], column: str, cleaned: Dict[str, int]) -> Iterator[Any]:
+        found = False
+        for chunk in chunks:
+            if isinstance(chunk, str) and '\x00' in chunk:
+                chunk = chunk.replace('\x00', '')
+                found = True
+            yield chunk
+        if found:
+            cleaned[column] = cleaned.get(column, 0) + 1
+    
+    def _lob_inline_bytes(self, source_table: Table) -> Optional[int]:
+        """Maior LOB lido junto com o batch; None quando a tabela não tem LOBs
+        ou não pode lê-los à parte (sem chave primária)."""
+        if source_table.name not in self._lob_limits:
+            limit = None
+            if Config.LOB_INLINE_MB > 0 and self.source_repository.get_lob_columns(source_table):
+                if self.source_repository.get_primary_key_columns(source_table):
+                    limit = int(Config.LOB_INLINE_MB * _MEGABYTE)
+                else:
+                    print(f"{source_table.name}: sem chave primária; LOBs lidos inteiros no batch")
+            self._lob_limits[source_table.name] = limit
+        return self._lob_limits[source_table.name]
+    
+    @staticmethod
+    def _batch_max_bytes() -> Optional[int]:
+        """Teto de bytes dos batches lidos da origem (None: só o número de linhas)."""
+        return int(Config.BATCH_MAX_MB * _MEGABYTE) or None
+    
+    def _prepare_batch(self, source_table: Table, target_table: Table, batch: List[Any],
+                       column_names: List[str]) -> List[Dict[str, Any]]:
+        """Prepara o batch para a carga: converte os valores que o tipo de destino
+        exige e limpa NUL de antemão em tabelas conhecidas.
+        
+        Com ROW_FORMAT 'tuple' as linhas seguem posicionais até o destino;
+        no formato 'dict' cada linha vira um dicionário coluna -> valor e no
+        'arrow' o batch vira um RecordBatch.
+        """
+        if self.hooks is None:
+            return self._transform_batch(source_table, target_table, batch, column_names)
+        event = self.hooks.before(source_table.name, STAGE_TRANSFORM, len(batch))
+        try:
+            return self._transform_batch(source_table, target_table, batch, column_names)
+        finally:
+            self.hooks.after(event)
+    
+    def _transform_batch(self, source_table: Table, target_table: Table, batch: List[Any],
+                         column_names: List[str]) -> List[Dict[str, Any]]:
+        started = time.perf_counter()
+        if self.columnar is not None:
+            batch_data = self._transform_columnar(source_table, batch)
+            self.stats.record_stage(source_table.name, 'transform', time.perf_counter() - started,
+                                    len(batch_data))
+            return batch_data
+        if Config.ROW_FORMAT == 'tuple':
+            batch_data = self.batch_processor.prepare_batch_rows(batch, len(column_names))
+        else:
+            batch_data = self.batch_processor.prepare_batch_data(batch, column_names)
+        coercion_plan = self.transformer.get_coercion_plan(source_table, self.type_converter.value_coercer)
+        if coercion_plan:
+            self.transformer.coerce_batch(coercion_plan, batch_data)
+        if source_table.name in self._nul_tables:
+            self._clean_null_characters(source_table, target_table, batch_data)
+        self.stats.record_stage(source_table.name, 'transform', time.perf_counter() - started,
+                                len(batch_data))
+        return batch_data
+    
+    def _transform_columnar(self, source_table: Table, batch: List[Any]) -> Any:
+        """Converte o batch em RecordBatch e aplica as conversões e a limpeza por coluna.
+        
+        A limpeza de NUL é vetorizada e barata quando não há ocorrências, por
+        isso roda em todos os batches: a tentativa que falharia não acontece.
+        """
+        batch_data = self.columnar.to_batch(source_table, batch)
+        coercion_plan = self.transformer.get_coercion_plan(source_table, self.type_converter.value_coercer)
+        if coercion_plan:
+            batch_data = self.columnar.coerce_batch(coercion_plan, batch_data)
+        batch_data, counts = self.columnar.clean_batch(batch_data)
+        if counts:
+            self.stats.add_cleaned_values(source_table.name, counts)
+        return batch_data
+    
+    @staticmethod
+    def _as_rows(batch_data: Any) -> List[Any]:
+        """Linhas do batch para os caminhos que gravam linha a linha (RecordBatch vira tuplas)."""
+        if is_record_batch(batch_data):
+            return ColumnarTransformer.to_rows(batch_data)
+        return batch_data
+    
+    def _clean_null_characters(self, source_table: Table, target_table: Table,
+                               batch_data: List[Dict[str, Any]]) -> None:
+        """Limpa as colunas de texto do batch e contabiliza as ocorrências por coluna."""
+        counts = self.transformer.clean_batch(target_table, batch_data)
+        if counts:
+            self.stats.add_cleaned_values(source_table.name, counts)
+    
+    def _load_prepared_batch(self, source_table: Table, target_table: Table,
+                             batch_data: List[Dict[str, Any]], batch_size: int,
+                             pbar: tqdm, pbar_lock: Optional[threading.Lock] = None,
+                             progress: Optional[ProgressWriter] = None,
+                             loader: Optional[BatchLoader] = None) -> int:
+        """Grava um batch já preparado, reaplicando-o com limpeza de NUL se necessário.
+        
+        Com ERROR_MODE 'bisect' um batch que ainda falha tem as linhas ruins
+        isoladas e enviadas ao dead letter; as demais são gravadas. Retorna
+        quantas linhas foram gravadas.
+        """
+        if self.hooks is None:
+            loaded = self._load_with_recovery(source_table, target_table, batch_data, batch_size,
+                                              progress, loader)
+        else:
+            event = self.hooks.before(source_table.name, STAGE_LOAD, len(batch_data),
+                                      estimate_payload_bytes(batch_data))
+            try:
+                loaded = self._load_with_recovery(source_table, target_table, batch_data,
+                                                  batch_size, progress, loader, event.batch_index)
+            finally:
+                self.hooks.after(event)
+        
+        if pbar_lock is None:
+            pbar.update(batch_size)
+        else:
+            with pbar_lock:
+                pbar.update(batch_size)
+        return loaded
+    
+    def _load_with_recovery(self, source_table: Table, target_table: Table,
+                            batch_data: List[Dict[str, Any]], batch_size: int,
+                            progress: Optional[ProgressWriter] = None,
+                            loader: Optional[BatchLoader] = None,
+                            batch_index: Optional[int] = None) -> int:
+        load = loader or self._load_batch
+        if loader is not None:
+            batch_data = self._as_rows(batch_data)
+        on_loaded = progress(len(batch_data)) if progress else None
+        started = time.perf_counter()
+        loaded = batch_size
+        # Tentar inserir primeiro sem transformação
+        try:
+            success = load(target_table, batch_data, on_loaded)
+            status = "success"
+        except ValueError as e:
+            if "NUL (0x00)" in str(e):
+                # Aplicar transformação e tentar novamente; os próximos batches
+                # da tabela passam a ser limpos antes da carga
+                self._nul_tables.add(source_table.name)
+                self.stats.add_retry(source_table.name)
+                if self.hooks is None:
+                    self._clean_null_characters(source_table, target_table, batch_data)
+                    success = load(target_table, batch_data, on_loaded)
+                else:
+                    retry = self.hooks.before(source_table.name, STAGE_NUL_RETRY, len(batch_data),
+                                              batch_index=batch_index)
+                    try:
+                        self._clean_null_characters(source_table, target_table, batch_data)
+                        success = load(target_table, batch_data, on_loaded)
+                    finally:
+                        self.hooks.after(retry)
+                status = "transformed"
+            else:
+                raise
+        
+        if not success:
+            # O upsert da sincronização não é isolado
+            if Config.ERROR_MODE != 'bisect' or loader is not None:
+                raise Exception("Falha na inserção")
+            self.stats.add_retry(source_table.name)
+            loaded = self._load_isolating(source_table, target_table, self._as_rows(batch_data),
+                                          progress)
+        
+        if status == "transformed":
+            self.stats.add_table_with_issues(source_table.name, "null_chars")
+        elapsed = time.perf_counter() - started
+        self.batch_processor.record_load(source_table.name, batch_size, elapsed)
+        self.stats.record_stage(source_table.name, 'load', elapsed, loaded,
+                                estimate_payload_bytes(batch_data))
+        return loaded
+    
+    def _load_isolating(self, source_table: Table, target_table: Table,
+                        batch_data: List[Any], progress: Optional[ProgressWriter] = None) -> int:
+        """Grava as linhas boas de um batch com falha e envia as rejeitadas ao dead letter."""
+        on_loaded = (lambda conn, rows: progress(rows)(conn)) if progress else None
+        if Config.LOAD_METHOD in ('copy', 'copy_binary'):
+            rejected = self.target_repository.copy_isolating(
+                target_table, batch_data, binary=Config.LOAD_METHOD == 'copy_binary',
+                on_loaded=on_loaded
+            )
+        else:
+            rejected = self.target_repository.insert_isolating(target_table, batch_data, on_loaded)
+        if rejected is None:
+            raise Exception("Falha na inserção")
+        
+        if rejected:
+            def write_dead_letters() -> None:
+                self.dead_letter_repository.write(
+                    target_table, [(batch_data[index], error) for index, error in rejected]
+                )
+                self.stats.add_dead_letters(source_table.name, len(rejected))
+                self.stats.add_table_with_issues(source_table.name, "dead_letters")
+                print(f"{source_table.name}: {len(rejected)} registros rejeitados no batch "
+                      f"(primeiro erro: {rejected[0][1]})")
+            
+            # Gravado só após o commit (com COMMIT_EVERY_BATCHES > 1, o da sessão):
+            # um batch desfeito e repetido não deixa dead letters duplicados
+            self.target_repository.after_commit(write_dead_letters)
+        return len(batch_data) - len(rejected)
+    
+    def _load_batch(self, target_table: Table, batch_data: List[Dict[str, Any]],
+                    on_loaded: Optional[Callable[[Connection], None]] = None) -> bool:
+        """Carrega um batch pelo método configurado, registrando a vazão."""
+        started = time.perf_counter()
+        if Config.LOAD_METHOD in ('copy', 'copy_binary'):
+            success = self.target_repository.copy_batch(
+                target_table, batch_data, binary=Config.LOAD_METHOD == 'copy_binary',
+                on_loaded=on_loaded
+            )
+        else:
+            success = self.target_repository.insert_batch(target_table, self._as_rows(batch_data),
+                                                          on_loaded)
+        
+        if success:
+            self.stats.add_load_throughput(
+                Config.LOAD_METHOD, len(batch_data), time.perf_counter() - started
+            )
+        return success
+    
+    def _get_pagination_key(self, source_table: Table) -> List[str]:
+        """Colunas da paginação keyset; vazio quando o modo configurado é offset."""
+        if Config.PAGINATION_MODE == 'keyset':
+            return self.source_repository.get_pagination_key(source_table)
+        return []
+    
+    def _iter_source_batches(self, source_table: Table, key_columns: List[str],
+                             key_range: Optional[Tuple[Any, Any]] = None,
+                             start: Any = None) -> Iterator[Tuple[List[Any], Any]]:
+        """Gera os batches da origem com a posição alcançada após cada um.
+        
+        A posição é a última chave lida (keyset) ou o offset acumulado. No modo
+        'stream' a tabela é lida por um único cursor em vez de uma consulta por batch.
+        key_range restringe a leitura a uma faixa da chave (sharding) e start é a
+        posição de um checkpoint a partir da qual a leitura continua.
+        """
+        return self._timed_fetches(
+            source_table.name,
+            self._read_source_batches(source_table, key_columns, key_range, start)
+        )
+    
+    def _timed_fetches(self, table_name: str, batches: Iterator[Tuple[List[Any], Any]]
+                       ) -> Iterator[Tuple[List[Any], Any]]:
+        """Mede a leitura de cada batch (métricas e ajuste adaptativo do tamanho)."""
+        while True:
+            if self.hooks is None:
+                started = time.perf_counter()
+                item = next(batches, None)
+            else:
+                # A última leitura (sem linhas) também gera um evento
+                event = self.hooks.before(table_name, STAGE_FETCH)
+                started = time.perf_counter()
+                item = None
+                try:
+                    item = next(batches, None)
+                finally:
+                    if item is None:
+                        self.hooks.after(event)
+                    else:
+                        self.hooks.after(event, len(item[0]), estimate_payload_bytes(item[0]))
+            if item is None:
+                return
+            elapsed = time.perf_counter() - started
+            self.batch_processor.record_fetch(table_name, item[0], elapsed)
+            self.stats.record_stage(table_name, 'fetch', elapsed, len(item[0]),
+                                    estimate_payload_bytes(item[0]))
+            yield item
+    
+    def _read_source_batches(self, source_table: Table, key_columns: List[str],
+                             key_range: Optional[Tuple[Any, Any]] = None,
+                             start: Any = None) -> Iterator[Tuple[List[Any], Any]]:
+        budget = {
+            'max_bytes': self._batch_max_bytes(),
+            'lob_inline_bytes': self._lob_inline_bytes(source_table),
+        }
+        if Config.EXTRACTION_MODE == 'stream':
+            ordered = bool(key_columns) and PHYSLOC_COLUMN not in key_columns
+            read = 0
+            for batch in self.source_repository.stream_batches(
+                source_table, lambda: self.batch_processor.batch_size_for(source_table.name),
+                key_columns, Config.SOURCE_ARRAYSIZE, key_range,
+                start if ordered else None, **budget
+            ):
+                read += len(batch)
+                if ordered:
+                    yield batch, self.source_repository.get_row_key(batch[-1], key_columns)
+                else:
+                    yield batch, read
+        elif key_columns:
+            last_key = start
+            while True:
+                batch = self.source_repository.fetch_batch_after(
+                    source_table, key_columns,
+                    self.batch_processor.batch_size_for(source_table.name), last_key, key_range,
+                    **budget
+                )
+                if not batch:
+                    break
+                
+                last_key = self.source_repository.get_row_key(batch[-1], key_columns)
+                yield batch, last_key
+        else:
+            # Sem chave utilizável: paginação por offset
+            pk_columns = self.source_repository.get_primary_key_columns(source_table)
+            order_column = pk_columns[0] if pk_columns else source_table.columns.keys()[0]
+            offset = start or 0
+            while True:
+                batch = self.source_repository.fetch_batch(
+                    source_table, order_column,
+                    self.batch_processor.batch_size_for(source_table.name), offset, **budget
+                )
+                if not batch:
+                    break
+                
+                offset += len(batch)
+                yield batch, offset
+
+# Worker do modo 'process': cada processo do pool tem conexões e metadados próprios
+_process_migration: Optional[DataMigration] = None
+
+def _init_process_worker(resume: bool = False, staging_directory: Optional[str] = None) -> None:
+    """Cria as conexões do processo a partir da configuração (ou do staging)."""
+    global _process_migration
+    if staging_directory:
+        src = StagedSourceConn(RepositoryFactory.create_staging_repository(staging_directory))
+    else:
+        src = DatabaseConnectionFactory.create_from_config('sql_server')
+    tgt: PostgreConn = DatabaseConnectionFactory.create_from_config('postgresql')
+    src.get_db_metadata()
+    
+    _process_migration = DataMigration(src, tgt, resume=resume)
+    _process_migration.target_repository.disable_constraints()
+
+def _migrate_table_in_process(table_name: str) -> Tuple[bool, int, Dict[str, Any]]:
+    """Migra uma tabela no processo atual, devolvendo as estatísticas dessa tabela."""
+    migration = _process_migration
+    migration.stats = MigrationStats()
+    success, records = migration._migrate_table(table_name)
+    return success, records, migration.stats.get_stats()
\ No newline at end of file
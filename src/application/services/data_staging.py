@@ -0,0 +1,80 @@
+from src.domain.interfaces.staging_repository import IStagingRepository
+from src.infrastructure.database.sql_server_connection import SQLServerConn
+from src.infrastructure.serializers import json_codec
+from src.config.settings import Config
+
+from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from sqlalchemy import Table
+import time
+
+class DataStaging:
+    """Extrai as tabelas da origem para o staging local, várias ao mesmo tempo.
+    
+    Cada tabela é lida com um único cursor (sem ORDER BY) e gravada em
+    arquivos colunares; a carga no PostgreSQL é feita depois, quantas vezes
+    for preciso, com --load-from e sem acessar o SQL Server.
+    """
+    
+    def __init__(self, src: SQLServerConn, staging: IStagingRepository,
+                 resume: bool = False) -> None:
+        self.source_conn = src
+        self.source_repository = src.repository
+        self.staging = staging
+        # Com resume=True tabelas já presentes no manifesto não são extraídas de novo
+        self.resume = resume
+    
+    def extract_all(self) -> Dict[str, Optional[int]]:
+        """Extrai todas as tabelas; retorna as linhas gravadas por tabela (None em falha)."""
+        table_names = self.source_repository.get_tables_in_order()
+        self.staging.save_metadata(self.source_conn.metadata)
+        
+        extracted = self.staging.tables() if self.resume else {}
+        for table_name in table_names:
+            if table_name in extracted:
+                print(f"{table_name}: extraída em execução anterior. Pulando.")
+        pending = [name for name in table_names if name not in extracted]
+        
+        results: Dict[str, Optional[int]] = {}
+        with ThreadPoolExecutor(max_workers=max(1, Config.WORKERS),
+                                thread_name_prefix='extract') as executor:
+            futures = {executor.submit(self._extract_table, name): name for name in pending}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        
+        failed = sorted(name for name, rows in results.items() if rows is None)
+        print(f"\nExtração: {len(results) - len(failed)} de {len(pending)} tabelas gravadas")
+        if failed:
+            print(f"✗ Falha na extração: {', '.join(failed)}")
+        return results
+    
+    def _extract_table(self, table_name: str) -> Optional[int]:
+        try:
+            source_table = self.source_repository.get_table_metadata(table_name)
+            watermark = self._read_watermark(source_table)
+            
+            started = time.perf_counter()
+            rows = self.staging.write_table(
+                source_table,
+                self.source_repository.stream_batches(source_table, Config.BATCH_SIZE,
+                                                      arraysize=Config.SOURCE_ARRAYSIZE),
+                watermark
+            )
+            elapsed = time.perf_counter() - started
+            size = self.staging.tables()[table_name]['bytes']
+            print(f"✓ {table_name}: {rows:,} registros, {size / 1_000_000:.1f} MB "
+                  f"em {elapsed:.1f}s ({rows / elapsed if elapsed else 0:,.0f} registros/s)")
+            return rows
+        except Exception as e:
+            print(f"✗ Erro ao extrair {table_name}: {e}")
+            return None
+    
+    def _read_watermark(self, source_table: Table) -> Optional[Dict[str, Any]]:
+        """Marca d'água lida antes da extração, gravada pela carga como no fluxo direto."""
+        change_column = self.source_repository.get_change_column(
+            source_table, Config.INCREMENTAL_COLUMNS.get(source_table.name)
+        )
+        if change_column is None:
+            return None
+        high = self.source_repository.get_max_change_value(source_table, change_column)
+        return {'column': change_column, 'value': json_codec.dumps(high)}
@@ -0,0 +1,75 @@
+from src.infrastructure.validators.content_validator import (
+    ContentValidator, STATUS_MATCH, STATUS_COUNT_ONLY
+)
+from src.infrastructure.database.sql_server_connection import SQLServerConn
+from src.infrastructure.database.postgre_connection import PostgreConn
+from src.config.settings import Config
+
+from typing import Any, Dict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+class DataValidation:
+    """Valida o conteúdo migrado de todas as tabelas, várias ao mesmo tempo."""
+    
+    def __init__(self, src: SQLServerConn, tgt: PostgreConn) -> None:
+        self.source_repository = src.repository
+        self.target_repository = tgt.repository
+        self.validator = ContentValidator(
+            src.repository, src.engine, tgt.engine,
+            buckets=Config.VALIDATION_BUCKETS,
+            leaf_rows=Config.VALIDATION_LEAF_ROWS,
+            max_reported=Config.VALIDATION_MAX_REPORTED_ROWS
+        )
+    
+    def validate_all(self) -> Dict[str, Dict[str, Any]]:
+        """Valida cada tabela da origem contra o destino; retorna o resultado por tabela."""
+        table_names = self.source_repository.get_tables_in_order()
+        results: Dict[str, Dict[str, Any]] = {}
+        
+        with ThreadPoolExecutor(max_workers=max(1, Config.VALIDATION_WORKERS),
+                                thread_name_prefix='validation') as executor:
+            futures = {executor.submit(self._validate_table, name): name for name in table_names}
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                self._print_result(result)
+        
+        mismatched = [name for name, result in results.items()
+                      if result['status'] not in (STATUS_MATCH, STATUS_COUNT_ONLY)]
+        print(f"\nValidação: {len(results) - len(mismatched)} de {len(results)} tabelas conferem")
+        return results
+    
+    def _validate_table(self, table_name: str) -> Dict[str, Any]:
+        try:
+            if not self.target_repository.table_exists(table_name):
+                return {'table': table_name, 'status': 'missing_table'}
+            source_table = self.source_repository.get_table_metadata(table_name)
+            target_table = self.target_repository.get_table_metadata(table_name)
+            return self.validator.validate_table(source_table, target_table)
+        except Exception as e:
+            return {'table': table_name, 'status': 'error', 'error': str(e)}
+    
+    @staticmethod
+    def _print_result(result: Dict[str, Any]) -> None:
+        table_name = result['table']
+        status = result['status']
+        if status == 'missing_table':
+            print(f"✗ {table_name}: tabela não existe no destino")
+        elif status == 'error':
+            print(f"✗ {table_name}: erro na validação: {result['error']}")
+        elif status == STATUS_COUNT_ONLY:
+            print(f"✓ {table_name}: {result['target_rows']:,} registros (apenas contagem)")
+        elif status == STATUS_MATCH:
+            print(f"✓ {table_name}: conteúdo confere ({result['source_rows']:,} registros, "
+                  f"{result['buckets_compared']} buckets)")
+            if result['cleaned_count']:
+                print(f"    {result['cleaned_count']:,} registros com NUL removido na carga")
+        else:
+            print(f"✗ {table_name}: origem {result['source_rows']:,} / destino "
+                  f"{result['target_rows']:,} registros; {result['missing_count']:,} ausentes, "
+                  f"{result['extra_count']:,} extras, {result['different_count']:,} diferentes, "
+                  f"{result['cleaned_count']:,} com NUL removido na carga")
+            for name in ('missing', 'extra', 'different', 'cleaned'):
+                if result[name]:
+                    keys = ', '.join(str(key if len(key) > 1 else key[0]) for key in result[name][:10])
+                    print(f"    {name}: {keys}")
@@ -0,0 +1,103 @@
+from concurrent.futures import (
+    Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+)
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import Table
+
+class TableScheduler:
+    """Agenda a migração de tabelas em paralelo respeitando o DAG de chaves estrangeiras.
+
+    Uma tabela só é despachada depois que as tabelas que ela referencia terminaram.
+    Com ordering='none' o DAG é ignorado e todas as tabelas ficam prontas de imediato,
+    o que é seguro quando as constraints do destino estão desabilitadas.
+    """
+
+    def __init__(self, max_workers: int, executor: str = 'thread', ordering: str = 'dag') -> None:
+        self.max_workers = max_workers
+        self.executor = executor
+        self.ordering = ordering
+
+    @staticmethod
+    def build_dependencies(tables: Dict[str, Table]) -> Dict[str, Set[str]]:
+        """Monta o DAG: para cada tabela, as tabelas que ela referencia via FK."""
+        dependencies: Dict[str, Set[str]] = {}
+        for name, table in tables.items():
+            dependencies[name] = {
+                fk.column.table.name for fk in table.foreign_keys
+                if fk.column.table.name != name
+            }
+        return dependencies
+
+    def _create_executor(self, initializer: Optional[Callable[..., None]],
+                         initargs: Tuple[Any, ...] = ()) -> Executor:
+        if self.executor == 'process':
+            return ProcessPoolExecutor(max_workers=self.max_workers,
+                                       initializer=initializer, initargs=initargs)
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='migration',
+            initializer=initializer,
+            initargs=initargs
+        )
+
+    def run(
+        self,
+        table_names: List[str],
+        dependencies: Dict[str, Set[str]],
+        task: Callable[[str], Any],
+        on_complete: Callable[[str, Any, Optional[BaseException]], None],
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: Tuple[Any, ...] = (),
+        weights: Optional[Dict[str, int]] = None
+    ) -> None:
+        """Executa task para cada tabela, chamando on_complete ao fim de cada uma.
+
+        Falhas não bloqueiam as dependentes: com constraints desabilitadas a carga
+        continua, e a tabela com erro é reportada pelo on_complete. Com weights
+        (ex.: registros estimados) as tabelas prontas maiores são despachadas
+        primeiro, para que uma tabela grande não comece por último.
+        """
+        if weights:
+            table_names = sorted(table_names, key=lambda name: -weights.get(name, 0))
+        names = set(table_names)
+        if self.ordering == 'none':
+            waiting: Dict[str, Set[str]] = {name: set() for name in table_names}
+        else:
+            waiting = {name: dependencies.get(name, set()) & names for name in table_names}
+
+        dependents: Dict[str, List[str]] = {name: [] for name in table_names}
+        for name, parents in waiting.items():
+            for parent in parents:
+                dependents[parent].append(name)
+
+        submitted: Set[str] = set()
+        futures: Dict[Future, str] = {}
+
+        with self._create_executor(initializer, initargs) as pool:
+            def submit(name: str) -> None:
+                submitted.add(name)
+                futures[pool.submit(task, name)] = name
+
+            for name in table_names:
+                if not waiting[name]:
+                    submit(name)
+
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures.pop(future)
+                    error = future.exception()
+                    on_complete(name, None if error else future.result(), error)
+
+                    for child in dependents[name]:
+                        waiting[child].discard(name)
+                        if not waiting[child] and child not in submitted:
+                            submit(child)
+
+                if not futures and len(submitted) < len(table_names):
+                    # Ciclo de FKs: libera as tabelas restantes de uma vez
+                    remaining = [name for name in table_names if name not in submitted]
+                    print(f"Dependência circular entre {len(remaining)} tabelas; liberando todas")
+                    for name in remaining:
+                        submit(name)
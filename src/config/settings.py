@@ -1,9 +1,5 @@
 import os
 from dotenv import load_dotenv
-from sqlalchemy import (
-    Integer, String,Text, Boolean, Numeric, Float
-)
-from sqlalchemy.dialects.postgresql import BYTEA, TIMESTAMP
 
 load_dotenv()
 
@@ -25,6 +21,120 @@ class Config:
     
     # Migration Settings
     BATCH_SIZE = int(os.getenv('MIGRATION_BATCH_SIZE', 10000))
+    # Tamanho de batch adaptativo por tabela: busca BATCH_TARGET_SECONDS por batch
+    # (leitura + gravação) sem passar de BATCH_MEMORY_MB, dentro de [MIN, MAX].
+    # Os tamanhos finais ficam em BATCH_SIZE_HINTS e semeiam a próxima execução
+    ADAPTIVE_BATCH = os.getenv('MIGRATION_ADAPTIVE_BATCH', 'false').lower() in ('1', 'true', 'yes')
+    BATCH_SIZE_MIN = int(os.getenv('MIGRATION_BATCH_SIZE_MIN', 500))
+    BATCH_SIZE_MAX = int(os.getenv('MIGRATION_BATCH_SIZE_MAX', 100_000))
+    BATCH_TARGET_SECONDS = float(os.getenv('MIGRATION_BATCH_TARGET_SECONDS', 2.0))
+    BATCH_MEMORY_MB = int(os.getenv('MIGRATION_BATCH_MEMORY_MB', 256))
+    # Teto de bytes de cada batch lido, em qualquer modo: a leitura para ao
+    # atingi-lo mesmo antes de BATCH_SIZE linhas (0 desativa)
+    BATCH_MAX_MB = float(os.getenv('MIGRATION_BATCH_MAX_MB', 0))
+    BATCH_SIZE_HINTS = os.getenv('MIGRATION_BATCH_SIZE_HINTS', 'batch_sizes.json')
+    # LOBs ((N)VARCHAR(MAX), VARBINARY(MAX), TEXT, IMAGE...) maiores que LOB_INLINE_MB
+    # vêm vazios na leitura do batch e são copiados em seguida, em partes de
+    # LOB_CHUNK_MB, na transação do batch (tabelas com chave primária; 0 desativa)
+    LOB_INLINE_MB = float(os.getenv('MIGRATION_LOB_INLINE_MB', 0))
+    LOB_CHUNK_MB = float(os.getenv('MIGRATION_LOB_CHUNK_MB', 4))
+    # 'keyset' pagina por chave (WHERE pk > último) ; 'offset' usa LIMIT/OFFSET
+    PAGINATION_MODE = os.getenv('MIGRATION_PAGINATION_MODE', 'keyset').lower()
+    # 'paged' executa uma consulta por batch ; 'stream' lê a tabela em um único cursor
+    EXTRACTION_MODE = os.getenv('MIGRATION_EXTRACTION_MODE', 'paged').lower()
+    SOURCE_ARRAYSIZE = int(os.getenv('MIGRATION_SOURCE_ARRAYSIZE', 0)) or None
+    # 'insert' usa executemany de INSERTs ; 'copy' usa COPY FROM STDIN (texto)
+    # 'copy_binary' usa COPY no formato binário quando os tipos permitem
+    LOAD_METHOD = os.getenv('MIGRATION_LOAD_METHOD', 'insert').lower()
+    # 'dict' monta um dicionário por linha ; 'tuple' mantém as linhas posicionais
+    # do cursor até o INSERT/COPY, sem alocar um dicionário por linha
+    # 'arrow' converte cada batch em um RecordBatch (pyarrow) logo após a leitura
+    # e faz conversões, limpeza de NUL e a codificação do COPY por coluna
+    ROW_FORMAT = os.getenv('MIGRATION_ROW_FORMAT', 'dict').lower()
+    # Paralelismo entre tabelas: workers, 'thread' ou 'process', e ordenação
+    # 'dag' (respeita FKs) ou 'none' (ignora dependências; constraints já desabilitadas)
+    WORKERS = int(os.getenv('MIGRATION_WORKERS', 1))
+    EXECUTOR = os.getenv('MIGRATION_EXECUTOR', 'thread').lower()
+    TABLE_ORDERING = os.getenv('MIGRATION_TABLE_ORDERING', 'dag').lower()
+    # Tabelas com mais registros que o limite são divididas em faixas da chave
+    SHARD_THRESHOLD_ROWS = int(os.getenv('MIGRATION_SHARD_THRESHOLD_ROWS', 10_000_000))
+    SHARD_COUNT = int(os.getenv('MIGRATION_SHARD_COUNT', 1))
+    # Registros por tabela para progresso e planejamento: 'estimate' lê as
+    # estatísticas do catálogo de uma vez ; 'exact' faz COUNT(*) em cada tabela
+    ROW_COUNT_MODE = os.getenv('MIGRATION_ROW_COUNT_MODE', 'estimate').lower()
+    # Extração, transformação e carga em threads sobrepostas, com no máximo
+    # PIPELINE_MAX_IN_FLIGHT batches em memória entre os estágios
+    PIPELINE_ENABLED = os.getenv('MIGRATION_PIPELINE_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+    PIPELINE_MAX_IN_FLIGHT = int(os.getenv('MIGRATION_PIPELINE_MAX_IN_FLIGHT', 4))
+    # Tabelas com caracteres NUL conhecidos: limpas antes da carga (separadas por vírgula)
+    NUL_TABLES = [name.strip() for name in os.getenv('MIGRATION_NUL_TABLES', '').split(',') if name.strip()]
+    # Tabelas migradas: nomes ou padrões (fnmatch) separados por vírgula; sem
+    # INCLUDE_TABLES todas as tabelas não excluídas. Só elas são refletidas
+    INCLUDE_TABLES = [name.strip() for name in os.getenv('MIGRATION_INCLUDE_TABLES', '').split(',') if name.strip()]
+    EXCLUDE_TABLES = [name.strip() for name in os.getenv('MIGRATION_EXCLUDE_TABLES', '').split(',') if name.strip()]
+    # Snapshot dos metadados da origem, reaproveitado enquanto o schema não mudar (vazio desativa)
+    REFLECTION_SNAPSHOT = os.getenv('MIGRATION_REFLECTION_SNAPSHOT', 'reflection_snapshot.pickle')
+    # Estrutura adiada: tabelas criadas sem PK e índices (e UNLOGGED, se configurado);
+    # após a carga PKs, índices e FKs são criados em paralelo por FINALIZE_WORKERS,
+    # com os parâmetros de manutenção abaixo, seguidos de ANALYZE e das sequências
+    DEFERRED_CONSTRAINTS = os.getenv('MIGRATION_DEFERRED_CONSTRAINTS', 'false').lower() in ('1', 'true', 'yes')
+    UNLOGGED_TABLES = os.getenv('MIGRATION_UNLOGGED_TABLES', 'false').lower() in ('1', 'true', 'yes')
+    FINALIZE_WORKERS = int(os.getenv('MIGRATION_FINALIZE_WORKERS', 4))
+    MAINTENANCE_WORK_MEM = os.getenv('MIGRATION_MAINTENANCE_WORK_MEM', '1GB')
+    MAX_PARALLEL_MAINTENANCE_WORKERS = int(os.getenv('MIGRATION_MAX_PARALLEL_MAINTENANCE_WORKERS', 2))
+    # Pool de conexões das duas engines (SQLite usa o pool padrão, sem tamanho) e
+    # fast_executemany do pyodbc
+    POOL_SIZE = int(os.getenv('MIGRATION_POOL_SIZE', 5))
+    POOL_MAX_OVERFLOW = int(os.getenv('MIGRATION_POOL_MAX_OVERFLOW', 10))
+    POOL_TIMEOUT = float(os.getenv('MIGRATION_POOL_TIMEOUT', 30))
+    POOL_PRE_PING = os.getenv('MIGRATION_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+    POOL_RECYCLE = int(os.getenv('MIGRATION_POOL_RECYCLE', 3600))
+    FAST_EXECUTEMANY = os.getenv('MIGRATION_FAST_EXECUTEMANY', 'true').lower() in ('1', 'true', 'yes')
+    # Sessão de carga: uma conexão fixa por tabela/faixa com os parâmetros abaixo
+    # (vazio mantém o padrão do servidor) e commit a cada COMMIT_EVERY_BATCHES batches
+    SYNCHRONOUS_COMMIT = os.getenv('MIGRATION_SYNCHRONOUS_COMMIT', 'off')
+    WORK_MEM = os.getenv('MIGRATION_WORK_MEM', '')
+    COMMIT_EVERY_BATCHES = int(os.getenv('MIGRATION_COMMIT_EVERY_BATCHES', 1))
+    # Tabela de controle no destino com o progresso de cada tabela (usada pelo --resume)
+    CHECKPOINT_TABLE = os.getenv('MIGRATION_CHECKPOINT_TABLE', 'migration_checkpoint')
+    # Sincronização incremental (--incremental): marcas d'água por tabela e colunas
+    # de data de alteração no formato "tabela:coluna,tabela2:coluna2" (sem rowversion)
+    WATERMARK_TABLE = os.getenv('MIGRATION_WATERMARK_TABLE', 'migration_watermark')
+    INCREMENTAL_COLUMNS = dict(
+        (table.strip(), column.strip())
+        for table, _, column in (
+            item.partition(':') for item in os.getenv('MIGRATION_INCREMENTAL_COLUMNS', '').split(',')
+        )
+        if column.strip()
+    )
+    # Batch com falha na carga: 'skip' descarta o batch ; 'bisect' divide o batch
+    # até isolar as linhas rejeitadas, gravadas em DEAD_LETTER_DIR (JSONL por tabela)
+    ERROR_MODE = os.getenv('MIGRATION_ERROR_MODE', 'skip').lower()
+    DEAD_LETTER_DIR = os.getenv('MIGRATION_DEAD_LETTER_DIR', 'dead_letters')
+    # Métricas por tabela e estágio: relatório JSON e arquivo texto do Prometheus
+    # (textfile collector), regravados a cada METRICS_INTERVAL_SECONDS; vazio desativa
+    METRICS_REPORT = os.getenv('MIGRATION_METRICS_REPORT', 'migration_report.json')
+    METRICS_PROMETHEUS_FILE = os.getenv('MIGRATION_METRICS_PROMETHEUS_FILE', '')
+    METRICS_INTERVAL_SECONDS = float(os.getenv('MIGRATION_METRICS_INTERVAL_SECONDS', 15))
+    # Profilers do caminho dos batches, separados por vírgula: 'cprofile' (um a
+    # cada PROFILE_SAMPLE_EVERY batches), 'tracemalloc' (snapshots por tabela) e
+    # 'stacks' (pilhas amostradas a cada PROFILE_STACK_INTERVAL s, formato folded).
+    # Arquivos por tabela em PROFILE_DIR; vazio desativa sem custo na migração
+    PROFILE_HOOKS = [name.strip() for name in os.getenv('MIGRATION_PROFILE_HOOKS', '').split(',') if name.strip()]
+    PROFILE_DIR = os.getenv('MIGRATION_PROFILE_DIR', 'profiles')
+    PROFILE_SAMPLE_EVERY = int(os.getenv('MIGRATION_PROFILE_SAMPLE_EVERY', 10))
+    PROFILE_STACK_INTERVAL = float(os.getenv('MIGRATION_PROFILE_STACK_INTERVAL', 0.005))
+    # Staging colunar (--extract-to / --load-from): 'arrow' (Arrow IPC) ou 'parquet',
+    # compressão 'zstd', 'lz4' ou 'none' (leitura zero-copy) e linhas por arquivo
+    STAGING_FORMAT = os.getenv('MIGRATION_STAGING_FORMAT', 'arrow').lower()
+    STAGING_COMPRESSION = os.getenv('MIGRATION_STAGING_COMPRESSION', 'zstd').lower()
+    STAGING_FILE_ROWS = int(os.getenv('MIGRATION_STAGING_FILE_ROWS', 1000000))
+    # Validação de conteúdo (--validate): buckets por nível da recursão, linhas a
+    # partir das quais o bucket é comparado chave a chave e tabelas em paralelo
+    VALIDATION_BUCKETS = int(os.getenv('MIGRATION_VALIDATION_BUCKETS', 64))
+    VALIDATION_LEAF_ROWS = int(os.getenv('MIGRATION_VALIDATION_LEAF_ROWS', 1000))
+    VALIDATION_WORKERS = int(os.getenv('MIGRATION_VALIDATION_WORKERS', 4))
+    VALIDATION_MAX_REPORTED_ROWS = int(os.getenv('MIGRATION_VALIDATION_MAX_REPORTED_ROWS', 100))
     
     @staticmethod
     def get_sql_server_config():
@@ -46,17 +156,3 @@ class Config:
             'user': os.getenv('POSTGRES_USER'),
             'password': os.getenv('POSTGRES_PASSWORD')
         }
-    
-# Mapeamento 
-TYPE_MAPPING = {
-    'INTEGER': Integer,
-    'DATETIME': TIMESTAMP(),
-    'VARCHAR': String,
-    'VARBINARY': BYTEA(), 
-    'CHAR': String,
-    'TEXT': Text,
-    'BIT': Boolean,
-    'FLOAT': Float,
-    'NUMERIC': Numeric,
-    'DECIMAL': Numeric,
-}
\ No newline at end of file
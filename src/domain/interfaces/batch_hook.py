@@ -0,0 +1,55 @@
+import time
+from abc import ABC
+from typing import Optional
+
+# Estágios do caminho de cada batch; nul_retry é a nova carga após limpar caracteres NUL
+STAGE_FETCH = 'fetch'
+STAGE_TRANSFORM = 'transform'
+STAGE_LOAD = 'load'
+STAGE_NUL_RETRY = 'nul_retry'
+
+class BatchEvent:
+    """Uma chamada de um estágio sobre um batch, entregue antes e depois da execução.
+    
+    batch_index conta os batches da tabela em cada estágio. Antes da leitura
+    rows e nbytes ainda são 0; seconds só é preenchido no evento posterior.
+    """
+    
+    __slots__ = ('table', 'stage', 'batch_index', 'rows', 'nbytes', 'started', 'seconds')
+    
+    def __init__(self, table: str, stage: str, batch_index: int, rows: int = 0,
+                 nbytes: int = 0) -> None:
+        self.table = table
+        self.stage = stage
+        self.batch_index = batch_index
+        self.rows = rows
+        self.nbytes = nbytes
+        self.started = time.perf_counter()
+        self.seconds: Optional[float] = None
+
+class BatchHook(ABC):
+    """Interface para observar o caminho dos batches (profilers, instrumentação).
+    
+    Todos os métodos são opcionais. before_batch e after_batch de um mesmo
+    evento rodam na mesma thread; tabelas diferentes podem rodar em paralelo.
+    """
+    
+    def on_table_start(self, table: str) -> None:
+        """Início da migração (ou sincronização) de uma tabela."""
+        pass
+    
+    def on_table_end(self, table: str) -> None:
+        """Fim da tabela, com ou sem sucesso."""
+        pass
+    
+    def before_batch(self, event: BatchEvent) -> None:
+        """Antes de um estágio processar o batch."""
+        pass
+    
+    def after_batch(self, event: BatchEvent) -> None:
+        """Depois do estágio, inclusive quando ele termina com erro."""
+        pass
+    
+    def close(self) -> None:
+        """Fim da execução: libera threads e grava o que estiver pendente."""
+        pass
@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.engine import Connection
+
+class ICheckpointRepository(ABC):
+    """Interface para o armazenamento dos checkpoints da migração."""
+    
+    @abstractmethod
+    def ensure_table(self) -> None:
+        """Cria o armazenamento dos checkpoints, se ainda não existir."""
+        pass
+    
+    @abstractmethod
+    def get_checkpoints(self, table_name: str) -> Dict[int, Dict[str, Any]]:
+        """Obtém os checkpoints de uma tabela, indexados pela faixa (shard)."""
+        pass
+    
+    @abstractmethod
+    def start_table(self, table_name: str, position_kind: str,
+                    key_ranges: List[Optional[Tuple[Any, Any]]]) -> None:
+        """Reinicia os checkpoints de uma tabela com uma linha por faixa planejada."""
+        pass
+    
+    @abstractmethod
+    def save_progress(self, conn: Connection, table_name: str, shard: int, position_kind: str,
+                      position: Any, rows_loaded: int,
+                      key_range: Optional[Tuple[Any, Any]] = None) -> None:
+        """Grava o progresso de uma faixa na transação de conn."""
+        pass
+    
+    @abstractmethod
+    def mark_table(self, table_name: str, status: str) -> None:
+        """Atualiza o status de todas as faixas de uma tabela."""
+        pass
+
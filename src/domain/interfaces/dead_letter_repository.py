@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Tuple
+from sqlalchemy import Table
+
+class IDeadLetterRepository(ABC):
+    """Interface para as linhas rejeitadas na carga (dead letters)."""
+    
+    @abstractmethod
+    def write(self, table: Table, rejected: List[Tuple[Any, str]]) -> None:
+        """Grava as linhas rejeitadas de uma tabela com o erro de cada uma."""
+        pass
+    
+    @abstractmethod
+    def write_retry(self, table: Table, rejected: List[Tuple[Any, str]]) -> None:
+        """Grava as linhas que falharam de novo no reprocessamento; pendentes só após archive."""
+        pass
+    
+    @abstractmethod
+    def tables(self) -> List[str]:
+        """Lista as tabelas com linhas rejeitadas pendentes."""
+        pass
+    
+    @abstractmethod
+    def read(self, table_name: str) -> Iterator[Tuple[Dict[str, Any], str]]:
+        """Lê as linhas rejeitadas de uma tabela e o erro de cada uma."""
+        pass
+    
+    @abstractmethod
+    def begin_replay(self, table_name: str) -> None:
+        """Prepara o reprocessamento de uma tabela (descarta falhas de um anterior interrompido)."""
+        pass
+    
+    @abstractmethod
+    def archive(self, table_name: str) -> None:
+        """Conclui o reprocessamento: as linhas de write_retry substituem as pendentes."""
+        pass
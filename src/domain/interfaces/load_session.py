@@ -0,0 +1,40 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable, ContextManager
+from sqlalchemy.engine import Connection
+
+class LoadSessionError(Exception):
+    """Falha ao confirmar os batches acumulados pela sessão de carga.
+    
+    Não deriva de SQLAlchemyError para não ser tratada como falha de um
+    único batch: os batches desde o último commit foram perdidos.
+    """
+
+class ILoadSession(ABC):
+    """Interface para a sessão de carga: uma conexão fixa por tabela ou worker."""
+    
+    @abstractmethod
+    def bind(self) -> None:
+        """Passa a usar esta sessão nas cargas da thread atual."""
+        pass
+    
+    @abstractmethod
+    def transaction(self) -> ContextManager[Connection]:
+        """Contexto da gravação de um batch na conexão da sessão."""
+        pass
+    
+    @abstractmethod
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """Executa callback após o commit dos batches pendentes (na hora, se não houver)."""
+        pass
+    
+    @abstractmethod
+    def close(self) -> None:
+        """Confirma os batches pendentes e devolve a conexão ao pool."""
+        pass
+    
+    def __enter__(self) -> 'ILoadSession':
+        self.bind()
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
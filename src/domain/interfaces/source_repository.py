@@ -1,5 +1,5 @@
 from abc import abstractmethod
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional, Sequence, Tuple, Iterator, Union
 from sqlalchemy import Table
 from src.domain.interfaces.repository import IRepository
 
@@ -16,18 +16,117 @@ class ISourceRepository(IRepository):
         """Obtém lista de tabelas ordenadas por dependências."""
         pass
     
+    @abstractmethod
+    def get_estimated_counts(self) -> Dict[str, int]:
+        """Estima os registros de todas as tabelas pelas estatísticas do catálogo."""
+        pass
+    
+    @abstractmethod
+    def has_rows(self, table: Table) -> bool:
+        """Verifica se a tabela tem ao menos um registro."""
+        pass
+    
     @abstractmethod
     def fetch_batch(
         self, 
         table: Table, 
         order_column: str, 
         batch_size: int, 
-        offset: int
+        offset: int,
+        max_bytes: Optional[int] = None,
+        lob_inline_bytes: Optional[int] = None
     ) -> List[Any]:
-        """Busca um lote de dados."""
+        """Busca um lote de dados (limitado também a max_bytes, se informado)."""
+        pass
+
+    @abstractmethod
+    def fetch_batch_after(
+        self,
+        table: Table,
+        key_columns: List[str],
+        batch_size: int,
+        last_key: Optional[Sequence[Any]] = None,
+        key_range: Optional[Tuple[Any, Any]] = None,
+        max_bytes: Optional[int] = None,
+        lob_inline_bytes: Optional[int] = None
+    ) -> List[Any]:
+        """Busca o lote seguinte à última chave lida."""
+        pass
+
+    @abstractmethod
+    def stream_batches(
+        self,
+        table: Table,
+        batch_size: Union[int, Callable[[], int]],
+        key_columns: Optional[List[str]] = None,
+        arraysize: Optional[int] = None,
+        key_range: Optional[Tuple[Any, Any]] = None,
+        last_key: Optional[Sequence[Any]] = None,
+        max_bytes: Optional[int] = None,
+        lob_inline_bytes: Optional[int] = None
+    ) -> Iterator[List[Any]]:
+        """Lê a tabela em uma única consulta, entregando lotes em streaming."""
+        pass
+    
+    @abstractmethod
+    def get_shard_boundaries(self, table: Table, key_column: str, shards: int,
+                             key_range: Optional[Tuple[Any, Any]] = None) -> List[Any]:
+        """Calcula fronteiras que dividem a tabela (ou uma faixa dela) em faixas da chave."""
         pass
     
+    @abstractmethod
+    def get_change_column(self, table: Table, configured: Optional[str] = None) -> Optional[str]:
+        """Obtém a coluna rowversion/data de alteração usada na sincronização incremental."""
+        pass
+    
+    @abstractmethod
+    def get_max_change_value(self, table: Table, change_column: str) -> Any:
+        """Obtém o maior valor confirmado da coluna de alteração."""
+        pass
+    
+    @abstractmethod
+    def fetch_changes_after(
+        self,
+        table: Table,
+        key_columns: List[str],
+        batch_size: int,
+        low: Any,
+        high: Any,
+        last_key: Optional[Sequence[Any]] = None,
+        max_bytes: Optional[int] = None,
+        lob_inline_bytes: Optional[int] = None
+    ) -> List[Any]:
+        """Busca o próximo lote de linhas alteradas no intervalo (low, high]."""
+        pass
+    
+    @abstractmethod
+    def get_pagination_key(self, table: Table) -> List[str]:
+        """Obtém as colunas usadas na paginação por chave."""
+        pass
+
+    @abstractmethod
+    def get_row_key(self, row: Any, key_columns: List[str]) -> Tuple[Any, ...]:
+        """Extrai de uma linha os valores da chave de paginação."""
+        pass
+
     @abstractmethod
     def get_primary_key_columns(self, table: Table) -> List[str]:
         """Obtém colunas de chave primária de uma tabela."""
+        pass
+    
+    @abstractmethod
+    def get_lob_columns(self, table: Table) -> List[str]:
+        """Obtém as colunas LOB (tamanho ilimitado) de uma tabela."""
+        pass
+    
+    @abstractmethod
+    def get_deferred_lobs(self, table: Table, rows: Sequence[Any],
+                          lob_inline_bytes: Optional[int]) -> List[Tuple[Tuple[Any, ...], str]]:
+        """Obtém os LOBs do lote que não vieram na leitura: (chave primária, coluna)."""
+        pass
+    
+    @abstractmethod
+    def fetch_lob_chunks(self, table: Table, column_name: str, key: Sequence[Any],
+                         chunk_size: int) -> Iterator[Any]:
+        """Lê em partes o valor de um LOB da linha com a chave primária informada."""
         pass
\ No newline at end of file
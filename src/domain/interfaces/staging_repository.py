@@ -0,0 +1,37 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import MetaData, Table
+
+class IStagingRepository(ABC):
+    """Interface para o staging local: tabelas extraídas da origem para arquivos."""
+    
+    @abstractmethod
+    def save_metadata(self, metadata: MetaData) -> None:
+        """Grava os metadados refletidos da origem junto dos arquivos."""
+        pass
+    
+    @abstractmethod
+    def load_metadata(self) -> MetaData:
+        """Lê os metadados da origem gravados na extração."""
+        pass
+    
+    @abstractmethod
+    def write_table(self, table: Table, batches: Iterable[List[Any]],
+                    watermark: Optional[Dict[str, Any]] = None) -> int:
+        """Grava os batches de uma tabela e a registra no manifesto; retorna as linhas."""
+        pass
+    
+    @abstractmethod
+    def tables(self) -> Dict[str, Dict[str, Any]]:
+        """Entradas do manifesto das tabelas extraídas por completo."""
+        pass
+    
+    @abstractmethod
+    def read_rows(self, table_name: str, offset: int, limit: int) -> List[Any]:
+        """Lê até limit linhas da tabela a partir da linha offset."""
+        pass
+    
+    @abstractmethod
+    def read_batch(self, table_name: str, offset: int, limit: int) -> Any:
+        """Lê até limit linhas da tabela a partir de offset como um RecordBatch Arrow."""
+        pass
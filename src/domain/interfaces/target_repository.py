@@ -1,7 +1,9 @@
 from abc import abstractmethod
-from typing import List, Dict, Any
+from typing import Callable, Iterable, List, Dict, Any, Optional, Sequence, Tuple
 from sqlalchemy import Table
+from sqlalchemy.engine import Connection
 from src.domain.interfaces.repository import IRepository
+from src.domain.interfaces.load_session import ILoadSession
 
 class ITargetRepository(IRepository):
     """Interface para repositórios de destino (escrita)."""
@@ -12,8 +14,77 @@ class ITargetRepository(IRepository):
         pass
     
     @abstractmethod
-    def insert_batch(self, table: Table, data: List[Dict[str, Any]]) -> bool:
-        """Insere um lote de dados."""
+    def load_session(self) -> ILoadSession:
+        """Cria a sessão de carga (conexão fixa) usada pelas cargas da thread que a associar."""
+        pass
+    
+    @abstractmethod
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Executa callback após o commit dos batches já gravados pela thread."""
+        pass
+    
+    @abstractmethod
+    def insert_batch(self, table: Table, data: List[Any],
+                     on_loaded: Optional[Callable[[Connection], None]] = None) -> bool:
+        """Insere um lote (dicionários ou tuplas na ordem das colunas); on_loaded roda na mesma transação."""
+        pass
+    
+    @abstractmethod
+    def insert_isolating(self, table: Table, data: List[Any],
+                         on_loaded: Optional[Callable[[Connection, int], None]] = None
+                         ) -> Optional[List[Tuple[int, str]]]:
+        """Insere um lote isolando as linhas rejeitadas; retorna (posição, erro) de cada uma."""
+        pass
+    
+    @abstractmethod
+    def upsert_batch(self, table: Table, data: List[Any],
+                     key_columns: List[str],
+                     on_loaded: Optional[Callable[[Connection], None]] = None) -> bool:
+        """Insere ou atualiza um lote de dados pela chave; on_loaded roda na mesma transação."""
+        pass
+    
+    @abstractmethod
+    def write_lob(self, conn: Connection, table: Table, column_name: str,
+                  key_columns: List[str], key: Sequence[Any], chunks: Iterable[Any]) -> int:
+        """Grava em partes o valor de um LOB de uma linha já carregada; retorna os bytes gravados."""
+        pass
+    
+    @abstractmethod
+    def copy_batch(self, table: Table, data: List[Any], binary: bool = False,
+                   on_loaded: Optional[Callable[[Connection], None]] = None) -> bool:
+        """Carrega um lote de dados via COPY; on_loaded roda na mesma transação."""
+        pass
+    
+    @abstractmethod
+    def copy_isolating(self, table: Table, data: List[Any], binary: bool = False,
+                       on_loaded: Optional[Callable[[Connection, int], None]] = None
+                       ) -> Optional[List[Tuple[int, str]]]:
+        """Carrega um lote via COPY isolando as linhas rejeitadas; retorna (posição, erro) de cada uma."""
+        pass
+    
+    @abstractmethod
+    def has_rows(self, table: Table) -> bool:
+        """Verifica se a tabela tem ao menos um registro."""
+        pass
+    
+    @abstractmethod
+    def build_table_structure(self, table: Table) -> bool:
+        """Cria a chave primária e os índices da definição final e torna a tabela LOGGED."""
+        pass
+    
+    @abstractmethod
+    def add_foreign_keys(self, table: Table) -> bool:
+        """Cria as chaves estrangeiras da definição final."""
+        pass
+    
+    @abstractmethod
+    def analyze_table(self, table: Table) -> bool:
+        """Atualiza as estatísticas da tabela."""
+        pass
+    
+    @abstractmethod
+    def reset_sequences(self, table: Table) -> bool:
+        """Ajusta as sequências da tabela ao maior valor carregado."""
         pass
     
     @abstractmethod
@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
+from typing import Any, Callable, Optional
 from sqlalchemy import Column
 from sqlalchemy.types import TypeEngine
 
+# Converte um valor lido da origem para o tipo Python esperado pelo destino
+ValueCoercer = Callable[[Any], Any]
+
 class TypeConverterStrategy(ABC):
     """Interface base para estratégias de conversão de tipos."""
     
@@ -13,4 +17,12 @@ class TypeConverterStrategy(ABC):
     @abstractmethod
     def convert(self, column: Column) -> TypeEngine:
         """Converte o tipo da coluna."""
-        pass
\ No newline at end of file
+        pass
+    
+    def can_convert_column(self, column: Column) -> bool:
+        """Verifica pela coluna refletida; por padrão usa o nome do tipo."""
+        return self.can_convert(str(column.type))
+    
+    def value_coercer(self, column: Column) -> Optional[ValueCoercer]:
+        """Conversão dos valores da coluna na carga; None quando não é necessária."""
+        return None
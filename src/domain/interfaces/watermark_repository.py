@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+class IWatermarkRepository(ABC):
+    """Interface para as marcas d'água da sincronização incremental."""
+    
+    @abstractmethod
+    def ensure_table(self) -> None:
+        """Cria o armazenamento das marcas d'água, se ainda não existir."""
+        pass
+    
+    @abstractmethod
+    def get_watermark(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """Obtém a coluna e o último valor sincronizado de uma tabela."""
+        pass
+    
+    @abstractmethod
+    def save_watermark(self, table_name: str, column_name: str, value: Any) -> None:
+        """Grava o último valor sincronizado de uma tabela."""
+        pass
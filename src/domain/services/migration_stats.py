@@ -1,15 +1,32 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 from datetime import datetime
+import copy
+import threading
+
+# Limites (segundos) do histograma de duração dos batches por estágio
+LATENCY_BUCKETS: List[float] = [0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0]
 
 class MigrationStats:
+    """Estatísticas da migração; seguro para atualização por várias threads."""
+    
     def __init__(self) -> None:
+        self._lock = threading.Lock()
         self._stats: Dict[str, Any] = {
             'tables_migrated': 0,
             'total_records': 0,
             'failed_tables': [],
             'start_time': None,
             'end_time': None,
-            'tables_with_issues': []
+            'tables_with_issues': [],
+            'load_throughput': {},
+            'stage_timings': {},
+            'batch_sizes': {},
+            'cleaned_values': {},
+            'dead_letters': {},
+            # Por tabela: duração, registros, novas tentativas, batches com
+            # falha, pico de RSS do processo e, por estágio (fetch/transform/
+            # load/lob), tempo, registros, bytes e histograma de duração dos batches
+            'table_metrics': {}
         }
     
     def start_migration(self) -> None:
@@ -19,17 +36,161 @@ class MigrationStats:
         self._stats['end_time'] = datetime.now()
     
     def add_successful_table(self, table_name: str, records: int) -> None:
-        self._stats['tables_migrated'] += 1
-        self._stats['total_records'] += records
+        with self._lock:
+            self._stats['tables_migrated'] += 1
+            self._stats['total_records'] += records
     
     def add_failed_table(self, table_name: str) -> None:
-        self._stats['failed_tables'].append(table_name)
+        with self._lock:
+            self._stats['failed_tables'].append(table_name)
     
     def add_table_with_issues(self, table_name: str, issue_type: str) -> None:
-        self._stats['tables_with_issues'].append({
-            'table': table_name,
-            'issue': issue_type
+        with self._lock:
+            self._stats['tables_with_issues'].append({
+                'table': table_name,
+                'issue': issue_type
+            })
+    
+    def add_load_throughput(self, method: str, records: int, seconds: float) -> None:
+        with self._lock:
+            self._add_load_throughput(method, records, seconds)
+    
+    def _add_load_throughput(self, method: str, records: int, seconds: float) -> None:
+        throughput = self._stats['load_throughput'].setdefault(
+            method, {'records': 0, 'seconds': 0.0, 'records_per_second': 0.0}
+        )
+        throughput['records'] += records
+        throughput['seconds'] += seconds
+        if throughput['seconds'] > 0:
+            throughput['records_per_second'] = throughput['records'] / throughput['seconds']
+    
+    def add_stage_timings(self, table_name: str, timings: Dict[str, Dict[str, float]]) -> None:
+        """Acumula o tempo ocupado/ocioso de cada estágio do pipeline da tabela."""
+        with self._lock:
+            self._add_stage_timings(table_name, timings)
+    
+    def _add_stage_timings(self, table_name: str, timings: Dict[str, Dict[str, float]]) -> None:
+        table_timings = self._stats['stage_timings'].setdefault(table_name, {})
+        for stage, timing in timings.items():
+            accumulated = table_timings.setdefault(stage, {'busy': 0.0, 'idle': 0.0, 'batches': 0})
+            for field in accumulated:
+                accumulated[field] += timing.get(field, 0)
+    
+    def set_batch_size(self, table_name: str, batch_size: int) -> None:
+        """Registra o tamanho de batch final escolhido para a tabela."""
+        with self._lock:
+            self._stats['batch_sizes'][table_name] = batch_size
+    
+    def add_cleaned_values(self, table_name: str, counts: Dict[str, int]) -> None:
+        """Acumula, por coluna, quantos valores tiveram caracteres NUL removidos."""
+        with self._lock:
+            self._add_cleaned_values(table_name, counts)
+    
+    def _add_cleaned_values(self, table_name: str, counts: Dict[str, int]) -> None:
+        table_counts = self._stats['cleaned_values'].setdefault(table_name, {})
+        for column, count in counts.items():
+            table_counts[column] = table_counts.get(column, 0) + count
+    
+    def add_dead_letters(self, table_name: str, count: int) -> None:
+        """Acumula as linhas rejeitadas na carga e enviadas ao dead letter."""
+        with self._lock:
+            self._add_dead_letters(table_name, count)
+    
+    def _add_dead_letters(self, table_name: str, count: int) -> None:
+        dead_letters = self._stats['dead_letters']
+        dead_letters[table_name] = dead_letters.get(table_name, 0) + count
+    
+    def record_stage(self, table_name: str, stage: str, seconds: float,
+                     rows: int, nbytes: int = 0) -> None:
+        """Registra um batch de um estágio da tabela (fetch, transform, load ou lob)."""
+        with self._lock:
+            stage_metrics = self._stage_metrics(table_name, stage)
+            stage_metrics['seconds'] += seconds
+            stage_metrics['rows'] += rows
+            stage_metrics['bytes'] += nbytes
+            stage_metrics['batches'] += 1
+            buckets = stage_metrics['latency_buckets']
+            for index, limit in enumerate(LATENCY_BUCKETS):
+                if seconds <= limit:
+                    buckets[index] += 1
+                    break
+            else:
+                buckets[-1] += 1
+    
+    def add_retry(self, table_name: str) -> None:
+        """Conta uma nova tentativa de carga (limpeza de NUL ou isolamento por bisseção)."""
+        with self._lock:
+            self._table_metrics(table_name)['retries'] += 1
+    
+    def add_failed_batch(self, table_name: str) -> None:
+        with self._lock:
+            self._table_metrics(table_name)['failed_batches'] += 1
+    
+    def set_table_result(self, table_name: str, records: int, seconds: float) -> None:
+        """Registra a duração total e os registros migrados da tabela."""
+        with self._lock:
+            table_metrics = self._table_metrics(table_name)
+            table_metrics['records'] = records
+            table_metrics['seconds'] = seconds
+    
+    def set_peak_rss(self, table_name: str, nbytes: int) -> None:
+        """Registra o pico de RSS do processo (bytes) enquanto a tabela era migrada."""
+        with self._lock:
+            table_metrics = self._table_metrics(table_name)
+            table_metrics['peak_rss_bytes'] = max(table_metrics['peak_rss_bytes'], nbytes)
+    
+    def _table_metrics(self, table_name: str) -> Dict[str, Any]:
+        return self._stats['table_metrics'].setdefault(table_name, {
+            'records': 0, 'seconds': 0.0, 'retries': 0, 'failed_batches': 0,
+            'peak_rss_bytes': 0, 'stages': {}
         })
     
+    def _stage_metrics(self, table_name: str, stage: str) -> Dict[str, Any]:
+        # Um contador a mais no histograma para os batches acima do último limite
+        return self._table_metrics(table_name)['stages'].setdefault(stage, {
+            'seconds': 0.0, 'rows': 0, 'bytes': 0, 'batches': 0,
+            'latency_buckets': [0] * (len(LATENCY_BUCKETS) + 1)
+        })
+    
+    def _merge_table_metrics(self, table_name: str, metrics: Dict[str, Any]) -> None:
+        table_metrics = self._table_metrics(table_name)
+        for field in ('retries', 'failed_batches'):
+            table_metrics[field] += metrics.get(field, 0)
+        table_metrics['peak_rss_bytes'] = max(table_metrics['peak_rss_bytes'],
+                                              metrics.get('peak_rss_bytes', 0))
+        if metrics.get('seconds'):
+            table_metrics['records'] = metrics['records']
+            table_metrics['seconds'] = metrics['seconds']
+        for stage, stage_metrics in metrics.get('stages', {}).items():
+            accumulated = self._stage_metrics(table_name, stage)
+            for field in ('seconds', 'rows', 'bytes', 'batches'):
+                accumulated[field] += stage_metrics[field]
+            accumulated['latency_buckets'] = [
+                current + added for current, added
+                in zip(accumulated['latency_buckets'], stage_metrics['latency_buckets'])
+            ]
+    
+    def merge_worker_stats(self, worker_stats: Dict[str, Any]) -> None:
+        """Incorpora ocorrências e vazão coletadas por um worker em outro processo."""
+        with self._lock:
+            self._stats['tables_with_issues'].extend(worker_stats.get('tables_with_issues', []))
+            for method, throughput in worker_stats.get('load_throughput', {}).items():
+                self._add_load_throughput(method, throughput['records'], throughput['seconds'])
+            for table_name, timings in worker_stats.get('stage_timings', {}).items():
+                self._add_stage_timings(table_name, timings)
+            self._stats['batch_sizes'].update(worker_stats.get('batch_sizes', {}))
+            for table_name, counts in worker_stats.get('cleaned_values', {}).items():
+                self._add_cleaned_values(table_name, counts)
+            for table_name, count in worker_stats.get('dead_letters', {}).items():
+                self._add_dead_letters(table_name, count)
+            for table_name, metrics in worker_stats.get('table_metrics', {}).items():
+                self._merge_table_metrics(table_name, metrics)
+    
     def get_stats(self) -> Dict[str, Any]:
-        return self._stats.copy()
\ No newline at end of file
+        with self._lock:
+            return self._stats.copy()
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Cópia completa e consistente, para leitura por outra thread durante a migração."""
+        with self._lock:
+            return copy.deepcopy(self._stats)
\ No newline at end of file
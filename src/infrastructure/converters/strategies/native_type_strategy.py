@@ -0,0 +1,111 @@
+from typing import Any, Callable, Dict, Optional, Type
+from sqlalchemy import Column
+from sqlalchemy import types as sqltypes
+from sqlalchemy.dialects import mssql, postgresql
+from sqlalchemy.types import TypeEngine
+from src.domain.interfaces.type_converter import TypeConverterStrategy, ValueCoercer
+
+# Precisão máxima de frações de segundo no PostgreSQL (SQL Server vai até 7)
+_PG_MAX_SECONDS_PRECISION = 6
+
+def _seconds_precision(type_: TypeEngine) -> Optional[int]:
+    precision = getattr(type_, 'precision', None)
+    return None if precision is None else min(precision, _PG_MAX_SECONDS_PRECISION)
+
+def _string(type_: TypeEngine) -> TypeEngine:
+    # Sem tamanho (VARCHAR(MAX)/NVARCHAR(MAX)) vira TEXT
+    length = getattr(type_, 'length', None)
+    return postgresql.VARCHAR(length) if length else postgresql.TEXT()
+
+def _char(type_: TypeEngine) -> TypeEngine:
+    return postgresql.CHAR(getattr(type_, 'length', None) or 1)
+
+def _float(type_: TypeEngine) -> TypeEngine:
+    # FLOAT(n) do SQL Server: n <= 24 é precisão simples, senão dupla
+    precision = getattr(type_, 'precision', None)
+    if precision is not None and precision <= 24:
+        return postgresql.REAL()
+    return postgresql.DOUBLE_PRECISION()
+
+def _numeric(type_: TypeEngine) -> TypeEngine:
+    return postgresql.NUMERIC(getattr(type_, 'precision', None), getattr(type_, 'scale', None))
+
+def _timestamp(type_: TypeEngine) -> TypeEngine:
+    return postgresql.TIMESTAMP(timezone=bool(getattr(type_, 'timezone', False)),
+                                precision=_seconds_precision(type_))
+
+def _time(type_: TypeEngine) -> TypeEngine:
+    return postgresql.TIME(precision=_seconds_precision(type_))
+
+def _text_value(value: Any) -> Any:
+    return value if value is None or isinstance(value, str) else str(value)
+
+# Tipo do destino de cada tipo do SQL Server, preservando tamanho, precisão e escala.
+# A busca segue a hierarquia da classe; os tipos genéricos do fim cobrem
+# origens de outros dialetos
+_NATIVE_TYPES: Dict[Type[TypeEngine], Callable[[TypeEngine], TypeEngine]] = {
+    mssql.BIT: lambda type_: postgresql.BOOLEAN(),
+    mssql.TINYINT: lambda type_: postgresql.SMALLINT(),
+    mssql.MONEY: lambda type_: postgresql.NUMERIC(19, 4),
+    mssql.SMALLMONEY: lambda type_: postgresql.NUMERIC(10, 4),
+    mssql.DATETIMEOFFSET: lambda type_: postgresql.TIMESTAMP(
+        timezone=True, precision=_seconds_precision(type_)
+    ),
+    mssql.SMALLDATETIME: lambda type_: postgresql.TIMESTAMP(precision=0),
+    mssql.UNIQUEIDENTIFIER: lambda type_: postgresql.UUID(as_uuid=False),
+    mssql.XML: lambda type_: postgresql.TEXT(),
+    mssql.SQL_VARIANT: lambda type_: postgresql.TEXT(),
+    mssql.NTEXT: lambda type_: postgresql.TEXT(),
+    # TIMESTAMP do SQL Server é o rowversion (8 bytes), não data
+    mssql.TIMESTAMP: lambda type_: postgresql.BYTEA(),
+    sqltypes.Boolean: lambda type_: postgresql.BOOLEAN(),
+    sqltypes.REAL: lambda type_: postgresql.REAL(),
+    sqltypes.BigInteger: lambda type_: postgresql.BIGINT(),
+    sqltypes.SmallInteger: lambda type_: postgresql.SMALLINT(),
+    sqltypes.Integer: lambda type_: postgresql.INTEGER(),
+    sqltypes.Float: _float,
+    sqltypes.Numeric: _numeric,
+    sqltypes.DateTime: _timestamp,
+    sqltypes.Date: lambda type_: postgresql.DATE(),
+    sqltypes.Time: _time,
+    sqltypes.Uuid: lambda type_: postgresql.UUID(as_uuid=False),
+    sqltypes.CHAR: _char,
+    sqltypes.NCHAR: _char,
+    sqltypes.Text: lambda type_: postgresql.TEXT(),
+    sqltypes.String: _string,
+    sqltypes._Binary: lambda type_: postgresql.BYTEA(),
+}
+
+# Conversão do valor lido da origem para o tipo do destino, quando o driver
+# devolve outro tipo Python (uuid.UUID para UUID textual, sql_variant como texto)
+_VALUE_COERCERS: Dict[Type[TypeEngine], ValueCoercer] = {
+    sqltypes.Uuid: _text_value,
+    mssql.SQL_VARIANT: _text_value,
+}
+
+class NativeTypeStrategy(TypeConverterStrategy):
+    """Estratégia que mapeia cada tipo de origem para o tipo nativo do PostgreSQL.
+    
+    A escolha é pela classe do tipo refletido (e não pelo texto), então
+    NVARCHAR, DATETIME2, UNIQUEIDENTIFIER, MONEY etc. não caem em String.
+    """
+    
+    def can_convert(self, type_name: str) -> bool:
+        # Depende da classe do tipo; ver can_convert_column
+        return False
+    
+    def can_convert_column(self, column: Column) -> bool:
+        return _lookup(_NATIVE_TYPES, column.type) is not None
+    
+    def convert(self, column: Column) -> TypeEngine:
+        return _lookup(_NATIVE_TYPES, column.type)(column.type)
+    
+    def value_coercer(self, column: Column) -> Optional[ValueCoercer]:
+        return _lookup(_VALUE_COERCERS, column.type)
+
+def _lookup(table: Dict[Type[TypeEngine], Any], type_: TypeEngine) -> Any:
+    """Entrada da classe do tipo ou da superclasse mais próxima."""
+    for cls in type(type_).__mro__:
+        if cls in table:
+            return table[cls]
+    return None
@@ -1,33 +1,55 @@
-from typing import List
+from typing import Dict, Hashable, List, Optional, Tuple
 from sqlalchemy import Column, String
 from sqlalchemy.types import TypeEngine
-from src.domain.interfaces.type_converter import TypeConverterStrategy
-from src.infrastructure.converters.strategies.varchar_strategy import VarcharStrategy
-from src.infrastructure.converters.strategies.mapping_strategy import MappingStrategy
+from src.domain.interfaces.type_converter import TypeConverterStrategy, ValueCoercer
+from src.infrastructure.converters.strategies.native_type_strategy import NativeTypeStrategy
 from src.infrastructure.converters.strategies.default_strategy import DefaultStrategy
-from src.config.settings import TYPE_MAPPING
+
+def type_key(type_: TypeEngine) -> Hashable:
+    """Chave do tipo: a classe e os parâmetros (tamanho, precisão, escala, fuso...)."""
+    params = tuple(sorted(
+        (name, value) for name, value in vars(type_).items()
+        if isinstance(value, (int, float, str, bool, type(None)))
+    ))
+    return type(type_), params
 
 class TypeConverter:
-    """Conversor de tipos usando Strategy Pattern."""
+    """Conversor de tipos usando Strategy Pattern.
+    
+    O resultado de cada tipo de origem (classe + parâmetros) é memorizado: a
+    cadeia de estratégias roda uma vez por tipo distinto, não por coluna.
+    """
     
     def __init__(self):
         self.strategies: List[TypeConverterStrategy] = [
-            VarcharStrategy(),
-            MappingStrategy(TYPE_MAPPING),
-            DefaultStrategy()  
+            NativeTypeStrategy(),
+            # Tipos sem classe conhecida (ex.: geography refletido como NullType)
+            DefaultStrategy()
         ]
+        self._cache: Dict[Hashable, Tuple[TypeEngine, Optional[ValueCoercer]]] = {}
     
     def convert_column_type(self, column: Column) -> TypeEngine:
         """Converte o tipo de uma coluna do SQL Server para PostgreSQL."""
-        type_name = str(column.type)
-        
-        for strategy in self.strategies:
-            if strategy.can_convert(type_name):
-                return strategy.convert(column)
-        
-        return String()
+        return self._resolve(column)[0]
+    
+    def value_coercer(self, column: Column) -> Optional[ValueCoercer]:
+        """Conversão dos valores da coluna de origem exigida pelo tipo de destino, se houver."""
+        return self._resolve(column)[1]
+    
+    def _resolve(self, column: Column) -> Tuple[TypeEngine, Optional[ValueCoercer]]:
+        key = type_key(column.type)
+        resolved = self._cache.get(key)
+        if resolved is None:
+            resolved = (String(), None)
+            for strategy in self.strategies:
+                if strategy.can_convert_column(column):
+                    resolved = (strategy.convert(column), strategy.value_coercer(column))
+                    break
+            self._cache[key] = resolved
+        return resolved
+
+_default_converter = TypeConverter()
 
 # Função para manter compatibilidade com código existente
 def convert_column_type(column: Column) -> TypeEngine:
-    converter = TypeConverter()
-    return converter.convert_column_type(column)
\ No newline at end of file
+    return _default_converter.convert_column_type(column)
@@ -1,9 +1,30 @@
+from typing import Any, Dict
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from src.config.settings import Config
 
 class DBServerConn:
     def __init__(self, sql_uri):
         self.uri = sql_uri
         self.engine = self.return_engine()
-
+    
     def return_engine(self):
-        return create_engine(self.uri)  
\ No newline at end of file
+        return create_engine(self.uri, **self.engine_options())
+    
+    def engine_options(self) -> Dict[str, Any]:
+        """Parâmetros do pool de conexões (e do driver) para o create_engine."""
+        url = make_url(self.uri)
+        options: Dict[str, Any] = {
+            'pool_pre_ping': Config.POOL_PRE_PING,
+            'pool_recycle': Config.POOL_RECYCLE,
+        }
+        # SQLite em memória usa um pool sem tamanho nem overflow
+        if url.get_backend_name() != 'sqlite':
+            options.update(
+                pool_size=Config.POOL_SIZE,
+                max_overflow=Config.POOL_MAX_OVERFLOW,
+                pool_timeout=Config.POOL_TIMEOUT,
+            )
+        if url.get_driver_name() == 'pyodbc':
+            options['fast_executemany'] = Config.FAST_EXECUTEMANY
+        return options
@@ -1,11 +1,16 @@
 from src.infrastructure.database.sql_server_connection import SQLServerConn
 from src.infrastructure.database.base_connection import DBServerConn
 from src.domain.interfaces.target_repository import ITargetRepository
+from src.domain.interfaces.checkpoint_repository import ICheckpointRepository
+from src.domain.interfaces.watermark_repository import IWatermarkRepository
 from src.infrastructure.factories.repository_factory import RepositoryFactory
 from src.infrastructure.converters.type_converter import TypeConverter
 
-from typing import List, Tuple, Optional
-from sqlalchemy import Table, MetaData, Column
+from src.config.settings import Config
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Tuple, Optional, Sequence
+from sqlalchemy import Table, MetaData, Column, ForeignKeyConstraint, Identity, Index
 
 import os
 
@@ -17,10 +22,33 @@ class PostgreConn(DBServerConn):
             self.engine, 
             self.schema
         )
+        self.checkpoint_repository: ICheckpointRepository = (
+            RepositoryFactory.create_checkpoint_repository(self.engine, self.schema)
+        )
+        self.watermark_repository: IWatermarkRepository = (
+            RepositoryFactory.create_watermark_repository(self.engine, self.schema)
+        )
         self.type_converter = TypeConverter()
-
-    def create_tables(self, SQLMetadata: SQLServerConn, creation_order: List[str]) -> None:
-        """Cria tabelas no PostgreSQL usando o repositório."""
+    
+    def clone(self) -> 'PostgreConn':
+        """Cria uma conexão com engine própria para uso por outro worker."""
+        return PostgreConn(self.uri)
+    
+    def create_tables(self, SQLMetadata: SQLServerConn, creation_order: List[str],
+                      deferred: bool = False, unlogged: bool = False) -> None:
+        """Cria tabelas no PostgreSQL usando o repositório.
+        
+        Com deferred as tabelas são criadas sem chave primária (a coluna que seria
+        SERIAL vira IDENTITY) para uma carga sem manutenção de índices; a
+        estrutura é criada depois por finalize_tables. Com unlogged as tabelas
+        são UNLOGGED (sem WAL) até a finalização. As duas opções dependem de
+        recursos do PostgreSQL: em outros destinos as tabelas são criadas completas.
+        """
+        if (deferred or unlogged) and not self.supports_deferred_structure():
+            print(f"Estrutura adiada e tabelas UNLOGGED exigem PostgreSQL; tabelas em "
+                  f"{self.engine.dialect.name} criadas com a estrutura completa")
+            deferred = unlogged = False
+        
         created: List[str] = []
         failed: List[Tuple[str, str]] = []
         
@@ -32,21 +60,7 @@ class PostgreConn(DBServerConn):
                 pg_metadata = MetaData(schema=self.schema)
                 
                 # Criar tabela nova com tipos adaptados
-                columns = []
-                for col in source_table.columns:
-                    new_type = self.type_converter.convert_column_type(col)
-                    
-                    columns.append(Column(
-                        name=col.name,
-                        type_=new_type,
-                        nullable=col.nullable,
-                        primary_key=col.primary_key,
-                        autoincrement=col.autoincrement,
-                        index=col.index,
-                        default=col.default
-                    ))
-                
-                target_table = Table(table_name, pg_metadata, *columns)
+                target_table = self._build_table(source_table, pg_metadata, deferred, unlogged)
                 
                 # Usar repositório para criar tabela
                 if self.repository.create_table(target_table):
@@ -54,9 +68,139 @@ class PostgreConn(DBServerConn):
                     print(f"✓ Tabela {table_name} criada com sucesso")
                 else:
                     failed.append((table_name, "Falha ao criar tabela"))
-                
+            
             except Exception as e:
                 failed.append((table_name, str(e)))
                 print(f"✗ Erro ao criar tabela {table_name}: {e}")
         
-        print(f"\nResumo: {len(created)} criadas, {len(failed)} falharam")
\ No newline at end of file
+        print(f"\nResumo: {len(created)} criadas, {len(failed)} falharam")
+    
+    def supports_deferred_structure(self) -> bool:
+        """Indica se o destino aceita estrutura adiada e tabelas UNLOGGED."""
+        return self.engine.dialect.name == 'postgresql'
+    
+    def finalize_tables(self, SQLMetadata: SQLServerConn, table_names: List[str],
+                        failed_tables: Sequence[str] = ()) -> None:
+        """Completa as tabelas criadas com deferred/unlogged, após a carga.
+        
+        Fases, cada uma em paralelo entre as tabelas (FINALIZE_WORKERS):
+        SET LOGGED, chave primária e índices; chaves estrangeiras (que dependem
+        das chaves primárias das tabelas referenciadas); ANALYZE e ajuste das
+        sequências ao maior valor carregado.
+        
+        Tabelas em failed_tables (carga com falha) ficam de fora, assim como as
+        FKs que as referenciam: a estrutura é criada quando a carga for retomada.
+        """
+        if not self.supports_deferred_structure():
+            return
+        
+        failed = set(failed_tables)
+        skipped = [table_name for table_name in table_names if table_name in failed]
+        if skipped:
+            print(f"✗ Estrutura não criada para tabelas com falha na carga: {', '.join(skipped)}")
+            table_names = [table_name for table_name in table_names if table_name not in skipped]
+        
+        pg_metadata = MetaData(schema=self.schema)
+        final_tables: Dict[str, Table] = {}
+        for table_name in table_names:
+            final_tables[table_name] = self._build_table(SQLMetadata.tables[table_name], pg_metadata)
+        for table_name in table_names:
+            self._add_indexes(SQLMetadata.tables[table_name], final_tables[table_name])
+        for table_name in table_names:
+            self._add_foreign_keys(SQLMetadata.tables[table_name], final_tables)
+        
+        phases = [
+            ("chaves primárias e índices", self.repository.build_table_structure),
+            ("chaves estrangeiras", self.repository.add_foreign_keys),
+            ("estatísticas e sequências", self._analyze_and_reset),
+        ]
+        for description, operation in phases:
+            print(f"Criando {description}...")
+            failed: List[str] = []
+            with ThreadPoolExecutor(max_workers=max(1, Config.FINALIZE_WORKERS)) as executor:
+                futures = {
+                    executor.submit(operation, final_tables[table_name]): table_name
+                    for table_name in table_names
+                }
+                for future in as_completed(futures):
+                    if not future.result():
+                        failed.append(futures[future])
+            if failed:
+                print(f"✗ Falha em {description}: {', '.join(sorted(failed))}")
+        
+        print(f"✓ Estrutura finalizada para {len(table_names)} tabelas")
+    
+    def _analyze_and_reset(self, table: Table) -> bool:
+        analyzed = self.repository.analyze_table(table)
+        return self.repository.reset_sequences(table) and analyzed
+    
+    def _build_table(self, source_table: Table, pg_metadata: MetaData,
+                     deferred: bool = False, unlogged: bool = False) -> Table:
+        """Monta a tabela do destino com os tipos convertidos da tabela de origem."""
+        columns = []
+        for col in source_table.columns:
+            new_type = self.type_converter.convert_column_type(col)
+            
+            columns.append(Column(
+                name=col.name,
+                type_=new_type,
+                nullable=col.nullable,
+                primary_key=col.primary_key,
+                autoincrement=col.autoincrement,
+                index=col.index,
+                default=col.default
+            ))
+        
+        target_table = Table(source_table.name, pg_metadata, *columns)
+        if not deferred and not unlogged:
+            return target_table
+        
+        # Sem chave primária não há SERIAL: a coluna autoincremento vira IDENTITY
+        serial_column = target_table.autoincrement_column if deferred else None
+        columns = [
+            Column(
+                col.name,
+                col.type,
+                *([Identity()] if col is serial_column else []),
+                nullable=col.nullable and not col.primary_key,
+                primary_key=col.primary_key and not deferred,
+                autoincrement=col.autoincrement,
+                default=col.default
+            )
+            for col in target_table.columns
+        ]
+        pg_metadata.remove(target_table)
+        return Table(
+            source_table.name, pg_metadata, *columns,
+            prefixes=['UNLOGGED'] if unlogged else []
+        )
+    
+    @staticmethod
+    def _add_indexes(source_table: Table, target_table: Table) -> None:
+        """Recria no destino os índices da origem (nomes de índice são únicos por schema no PostgreSQL)."""
+        for index in source_table.indexes:
+            names = [col.name for col in index.columns]
+            if not names or any(name not in target_table.c for name in names):
+                continue
+            Index(
+                f"{target_table.name}_{index.name}"[:63],
+                *[target_table.c[name] for name in names],
+                unique=bool(index.unique)
+            )
+    
+    @staticmethod
+    def _add_foreign_keys(source_table: Table, final_tables: Dict[str, Table]) -> None:
+        """Recria as FKs da origem cujas tabelas referenciadas também foram migradas."""
+        target_table = final_tables[source_table.name]
+        for constraint in source_table.foreign_key_constraints:
+            referred = final_tables.get(constraint.referred_table.name)
+            if referred is None:
+                continue
+            columns = [element.parent.name for element in constraint.elements]
+            name = constraint.name or f"fk_{source_table.name}_{'_'.join(columns)}"
+            target_table.append_constraint(ForeignKeyConstraint(
+                columns,
+                [referred.c[element.column.name] for element in constraint.elements],
+                name=f"{target_table.name}_{name}"[:63] if constraint.name else name[:63],
+                postgresql_not_valid=True
+            ))
@@ -25,4 +25,11 @@ class SQLServerConn(DBServerConn):
         self.sorted_tables = self.repository.get_sorted_tables()
         
         # Atualizar metadata local para compatibilidade
-        self.metadata = self.repository.metadata
\ No newline at end of file
+        self.metadata = self.repository.metadata
+    
+    def clone(self) -> 'SQLServerConn':
+        """Cria uma conexão com engine própria, reaproveitando os metadados já carregados."""
+        clone = SQLServerConn(self.uri)
+        clone.repository.share_metadata(self.repository)
+        clone.get_db_metadata()
+        return clone
\ No newline at end of file
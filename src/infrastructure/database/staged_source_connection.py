@@ -0,0 +1,34 @@
+from typing import Dict, List, Optional
+from sqlalchemy import MetaData
+from sqlalchemy.sql.schema import Table as TableType
+from src.domain.interfaces.staging_repository import IStagingRepository
+from src.infrastructure.repositories.staged_source_repository import StagedSourceRepository
+
+class StagedSourceConn:
+    """Origem da carga a partir do staging: mesma interface de SQLServerConn, sem banco.
+    
+    Permite criar as tabelas e rodar a DataMigration em outra máquina, só
+    com os arquivos da extração.
+    """
+    
+    def __init__(self, staging: IStagingRepository,
+                 repository: Optional[StagedSourceRepository] = None) -> None:
+        self.staging = staging
+        self.engine = None
+        self.repository = repository or StagedSourceRepository(staging)
+        self.metadata: MetaData = self.repository.metadata
+        self.sorted_tables: Optional[List[TableType]] = None
+        self.tables_names: List[str] = []
+        self.tables: Dict[str, TableType] = {}
+    
+    def get_db_metadata(self) -> None:
+        """Carrega os metadados das tabelas extraídas."""
+        self.tables = self.repository.get_all_tables_metadata()
+        self.tables_names = list(self.tables.keys())
+        self.sorted_tables = self.repository.get_sorted_tables()
+    
+    def clone(self) -> 'StagedSourceConn':
+        """Os arquivos são lidos por thread; o mesmo staging serve a todos os workers."""
+        clone = StagedSourceConn(self.staging, self.repository)
+        clone.get_db_metadata()
+        return clone
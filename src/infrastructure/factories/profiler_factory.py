@@ -0,0 +1,33 @@
+from typing import Callable, Dict, List, Optional
+from src.domain.interfaces.batch_hook import BatchHook
+from src.infrastructure.profiling.batch_hooks import BatchHooks
+from src.infrastructure.profiling.profilers import CProfileHook, StackSamplerHook, TracemallocHook
+from src.config.settings import Config
+
+class ProfilerFactory:
+    """Factory para criar os profilers do caminho dos batches."""
+    
+    # Registro dos profilers embutidos, pelo nome usado em MIGRATION_PROFILE_HOOKS
+    _profilers: Dict[str, Callable[[], BatchHook]] = {
+        'cprofile': lambda: CProfileHook(Config.PROFILE_DIR, Config.PROFILE_SAMPLE_EVERY),
+        'tracemalloc': lambda: TracemallocHook(Config.PROFILE_DIR),
+        'stacks': lambda: StackSamplerHook(Config.PROFILE_DIR, Config.PROFILE_STACK_INTERVAL),
+    }
+    
+    @classmethod
+    def create(cls, names: List[str]) -> Optional[BatchHooks]:
+        """Cria os profilers pedidos; None quando nenhum está ativo."""
+        hooks: List[BatchHook] = []
+        for name in names:
+            profiler = cls._profilers.get(name.lower())
+            if profiler is None:
+                raise ValueError(
+                    f"Profiler '{name}' não suportado. "
+                    f"Profilers válidos: {sorted(cls._profilers)}"
+                )
+            hooks.append(profiler())
+        return BatchHooks(hooks) if hooks else None
+    
+    @classmethod
+    def create_from_config(cls) -> Optional[BatchHooks]:
+        return cls.create(Config.PROFILE_HOOKS)
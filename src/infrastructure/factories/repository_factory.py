@@ -2,8 +2,17 @@ from typing import Optional
 from sqlalchemy.engine import Engine
 from src.domain.interfaces.source_repository import ISourceRepository
 from src.domain.interfaces.target_repository import ITargetRepository
+from src.domain.interfaces.checkpoint_repository import ICheckpointRepository
+from src.domain.interfaces.watermark_repository import IWatermarkRepository
+from src.domain.interfaces.dead_letter_repository import IDeadLetterRepository
+from src.domain.interfaces.staging_repository import IStagingRepository
 from src.infrastructure.repositories.source_repository import SourceRepository
 from src.infrastructure.repositories.target_repository import TargetRepository
+from src.infrastructure.repositories.checkpoint_repository import CheckpointRepository
+from src.infrastructure.repositories.watermark_repository import WatermarkRepository
+from src.infrastructure.repositories.dead_letter_repository import DeadLetterRepository
+from src.infrastructure.repositories.staging_repository import StagingRepository
+from src.config.settings import Config
 
 class RepositoryFactory:
     """Factory para criar repositórios."""
@@ -11,7 +20,12 @@ class RepositoryFactory:
     @staticmethod
     def create_source_repository(engine: Engine) -> ISourceRepository:
         """Cria um repositório de origem."""
-        return SourceRepository(engine)
+        return SourceRepository(
+            engine,
+            include_tables=Config.INCLUDE_TABLES,
+            exclude_tables=Config.EXCLUDE_TABLES,
+            snapshot_path=Config.REFLECTION_SNAPSHOT
+        )
     
     @staticmethod
     def create_target_repository(
@@ -19,4 +33,45 @@ class RepositoryFactory:
         schema: Optional[str] = None
     ) -> ITargetRepository:
         """Cria um repositório de destino."""
-        return TargetRepository(engine, schema)
\ No newline at end of file
+        session_settings = {
+            'synchronous_commit': Config.SYNCHRONOUS_COMMIT,
+            'work_mem': Config.WORK_MEM,
+        }
+        return TargetRepository(engine, schema, {
+            'maintenance_work_mem': Config.MAINTENANCE_WORK_MEM,
+            'max_parallel_maintenance_workers': str(Config.MAX_PARALLEL_MAINTENANCE_WORKERS),
+        }, session_settings={name: value for name, value in session_settings.items() if value},
+           commit_every=Config.COMMIT_EVERY_BATCHES)
+    
+    @staticmethod
+    def create_checkpoint_repository(
+        engine: Engine,
+        schema: Optional[str] = None
+    ) -> ICheckpointRepository:
+        """Cria o repositório de checkpoints (tabela de controle no destino)."""
+        return CheckpointRepository(engine, schema, Config.CHECKPOINT_TABLE)
+    
+    
+    @staticmethod
+    def create_watermark_repository(
+        engine: Engine,
+        schema: Optional[str] = None
+    ) -> IWatermarkRepository:
+        """Cria o repositório de marcas d'água da sincronização incremental."""
+        return WatermarkRepository(engine, schema, Config.WATERMARK_TABLE)
+    
+    
+    @staticmethod
+    def create_dead_letter_repository() -> IDeadLetterRepository:
+        """Cria o repositório de linhas rejeitadas na carga (arquivos locais)."""
+        return DeadLetterRepository(Config.DEAD_LETTER_DIR)
+    
+    @staticmethod
+    def create_staging_repository(directory: str) -> IStagingRepository:
+        """Cria o repositório do staging colunar (arquivos locais da extração)."""
+        return StagingRepository(
+            directory,
+            file_format=Config.STAGING_FORMAT,
+            compression=Config.STAGING_COMPRESSION,
+            file_rows=Config.STAGING_FILE_ROWS
+        )
@@ -0,0 +1,63 @@
+from typing import Any, List, Optional
+from src.infrastructure.serializers.arrow_codec import pa, pc, require_pyarrow
+
+# Sequências de escape do formato texto do COPY; a barra precisa vir primeiro
+_TEXT_ESCAPES = (
+    ('\\', '\\\\'),
+    ('\t', '\\t'),
+    ('\n', '\\n'),
+    ('\r', '\\r'),
+)
+
+class ArrowCopyEncoder:
+    """Codifica RecordBatches no formato texto do COPY FROM STDIN com operações de coluna.
+    
+    Cada coluna é formatada de uma vez (cast para texto, escapes, NULL) e as
+    linhas são montadas pelo join elemento a elemento do pyarrow; o conteúdo
+    do COPY é o buffer de dados do array resultante, sem uma string Python
+    por valor. Só colunas binárias (bytea em hexadecimal) são formatadas
+    valor a valor.
+    """
+    
+    NULL = '\\N'
+    
+    def __init__(self) -> None:
+        require_pyarrow()
+    
+    def encode(self, batch: 'pa.RecordBatch', column_names: Optional[List[str]] = None) -> Any:
+        """Gera o conteúdo do COPY do batch (column_names segue a ordem das colunas do batch)."""
+        if batch.num_rows == 0:
+            return pa.BufferReader(b'')
+        
+        columns = [self._format_column(column) for column in batch.columns]
+        separator = pa.scalar('\t', pa.large_string())
+        lines = pc.binary_join_element_wise(*columns, separator) if len(columns) > 1 else columns[0]
+        # Cada linha termina em '\n': o buffer de dados do array é o conteúdo completo
+        lines = pc.binary_join_element_wise(lines, pa.scalar('', pa.large_string()),
+                                            pa.scalar('\n', pa.large_string()))
+        size = pc.sum(pc.binary_length(lines)).as_py()
+        return pa.BufferReader(lines.buffers()[2].slice(0, size))
+    
+    def _format_column(self, column: 'pa.Array') -> 'pa.Array':
+        type_ = column.type
+        if pa.types.is_null(type_):
+            return pa.array([self.NULL] * len(column), pa.large_string())
+        if pa.types.is_binary(type_) or pa.types.is_large_binary(type_):
+            # Entrada hex do bytea; a barra é duplicada por causa do escape do COPY
+            column = pa.array(
+                [None if value is None else '\\\\x' + value.hex() for value in column.to_pylist()],
+                pa.large_string()
+            )
+        elif pa.types.is_string(type_) or pa.types.is_large_string(type_):
+            column = column.cast(pa.large_string())
+            for character, escaped in _TEXT_ESCAPES:
+                column = pc.replace_substring(column, character, escaped)
+        elif pa.types.is_timestamp(type_) and type_.tz is not None:
+            # Instantes em UTC com offset explícito ('+00' em vez do 'Z' do Arrow)
+            column = column.cast(pa.timestamp(type_.unit)).cast(pa.large_string())
+            column = pc.binary_join_element_wise(column, pa.scalar('', pa.large_string()),
+                                                 pa.scalar('+00', pa.large_string()))
+        else:
+            # Números, datas e horários: o texto do Arrow é aceito pelo PostgreSQL
+            column = column.cast(pa.large_string())
+        return pc.fill_null(column, self.NULL)
@@ -0,0 +1,266 @@
+import struct
+from datetime import date, datetime, time, timezone
+from decimal import Context, Decimal, MAX_EMAX, MAX_PREC, MIN_EMIN
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from uuid import UUID
+from sqlalchemy import Table, types as sqltypes
+from sqlalchemy.types import TypeEngine
+from src.infrastructure.loaders.copy_encoder import values_getter
+
+# Cabeçalho do formato binário: assinatura, flags e tamanho da extensão
+_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('!ii', 0, 0)
+_TRAILER = struct.pack('!h', -1)
+_NULL = struct.pack('!i', -1)
+
+_FIELD_COUNT = struct.Struct('!h').pack
+_LENGTH = struct.Struct('!i').pack
+_INT2 = struct.Struct('!ih').pack
+_INT4 = struct.Struct('!ii').pack
+_INT8 = struct.Struct('!iq').pack
+_FLOAT4 = struct.Struct('!if').pack
+_FLOAT8 = struct.Struct('!id').pack
+_BOOL = struct.Struct('!i?').pack
+_NUMERIC_HEADER = struct.Struct('!ihhHh').pack
+_DIGITS_PACKERS: Dict[int, Callable[..., bytes]] = {}
+# Precisão ilimitada para que scaleb nunca arredonde o valor
+_NUMERIC_CONTEXT = Context(prec=MAX_PREC, Emax=MAX_EMAX, Emin=MIN_EMIN)
+
+_PG_EPOCH = datetime(2000, 1, 1)
+_PG_EPOCH_ORDINAL = _PG_EPOCH.toordinal()
+
+# Sinais do numeric: positivo, negativo, NaN, +infinito e -infinito
+_NUMERIC_POS = 0x0000
+_NUMERIC_NEG = 0x4000
+_NUMERIC_NAN = 0xC000
+_NUMERIC_PINF = 0xD000
+_NUMERIC_NINF = 0xF000
+
+def _encode_int2(value: Any) -> bytes:
+    return _INT2(2, value)
+
+def _encode_int4(value: Any) -> bytes:
+    return _INT4(4, value)
+
+def _encode_int8(value: Any) -> bytes:
+    return _INT8(8, value)
+
+def _encode_float4(value: Any) -> bytes:
+    return _FLOAT4(4, value)
+
+def _encode_float8(value: Any) -> bytes:
+    return _FLOAT8(8, value)
+
+def _encode_bool(value: Any) -> bytes:
+    return _BOOL(1, bool(value))
+
+def _encode_bytea(value: Any) -> bytes:
+    return _LENGTH(len(value)) + bytes(value)
+
+def _encode_text(value: Any) -> bytes:
+    if not isinstance(value, str):
+        value = _text_value(value)
+    data = value.encode('utf-8')
+    return _LENGTH(len(data)) + data
+
+def _text_value(value: Any) -> str:
+    """Representação textual igual à que o COPY texto produziria para a coluna."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return '\\x' + bytes(value).hex()
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    return str(value)
+
+def _encode_timestamp(value: datetime) -> bytes:
+    """Microssegundos desde 2000-01-01; valores com fuso são levados para UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = value - _PG_EPOCH
+    micros = (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+    return _INT8(8, micros)
+
+def _encode_timestamptz(value: datetime) -> bytes:
+    """Como _encode_timestamp, mas exige fuso: sem ele o PostgreSQL usaria o TimeZone da sessão."""
+    if value.tzinfo is None:
+        raise ValueError(f"Valor sem fuso horário para coluna timestamptz: {value}")
+    return _encode_timestamp(value)
+
+def _is_naive(value: Any) -> bool:
+    return isinstance(value, datetime) and value.tzinfo is None
+
+def _encode_date(value: date) -> bytes:
+    if isinstance(value, datetime):
+        value = value.date()
+    return _INT4(4, value.toordinal() - _PG_EPOCH_ORDINAL)
+
+def _encode_time(value: time) -> bytes:
+    micros = ((value.hour * 60 + value.minute) * 60 + value.second) * 1000000 + value.microsecond
+    return _INT8(8, micros)
+
+def _encode_uuid(value: Any) -> bytes:
+    data = value.bytes if isinstance(value, UUID) else UUID(str(value)).bytes
+    return _LENGTH(16) + data
+
+def _encode_numeric(value: Any) -> bytes:
+    """Codifica em dígitos base 10000 alinhados à vírgula decimal (formato do numeric_send)."""
+    if not isinstance(value, Decimal):
+        value = Decimal(repr(value)) if isinstance(value, float) else Decimal(value)
+
+    if not value.is_finite():
+        if value.is_nan():
+            return _NUMERIC_HEADER(8, 0, 0, _NUMERIC_NAN, 0)
+        return _NUMERIC_HEADER(8, 0, 0, _NUMERIC_NINF if value < 0 else _NUMERIC_PINF, 0)
+
+    sign, _, exponent = value.as_tuple()
+    dscale = -exponent if exponent < 0 else 0
+    fraction_groups = (dscale + 3) // 4
+
+    # Inteiro com a parte fracionária completada até um múltiplo de 4 dígitos
+    remaining = int(value.copy_abs().scaleb(4 * fraction_groups, _NUMERIC_CONTEXT))
+    if not remaining:
+        return _NUMERIC_HEADER(8, 0, 0, _NUMERIC_POS, dscale)
+
+    groups = []
+    while remaining:
+        remaining, group = divmod(remaining, 10000)
+        groups.append(group)
+    weight = len(groups) - fraction_groups - 1
+
+    # Grupos zerados à direita são implícitos no formato
+    first = 0
+    while groups[first] == 0:
+        first += 1
+    groups = groups[first:][::-1]
+
+    ndigits = len(groups)
+    return _NUMERIC_HEADER(
+        8 + 2 * ndigits, ndigits, weight,
+        _NUMERIC_NEG if sign else _NUMERIC_POS, dscale
+    ) + _digits_packer(ndigits)(*groups)
+
+def _digits_packer(ndigits: int) -> Callable[..., bytes]:
+    packer = _DIGITS_PACKERS.get(ndigits)
+    if packer is None:
+        packer = _DIGITS_PACKERS[ndigits] = struct.Struct(f'!{ndigits}h').pack
+    return packer
+
+def _encoder_for_type(type_: TypeEngine) -> Optional[Callable[[Any], bytes]]:
+    """Escolhe o codificador binário para o tipo da coluna de destino."""
+    if isinstance(type_, sqltypes.Boolean):
+        return _encode_bool
+    if isinstance(type_, sqltypes.BigInteger):
+        return _encode_int8
+    if isinstance(type_, sqltypes.SmallInteger):
+        return _encode_int2
+    if isinstance(type_, sqltypes.Integer):
+        return _encode_int4
+    # Float herda de Numeric, então precisa vir antes
+    if isinstance(type_, sqltypes.Float):
+        precision = getattr(type_, 'precision', None)
+        if isinstance(type_, sqltypes.REAL) or (precision is not None and precision <= 24):
+            return _encode_float4
+        return _encode_float8
+    if isinstance(type_, sqltypes.Numeric):
+        return _encode_numeric
+    if isinstance(type_, sqltypes.LargeBinary):
+        return _encode_bytea
+    if isinstance(type_, sqltypes.DateTime):
+        return _encode_timestamptz if type_.timezone else _encode_timestamp
+    if isinstance(type_, sqltypes.Date):
+        return _encode_date
+    if isinstance(type_, sqltypes.Time) and not type_.timezone:
+        return _encode_time
+    if isinstance(type_, sqltypes.Uuid):
+        return _encode_uuid
+    if isinstance(type_, sqltypes.String):
+        return _encode_text
+    return None
+
+class _BufferReader:
+    """Leitor somente-leitura sobre o buffer, consumido pelo copy_expert."""
+
+    def __init__(self, buffer: bytearray) -> None:
+        self._view = memoryview(buffer)
+        self._position = 0
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = len(self._view) - self._position
+        chunk = self._view[self._position:self._position + size]
+        self._position += len(chunk)
+        return bytes(chunk)
+
+    def release(self) -> None:
+        self._view.release()
+
+class BinaryCopyEncoder:
+    """Codifica linhas no formato binário do COPY a partir dos tipos de destino.
+
+    Os tipos vêm das colunas da tabela criada pelo TypeConverter. O buffer é
+    reutilizado entre os lotes para evitar realocações a cada COPY.
+    """
+
+    def __init__(self, column_types: Sequence[TypeEngine]) -> None:
+        encoders = [_encoder_for_type(type_) for type_ in column_types]
+        if any(encoder is None for encoder in encoders):
+            raise ValueError("Tipo de coluna sem codificação binária suportada")
+
+        self._encoders: List[Callable[[Any], bytes]] = encoders
+        self._timestamptz_columns = [
+            index for index, encoder in enumerate(encoders) if encoder is _encode_timestamptz
+        ]
+        self._field_count = _FIELD_COUNT(len(encoders))
+        self._buffer = bytearray()
+        self._reader: Optional[_BufferReader] = None
+
+    @staticmethod
+    def supports(table: Table) -> bool:
+        """Indica se todas as colunas da tabela têm codificação binária."""
+        return all(_encoder_for_type(col.type) is not None for col in table.columns)
+
+    @classmethod
+    def for_table(cls, table: Table) -> 'BinaryCopyEncoder':
+        return cls([col.type for col in table.columns])
+
+    def accepts(self, rows: Sequence[Any], column_names: List[str]) -> bool:
+        """Indica se as linhas podem ir no formato binário.
+
+        Datas sem fuso em colunas timestamptz são interpretadas no TimeZone da
+        sessão pelo COPY texto e pelo INSERT; como o formato binário não tem
+        essa conversão, lotes com esses valores devem usar o formato texto.
+        """
+        columns = self._timestamptz_columns
+        if not columns:
+            return True
+
+        values_of = values_getter(rows, column_names)
+        for row in rows:
+            values = values_of(row)
+            if any(_is_naive(values[index]) for index in columns):
+                return False
+        return True
+
+    def encode(self, rows: Sequence[Any], column_names: List[str]) -> _BufferReader:
+        """Gera o conteúdo binário do COPY para as linhas no buffer reutilizável."""
+        if self._reader is not None:
+            # Libera a view anterior para permitir redimensionar o buffer
+            self._reader.release()
+            self._reader = None
+
+        buffer = self._buffer
+        del buffer[:]
+        buffer += _HEADER
+
+        encoders = self._encoders
+        field_count = self._field_count
+        values_of = values_getter(rows, column_names)
+
+        for row in rows:
+            buffer += field_count
+            for encode, value in zip(encoders, values_of(row)):
+                buffer += _NULL if value is None else encode(value)
+
+        buffer += _TRAILER
+        self._reader = _BufferReader(buffer)
+        return self._reader
@@ -0,0 +1,79 @@
+import io
+from datetime import date, datetime, time
+from decimal import Decimal
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Mapping, Sequence
+from uuid import UUID
+
+# Sequências de escape do formato texto do COPY
+_TEXT_ESCAPES = str.maketrans({
+    '\\': '\\\\',
+    '\t': '\\t',
+    '\n': '\\n',
+    '\r': '\\r',
+})
+
+def _format_text(value: str) -> str:
+    return value.translate(_TEXT_ESCAPES)
+
+def _format_bytes(value: Any) -> str:
+    # Entrada hex do bytea; a barra é duplicada por causa do escape do COPY
+    return '\\\\x' + bytes(value).hex()
+
+def _format_bool(value: bool) -> str:
+    return 't' if value else 'f'
+
+def _format_datetime(value: datetime) -> str:
+    return value.isoformat(sep=' ')
+
+_FORMATTERS: Dict[type, Callable[[Any], str]] = {
+    str: _format_text,
+    int: str,
+    float: repr,
+    Decimal: str,
+    bool: _format_bool,
+    bytes: _format_bytes,
+    bytearray: _format_bytes,
+    memoryview: _format_bytes,
+    datetime: _format_datetime,
+    date: date.isoformat,
+    time: time.isoformat,
+    UUID: str,
+}
+
+class TextCopyEncoder:
+    """Codifica linhas no formato texto do COPY FROM STDIN do PostgreSQL."""
+
+    NULL = '\\N'
+
+    def format_value(self, value: Any) -> str:
+        """Converte um valor Python para sua representação no COPY texto."""
+        if value is None:
+            return self.NULL
+
+        formatter = _FORMATTERS.get(type(value))
+        if formatter is None:
+            # Tipos não mapeados (inclusive subclasses) usam a representação textual
+            return _format_text(str(value))
+        return formatter(value)
+
+    def encode(self, rows: Sequence[Any], column_names: List[str]) -> io.StringIO:
+        """Gera o conteúdo do COPY para as linhas (dicts ou sequências posicionais)."""
+        format_value = self.format_value
+        values_of = values_getter(rows, column_names)
+
+        lines = [
+            '\t'.join([format_value(value) for value in values_of(row)])
+            for row in rows
+        ]
+        lines.append('')
+        return io.StringIO('\n'.join(lines))
+
+def values_getter(rows: Sequence[Any], column_names: List[str]) -> Callable[[Any], Sequence[Any]]:
+    """Retorna a função que extrai os valores de uma linha na ordem das colunas."""
+    if rows and isinstance(rows[0], Mapping):
+        if len(column_names) == 1:
+            name = column_names[0]
+            return lambda row: (row[name],)
+        return itemgetter(*column_names)
+    return lambda row: row
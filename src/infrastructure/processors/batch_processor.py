@@ -1,50 +1,73 @@
-from typing import List, Dict, Any, Tuple
-from sqlalchemy import Table, select, text
-from sqlalchemy.engine import Engine
+from typing import List, Dict, Any, Optional, Sequence
+import threading
 from sqlalchemy.engine.row import Row
 from src.infrastructure.transformers.data_transformer import DataTransformer
+from src.infrastructure.processors.batch_sizer import AdaptiveBatchSizer, estimate_row_bytes
+from src.config.settings import Config
 
 class BatchProcessor:
-    def __init__(self, batch_size: int, transformer: DataTransformer) -> None:
+    def __init__(self, batch_size: int, transformer: DataTransformer,
+                 adaptive: bool = False, size_hints: Optional[Dict[str, int]] = None,
+                 max_bytes: Optional[int] = None) -> None:
         self.batch_size = batch_size
         self.transformer = transformer
+        # Teto de memória de um batch: sem o modo adaptativo, o número de linhas
+        # pedido à origem é reduzido pela largura média das linhas já lidas
+        self.max_bytes = max_bytes
+        self._row_bytes: Dict[str, float] = {}
+        
+        # Com adaptive=True cada tabela tem seu próprio tamanho de batch, ajustado
+        # pela latência medida e semeado pelos tamanhos da execução anterior
+        self.adaptive = adaptive
+        self.size_hints = size_hints or {}
+        self._sizers: Dict[str, AdaptiveBatchSizer] = {}
+        self._sizers_lock = threading.Lock()
     
-    def fetch_batch(self, table: Table, engine: Engine, order_column: str, 
-                   offset: int) -> List[Row]:
-        """Busca um batch de dados da origem."""
-        with engine.connect() as conn:
-            query = (
-                select(table)
-                .order_by(text(order_column))
-                .limit(self.batch_size)
-                .offset(offset)
-            )
-            result = conn.execute(query)
-            return result.fetchall()
+    def batch_size_for(self, table_name: str) -> int:
+        """Tamanho do próximo batch da tabela."""
+        if self.adaptive:
+            return self._sizer(table_name).size
+        row_bytes = self._row_bytes.get(table_name)
+        if not row_bytes or not self.max_bytes:
+            return self.batch_size
+        return max(1, min(self.batch_size, int(self.max_bytes / row_bytes)))
+    
+    def record_fetch(self, table_name: str, batch: Sequence[Any], seconds: float) -> None:
+        """Informa a leitura de um batch ao controle adaptativo (ou ao teto de memória)."""
+        if not batch:
+            return
+        if self.adaptive:
+            self._sizer(table_name).record_fetch(len(batch), seconds, estimate_row_bytes(batch))
+        elif self.max_bytes:
+            self._row_bytes[table_name] = estimate_row_bytes(batch)
+    
+    def record_load(self, table_name: str, rows: int, seconds: float) -> None:
+        """Informa a duração da gravação de um batch ao controle adaptativo."""
+        if self.adaptive:
+            self._sizer(table_name).record_load(rows, seconds)
+    
+    def _sizer(self, table_name: str) -> AdaptiveBatchSizer:
+        with self._sizers_lock:
+            sizer = self._sizers.get(table_name)
+            if sizer is None:
+                sizer = self._sizers[table_name] = AdaptiveBatchSizer(
+                    self.size_hints.get(table_name, self.batch_size),
+                    Config.BATCH_SIZE_MIN,
+                    Config.BATCH_SIZE_MAX,
+                    Config.BATCH_TARGET_SECONDS,
+                    Config.BATCH_MEMORY_MB * 1024 * 1024
+                )
+            return sizer
     
     def prepare_batch_data(self, batch: List[Row], column_names: List[str]) -> List[Dict[str, Any]]:
         """Converte batch para lista de dicionários."""
         return [dict(zip(column_names, row)) for row in batch]
     
-    def insert_batch(self, table: Table, batch_data: List[Dict[str, Any]], 
-                    engine: Engine) -> Tuple[bool, str]:
-        """Insere batch com tratamento de erros e transformação se necessário."""
-        try:
-            # Primeira tentativa sem transformação
-            with engine.begin() as conn:
-                conn.execute(table.insert(), batch_data)
-            return True, "success"
-            
-        except ValueError as e:
-            if "NUL (0x00)" in str(e):
-                # Aplicar transformação e tentar novamente
-                transformed_data, _ = self.transformer.transform_batch(batch_data)
-                
-                try:
-                    with engine.begin() as conn:
-                        conn.execute(table.insert(), transformed_data)
-                    return True, "transformed"
-                except Exception as retry_error:
-                    raise retry_error
-            else:
-                raise e
\ No newline at end of file
+    def prepare_batch_rows(self, batch: List[Row], column_count: int) -> List[Sequence[Any]]:
+        """Mantém as linhas posicionais como vieram do cursor, sem criar dicionários.
+        
+        Colunas extras no fim da linha (ex.: %%physloc%%) são descartadas.
+        """
+        if batch and len(batch[0]) > column_count:
+            return [row[:column_count] for row in batch]
+        return batch if isinstance(batch, list) else list(batch)
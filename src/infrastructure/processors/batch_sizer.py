@@ -0,0 +1,169 @@
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from src.infrastructure.serializers.arrow_codec import is_record_batch
+
+# Peso da medição mais recente na média móvel exponencial
+_SMOOTHING = 0.3
+# Custo aproximado de cada valor em memória além do conteúdo (objeto Python + referência)
+_VALUE_OVERHEAD_BYTES = 56
+_ROW_OVERHEAD_BYTES = 64
+# Primeira leitura de um batch com teto de bytes: poucas linhas, para medir a largura
+_FIRST_CHUNK_ROWS = 16
+
+def estimate_row_bytes(rows: Sequence[Any], sample_size: int = 16) -> float:
+    """Estima o tamanho médio em memória de uma linha a partir de uma amostra do batch."""
+    if is_record_batch(rows):
+        return rows.nbytes / rows.num_rows if rows.num_rows else 0.0
+    if not rows:
+        return 0.0
+    
+    step = max(1, len(rows) // sample_size)
+    sample = rows[::step][:sample_size]
+    total = 0
+    for row in sample:
+        total += _ROW_OVERHEAD_BYTES
+        for value in row:
+            if isinstance(value, (str, bytes, bytearray, memoryview)):
+                total += len(value) + _VALUE_OVERHEAD_BYTES
+            else:
+                total += _VALUE_OVERHEAD_BYTES
+    return total / len(sample)
+
+def estimate_rows_bytes(rows: Sequence[Any], exact_positions: Sequence[int] = (),
+                        sample_size: int = 16) -> int:
+    """Estima os bytes em memória das linhas a partir de uma amostra.
+    
+    As colunas de exact_positions (LOBs, cujo tamanho varia muito de uma
+    linha para outra) são somadas em todas as linhas.
+    """
+    if not rows:
+        return 0
+    
+    step = max(1, len(rows) // sample_size)
+    sample = rows[::step][:sample_size]
+    sampled = 0
+    for row in sample:
+        sampled += _ROW_OVERHEAD_BYTES
+        for position, value in enumerate(row):
+            if position in exact_positions:
+                continue
+            if isinstance(value, (str, bytes, bytearray, memoryview)):
+                sampled += len(value) + _VALUE_OVERHEAD_BYTES
+            else:
+                sampled += _VALUE_OVERHEAD_BYTES
+    total = sampled * len(rows) / len(sample)
+    for position in exact_positions:
+        for row in rows:
+            value = row[position]
+            total += _VALUE_OVERHEAD_BYTES if value is None else len(value) + _VALUE_OVERHEAD_BYTES
+    return int(total)
+
+def fetch_within_budget(fetch: Callable[[int], List[Any]], max_rows: int,
+                        max_bytes: Optional[int] = None,
+                        exact_positions: Sequence[int] = ()) -> List[Any]:
+    """Lê até max_rows linhas com fetch(n), parando quando o batch passa de max_bytes.
+    
+    A leitura é feita em partes: a primeira, pequena, mede a largura das
+    linhas e as seguintes pedem só o que ainda cabe no teto, de modo que o
+    batch passa do limite no máximo pela última linha lida. Sem max_bytes é
+    uma única chamada fetch(max_rows).
+    """
+    if not max_bytes:
+        return fetch(max_rows)
+    
+    rows: List[Any] = []
+    used = 0
+    chunk = min(max_rows, _FIRST_CHUNK_ROWS)
+    while chunk > 0:
+        part = fetch(chunk)
+        rows.extend(part)
+        used += estimate_rows_bytes(part, exact_positions)
+        if len(part) < chunk or used >= max_bytes:
+            break
+        row_bytes = used / len(rows)
+        chunk = int(min(max_rows - len(rows), max(1, (max_bytes - used) // row_bytes)))
+    return rows
+
+class AdaptiveBatchSizer:
+    """Ajusta o tamanho do batch de uma tabela pela latência e largura observadas.
+    
+    Mantém médias móveis da vazão de leitura e de gravação (registros/s) e do
+    tamanho das linhas. O próximo tamanho busca a duração alvo por batch, sem
+    passar do teto de memória, e varia no máximo 2x por ajuste para não oscilar.
+    """
+    
+    def __init__(self, initial: int, min_size: int, max_size: int,
+                 target_seconds: float, memory_limit_bytes: int) -> None:
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+        self.memory_limit_bytes = memory_limit_bytes
+        self.size = self._clamp(initial)
+        self._fetch_rate: Optional[float] = None
+        self._load_rate: Optional[float] = None
+        self._row_bytes: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    def record_fetch(self, rows: int, seconds: float, row_bytes: Optional[float] = None) -> None:
+        """Registra a leitura de um batch da origem."""
+        with self._lock:
+            if rows > 0 and seconds > 0:
+                self._fetch_rate = self._smooth(self._fetch_rate, rows / seconds)
+            if row_bytes:
+                self._row_bytes = self._smooth(self._row_bytes, row_bytes)
+            self._resize()
+    
+    def record_load(self, rows: int, seconds: float) -> None:
+        """Registra a gravação de um batch no destino."""
+        with self._lock:
+            if rows > 0 and seconds > 0:
+                self._load_rate = self._smooth(self._load_rate, rows / seconds)
+            self._resize()
+    
+    def _resize(self) -> None:
+        seconds_per_row = sum(1 / rate for rate in (self._fetch_rate, self._load_rate) if rate)
+        if not seconds_per_row:
+            return
+        
+        target = self.target_seconds / seconds_per_row
+        target = max(self.size / 2, min(self.size * 2, target))
+        if self._row_bytes and self.memory_limit_bytes:
+            # O teto de memória vale de imediato, sem amortecimento
+            target = min(target, self.memory_limit_bytes / self._row_bytes)
+        self.size = self._clamp(target)
+    
+    def _clamp(self, size: float) -> int:
+        return int(max(self.min_size, min(self.max_size, size)))
+    
+    @staticmethod
+    def _smooth(current: Optional[float], sample: float) -> float:
+        if current is None:
+            return sample
+        return current + _SMOOTHING * (sample - current)
+
+class BatchSizeHints:
+    """Arquivo JSON com o tamanho de batch final de cada tabela, usado na próxima execução."""
+    
+    def __init__(self, path: str) -> None:
+        self.path = path
+    
+    def load(self) -> Dict[str, int]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return {name: int(size) for name, size in json.load(f).items()}
+        except (OSError, ValueError) as e:
+            print(f"Ignorando tamanhos de batch em {self.path}: {e}")
+            return {}
+    
+    def save(self, sizes: Dict[str, int]) -> None:
+        """Grava os tamanhos, mantendo os das tabelas que não rodaram agora."""
+        if not self.path or not sizes:
+            return
+        merged = self.load()
+        merged.update(sizes)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(merged, f, indent=2, sort_keys=True)
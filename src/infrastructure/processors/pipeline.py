@@ -0,0 +1,146 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# Marca o fim do fluxo entre os estágios
+_END = object()
+
+class _Cancelled(Exception):
+    """Sinaliza que outro estágio falhou e o pipeline está sendo encerrado."""
+
+class StageTimer:
+    """Acumula o tempo ocupado (trabalhando) e ocioso (esperando fila) de um estágio."""
+
+    def __init__(self) -> None:
+        self.busy: float = 0.0
+        self.idle: float = 0.0
+        self.batches: int = 0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {'busy': self.busy, 'idle': self.idle, 'batches': self.batches}
+
+class BatchPipeline:
+    """Executa extração, transformação e carga em threads ligadas por filas limitadas.
+
+    As filas impõem backpressure: no máximo max_in_flight batches ficam
+    aguardando entre os estágios, o que limita a memória usada. Enquanto o
+    destino grava um batch, a origem já busca os próximos.
+    """
+
+    def __init__(self, max_in_flight: int = 4, name: str = 'pipeline') -> None:
+        self.max_in_flight = max(2, max_in_flight)
+        self.name = name
+        self.timers: Dict[str, StageTimer] = {
+            'extract': StageTimer(),
+            'transform': StageTimer(),
+            'load': StageTimer(),
+        }
+        self._stop = threading.Event()
+        self._errors: List[BaseException] = []
+
+    def run(
+        self,
+        source: Iterator[Any],
+        transform: Callable[[Any], Optional[Any]],
+        load: Callable[[Any], None]
+    ) -> Dict[str, Dict[str, float]]:
+        """Consome source até o fim e retorna os tempos por estágio.
+
+        Se transform retornar None o item é descartado. A primeira exceção de
+        qualquer estágio interrompe os demais e é relançada aqui.
+        """
+        transform_queue: queue.Queue = queue.Queue(maxsize=self.max_in_flight // 2)
+        load_queue: queue.Queue = queue.Queue(maxsize=self.max_in_flight - self.max_in_flight // 2)
+
+        threads = [
+            threading.Thread(target=self._guard, args=(self._extract, source, transform_queue),
+                             name=f"{self.name}-extract", daemon=True),
+            threading.Thread(target=self._guard, args=(self._transform, transform, transform_queue, load_queue),
+                             name=f"{self.name}-transform", daemon=True),
+            threading.Thread(target=self._guard, args=(self._load, load, load_queue),
+                             name=f"{self.name}-load", daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if self._errors:
+            raise self._errors[0]
+        return {stage: timer.as_dict() for stage, timer in self.timers.items()}
+
+    def _guard(self, stage: Callable[..., None], *args: Any) -> None:
+        try:
+            stage(*args)
+        except _Cancelled:
+            pass
+        except BaseException as e:
+            self._errors.append(e)
+            self._stop.set()
+
+    def _extract(self, source: Iterator[Any], output: queue.Queue) -> None:
+        timer = self.timers['extract']
+        iterator = iter(source)
+        while True:
+            started = time.perf_counter()
+            item = next(iterator, _END)
+            timer.busy += time.perf_counter() - started
+            if item is _END:
+                break
+            timer.batches += 1
+            self._put(output, item, timer)
+        self._put(output, _END, timer)
+
+    def _transform(self, transform: Callable[[Any], Optional[Any]],
+                   input_queue: queue.Queue, output: queue.Queue) -> None:
+        timer = self.timers['transform']
+        while True:
+            item = self._get(input_queue, timer)
+            if item is _END:
+                break
+            started = time.perf_counter()
+            result = transform(item)
+            timer.busy += time.perf_counter() - started
+            timer.batches += 1
+            if result is not None:
+                self._put(output, result, timer)
+        self._put(output, _END, timer)
+
+    def _load(self, load: Callable[[Any], None], input_queue: queue.Queue) -> None:
+        timer = self.timers['load']
+        while True:
+            item = self._get(input_queue, timer)
+            if item is _END:
+                break
+            started = time.perf_counter()
+            load(item)
+            timer.busy += time.perf_counter() - started
+            timer.batches += 1
+
+    def _put(self, target: queue.Queue, item: Any, timer: StageTimer) -> None:
+        started = time.perf_counter()
+        try:
+            while True:
+                if self._stop.is_set():
+                    raise _Cancelled()
+                try:
+                    target.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+        finally:
+            timer.idle += time.perf_counter() - started
+
+    def _get(self, source: queue.Queue, timer: StageTimer) -> Any:
+        started = time.perf_counter()
+        try:
+            while True:
+                if self._stop.is_set():
+                    raise _Cancelled()
+                try:
+                    return source.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+        finally:
+            timer.idle += time.perf_counter() - started
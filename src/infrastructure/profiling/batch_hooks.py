@@ -0,0 +1,52 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from src.domain.interfaces.batch_hook import BatchEvent, BatchHook
+
+class BatchHooks:
+    """Despacha os eventos do caminho dos batches para os hooks configurados.
+    
+    Sem hooks a migração não cria este objeto: cada ponto de instrumentação
+    se resume a testar se ele existe.
+    """
+    
+    def __init__(self, hooks: List[BatchHook]) -> None:
+        self.hooks = hooks
+        # Próximo índice de batch por (tabela, estágio)
+        self._counters: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+    
+    def table_start(self, table: str) -> None:
+        for hook in self.hooks:
+            hook.on_table_start(table)
+    
+    def table_end(self, table: str) -> None:
+        for hook in reversed(self.hooks):
+            hook.on_table_end(table)
+    
+    def before(self, table: str, stage: str, rows: int = 0, nbytes: int = 0,
+               batch_index: Optional[int] = None) -> BatchEvent:
+        """Abre o evento de um estágio; batch_index reaproveita o índice de outro evento."""
+        if batch_index is None:
+            with self._lock:
+                batch_index = self._counters.get((table, stage), 0)
+                self._counters[(table, stage)] = batch_index + 1
+        event = BatchEvent(table, stage, batch_index, rows, nbytes)
+        for hook in self.hooks:
+            hook.before_batch(event)
+        return event
+    
+    def after(self, event: BatchEvent, rows: Optional[int] = None,
+              nbytes: Optional[int] = None) -> None:
+        """Fecha o evento com a duração e, se informados, registros e bytes finais."""
+        event.seconds = time.perf_counter() - event.started
+        if rows is not None:
+            event.rows = rows
+        if nbytes is not None:
+            event.nbytes = nbytes
+        for hook in reversed(self.hooks):
+            hook.after_batch(event)
+    
+    def close(self) -> None:
+        for hook in self.hooks:
+            hook.close()
@@ -0,0 +1,207 @@
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from src.domain.interfaces.batch_hook import BatchEvent, BatchHook
+
+def _output_path(directory: str, table: str, suffix: str) -> str:
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{table}{suffix}")
+
+class CProfileHook(BatchHook):
+    """Roda o cProfile em um a cada sample_every batches e grava <tabela>.prof.
+    
+    Todos os estágios do batch amostrado são perfilados e acumulados por
+    tabela; o arquivo pode ser lido com pstats ou snakeviz. Em Python 3.12+
+    só um profiler pode estar ativo por vez: com tabelas em paralelo, o
+    batch que encontra outro ativo não é amostrado.
+    """
+    
+    def __init__(self, output_dir: str, sample_every: int = 10) -> None:
+        self.output_dir = output_dir
+        self.sample_every = max(1, sample_every)
+        self._stats: Dict[str, pstats.Stats] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+    
+    def before_batch(self, event: BatchEvent) -> None:
+        # Eventos aninhados (nova carga dentro da carga) já estão sendo perfilados
+        if event.batch_index % self.sample_every or getattr(self._local, 'event', None):
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return
+        self._local.event = event
+        self._local.profile = profile
+    
+    def after_batch(self, event: BatchEvent) -> None:
+        if getattr(self._local, 'event', None) is not event:
+            return
+        profile = self._local.profile
+        profile.disable()
+        self._local.event = self._local.profile = None
+        with self._lock:
+            stats = self._stats.get(event.table)
+            if stats is None:
+                self._stats[event.table] = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+    
+    def on_table_end(self, table: str) -> None:
+        with self._lock:
+            stats = self._stats.pop(table, None)
+        if stats is None:
+            return
+        try:
+            stats.dump_stats(_output_path(self.output_dir, table, '.prof'))
+        except OSError as e:
+            print(f"Não foi possível gravar o perfil de {table}: {e}")
+
+class TracemallocHook(BatchHook):
+    """Compara snapshots do tracemalloc no início e no fim de cada tabela.
+    
+    Grava <tabela>.tracemalloc.txt com o pico de memória rastreada e as
+    linhas que mais alocaram, e <tabela>.tracemalloc com o snapshot final
+    (tracemalloc.Snapshot.load). O pico é do processo: com tabelas em
+    paralelo inclui as alocações das outras.
+    """
+    
+    def __init__(self, output_dir: str, frames: int = 1, top: int = 25) -> None:
+        self.output_dir = output_dir
+        self.frames = frames
+        self.top = top
+        self._snapshots: Dict[str, tracemalloc.Snapshot] = {}
+        self._started = False
+        self._lock = threading.Lock()
+    
+    def on_table_start(self, table: str) -> None:
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+                self._started = True
+            tracemalloc.reset_peak()
+            self._snapshots[table] = self._take_snapshot()
+    
+    def on_table_end(self, table: str) -> None:
+        with self._lock:
+            start = self._snapshots.pop(table, None)
+            if start is None or not tracemalloc.is_tracing():
+                return
+            end = self._take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+        
+        lines = [
+            f"Tabela {table}: pico rastreado {peak / 1_000_000:.1f} MB, atual {current / 1_000_000:.1f} MB",
+            f"Maiores diferenças em relação ao início da tabela (top {self.top}):",
+        ]
+        lines.extend(str(stat) for stat in end.compare_to(start, 'lineno')[:self.top])
+        try:
+            with open(_output_path(self.output_dir, table, '.tracemalloc.txt'), 'w',
+                      encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+            end.dump(_output_path(self.output_dir, table, '.tracemalloc'))
+        except OSError as e:
+            print(f"Não foi possível gravar o snapshot de memória de {table}: {e}")
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._started and not self._snapshots:
+                tracemalloc.stop()
+                self._started = False
+    
+    @staticmethod
+    def _take_snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+
+class StackSamplerHook(BatchHook):
+    """Amostra as pilhas das threads que estão processando batches.
+    
+    A cada interval segundos a pilha de cada thread dentro de um estágio é
+    contada no formato "folded" (estágio;módulo:função;... contagem). Ao fim
+    da tabela grava <tabela>.folded, pronto para flamegraph.pl ou speedscope.
+    """
+    
+    def __init__(self, output_dir: str, interval: float = 0.005) -> None:
+        self.output_dir = output_dir
+        self.interval = interval
+        # Eventos abertos por thread (a nova carga fica aninhada na carga)
+        self._active: Dict[int, List[BatchEvent]] = {}
+        self._stacks: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def on_table_start(self, table: str) -> None:
+        with self._lock:
+            self._stacks.setdefault(table, Counter())
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+                self._thread.start()
+    
+    def before_batch(self, event: BatchEvent) -> None:
+        with self._lock:
+            self._active.setdefault(threading.get_ident(), []).append(event)
+    
+    def after_batch(self, event: BatchEvent) -> None:
+        with self._lock:
+            events = self._active.get(threading.get_ident())
+            if events and event in events:
+                events.remove(event)
+    
+    def on_table_end(self, table: str) -> None:
+        with self._lock:
+            stacks = self._stacks.pop(table, None)
+        if not stacks:
+            return
+        try:
+            with open(_output_path(self.output_dir, table, '.folded'), 'w', encoding='utf-8') as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+        except OSError as e:
+            print(f"Não foi possível gravar as pilhas de {table}: {e}")
+    
+    def close(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+    
+    def _sample(self) -> None:
+        with self._lock:
+            active: List[Tuple[int, BatchEvent]] = [
+                (thread_id, events[-1]) for thread_id, events in self._active.items() if events
+            ]
+        if not active:
+            return
+        frames = sys._current_frames()
+        samples = []
+        for thread_id, event in active:
+            frame = frames.get(thread_id)
+            if frame is None:
+                continue
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{frame.f_globals.get('__name__', '?')}:{code.co_name}")
+                frame = frame.f_back
+            names.append(event.stage)
+            samples.append((event.table, ';'.join(reversed(names))))
+        with self._lock:
+            for table, stack in samples:
+                stacks = self._stacks.get(table)
+                if stacks is not None:
+                    stacks[stack] += 1
@@ -0,0 +1,206 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from src.domain.services.migration_stats import LATENCY_BUCKETS, MigrationStats
+from src.infrastructure.serializers.arrow_codec import is_record_batch
+
+# Valores não textuais entram na estimativa de bytes com o tamanho de um inteiro de 8 bytes
+_SCALAR_BYTES = 8
+
+def estimate_payload_bytes(rows: Sequence[Any], sample_size: int = 16) -> int:
+    """Estima os bytes de dados de um batch (conteúdo dos valores) a partir de uma amostra.
+    
+    Para um RecordBatch o tamanho dos buffers é exato e não precisa de amostra.
+    """
+    if is_record_batch(rows):
+        return rows.nbytes
+    if not rows:
+        return 0
+    
+    step = max(1, len(rows) // sample_size)
+    sample = rows[::step][:sample_size]
+    total = 0
+    for row in sample:
+        values = row.values() if isinstance(row, Mapping) else row
+        for value in values:
+            if isinstance(value, (str, bytes, bytearray, memoryview)):
+                total += len(value)
+            elif value is not None:
+                total += _SCALAR_BYTES
+    return int(total * len(rows) / len(sample))
+
+def build_report(stats: Dict[str, Any], status: str) -> Dict[str, Any]:
+    """Relatório da execução: as estatísticas e as taxas derivadas por tabela e estágio."""
+    tables: Dict[str, Any] = {}
+    for table_name, metrics in stats.get('table_metrics', {}).items():
+        stages = {}
+        for stage, stage_metrics in metrics['stages'].items():
+            seconds = stage_metrics['seconds']
+            stages[stage] = dict(
+                stage_metrics,
+                rows_per_second=stage_metrics['rows'] / seconds if seconds > 0 else None,
+                bytes_per_second=stage_metrics['bytes'] / seconds if seconds > 0 else None,
+            )
+        seconds = metrics['seconds']
+        tables[table_name] = dict(
+            metrics,
+            stages=stages,
+            rows_per_second=metrics['records'] / seconds if seconds > 0 else None,
+            cleaned_values=stats.get('cleaned_values', {}).get(table_name, {}),
+            dead_letters=stats.get('dead_letters', {}).get(table_name, 0),
+        )
+    
+    report = {key: value for key, value in stats.items() if key != 'table_metrics'}
+    report.update(
+        status=status,
+        generated_at=datetime.now(),
+        latency_buckets_seconds=LATENCY_BUCKETS,
+        tables=tables,
+    )
+    return report
+
+def render_prometheus(stats: Dict[str, Any], running: bool) -> str:
+    """Métricas no formato texto do Prometheus (para o textfile collector do node_exporter)."""
+    lines: List[str] = []
+    
+    def metric(name: str, kind: str, help_text: str, samples: List[tuple]) -> None:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for suffix, labels, value in samples:
+            lines.append(f"{name}{suffix}{_labels(labels)} {_number(value)}")
+    
+    start_time = stats.get('start_time')
+    metric('migration_running', 'gauge', 'Migração em andamento (1) ou encerrada (0).',
+           [('', {}, 1 if running else 0)])
+    metric('migration_start_time_seconds', 'gauge', 'Início da execução (epoch).',
+           [('', {}, start_time.timestamp() if start_time else 0)])
+    metric('migration_last_update_time_seconds', 'gauge', 'Última atualização deste arquivo (epoch).',
+           [('', {}, time.time())])
+    metric('migration_tables_migrated', 'gauge', 'Tabelas concluídas com sucesso.',
+           [('', {}, stats.get('tables_migrated', 0))])
+    metric('migration_tables_failed', 'gauge', 'Tabelas com falha.',
+           [('', {}, len(stats.get('failed_tables', [])))])
+    metric('migration_records_total', 'counter', 'Registros das tabelas concluídas.',
+           [('', {}, stats.get('total_records', 0))])
+    
+    table_metrics = stats.get('table_metrics', {})
+    metric('migration_table_duration_seconds', 'gauge', 'Duração total da migração da tabela.',
+           [('', {'table': table}, metrics['seconds']) for table, metrics in table_metrics.items()
+            if metrics['seconds']])
+    metric('migration_table_retries_total', 'counter', 'Novas tentativas de carga de batches.',
+           [('', {'table': table}, metrics['retries']) for table, metrics in table_metrics.items()])
+    metric('migration_table_failed_batches_total', 'counter', 'Batches descartados por erro.',
+           [('', {'table': table}, metrics['failed_batches'])
+            for table, metrics in table_metrics.items()])
+    metric('migration_table_peak_rss_bytes', 'gauge', 'Pico de RSS do processo durante a tabela.',
+           [('', {'table': table}, metrics.get('peak_rss_bytes', 0))
+            for table, metrics in table_metrics.items() if metrics.get('peak_rss_bytes')])
+    
+    stage_samples: Dict[str, List[tuple]] = {'seconds': [], 'rows': [], 'bytes': [], 'batches': []}
+    histogram: List[tuple] = []
+    for table, metrics in table_metrics.items():
+        for stage, stage_metrics in metrics['stages'].items():
+            labels = {'table': table, 'stage': stage}
+            for field, samples in stage_samples.items():
+                samples.append(('', labels, stage_metrics[field]))
+            cumulative = 0
+            limits = [str(limit) for limit in LATENCY_BUCKETS] + ['+Inf']
+            for limit, count in zip(limits, stage_metrics['latency_buckets']):
+                cumulative += count
+                histogram.append(('_bucket', dict(labels, le=limit), cumulative))
+            histogram.append(('_sum', labels, stage_metrics['seconds']))
+            histogram.append(('_count', labels, stage_metrics['batches']))
+    
+    metric('migration_stage_seconds_total', 'counter', 'Tempo gasto no estágio.',
+           stage_samples['seconds'])
+    metric('migration_stage_rows_total', 'counter', 'Registros processados no estágio.',
+           stage_samples['rows'])
+    metric('migration_stage_bytes_total', 'counter', 'Bytes de dados (estimados) processados no estágio.',
+           stage_samples['bytes'])
+    metric('migration_stage_batches_total', 'counter', 'Batches processados no estágio.',
+           stage_samples['batches'])
+    metric('migration_batch_duration_seconds', 'histogram', 'Duração dos batches por estágio.',
+           histogram)
+    
+    metric('migration_cleaned_values_total', 'counter', 'Valores com caracteres NUL removidos.',
+           [('', {'table': table, 'column': column}, count)
+            for table, columns in stats.get('cleaned_values', {}).items()
+            for column, count in columns.items()])
+    metric('migration_dead_letters_total', 'counter', 'Registros rejeitados enviados ao dead letter.',
+           [('', {'table': table}, count) for table, count in stats.get('dead_letters', {}).items()])
+    return '\n'.join(lines) + '\n'
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in labels.items()) + '}'
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _number(value: Any) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class MetricsReporter:
+    """Grava periodicamente o relatório JSON e o arquivo do Prometheus durante a migração.
+    
+    Uma thread em segundo plano lê um snapshot das estatísticas a cada
+    interval segundos; stop grava a versão final. Os arquivos são escritos
+    em um temporário e renomeados, para nunca serem lidos pela metade.
+    Caminho vazio desativa o respectivo arquivo.
+    """
+    
+    def __init__(self, stats: MigrationStats, report_path: Optional[str],
+                 prometheus_path: Optional[str], interval: float = 15.0) -> None:
+        self.stats = stats
+        self.report_path = report_path
+        self.prometheus_path = prometheus_path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def enabled(self) -> bool:
+        return bool(self.report_path or self.prometheus_path)
+    
+    def start(self) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='metrics-reporter', daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Encerra a thread e grava as métricas finais."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        if self.enabled:
+            self.write(running=False)
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.write(running=True)
+    
+    def write(self, running: bool) -> None:
+        stats = self.stats.snapshot()
+        try:
+            if self.report_path:
+                report = build_report(stats, 'running' if running else 'finished')
+                self._write_atomic(self.report_path,
+                                   json.dumps(report, indent=2, default=str, ensure_ascii=False))
+            if self.prometheus_path:
+                self._write_atomic(self.prometheus_path, render_prometheus(stats, running))
+        except OSError as e:
+            print(f"Não foi possível gravar as métricas: {e}")
+    
+    @staticmethod
+    def _write_atomic(path: str, content: str) -> None:
+        temporary = f"{path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temporary, path)
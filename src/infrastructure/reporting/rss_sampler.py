@@ -0,0 +1,79 @@
+import os
+import resource
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+def current_rss() -> int:
+    """RSS atual do processo em bytes (/proc no Linux; senão o pico do getrusage)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss é em KB no Linux e em bytes no macOS
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+class RssSampler:
+    """Thread que amostra o RSS do processo e guarda o pico de cada rótulo (tabela ou fase).
+    
+    Rótulos ativos ao mesmo tempo (tabelas migradas em paralelo por threads)
+    recebem as mesmas amostras: o pico de cada um é o do processo enquanto
+    ele estava ativo.
+    """
+    
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.peaks: Dict[str, int] = {}
+        self._labels: List[str] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self) -> None:
+        """Inicia a amostragem; sem efeito se já estiver rodando."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='rss-sampler', daemon=True)
+            self._thread.start()
+    
+    def stop(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+    
+    @contextmanager
+    def label(self, name: str) -> Iterator[None]:
+        """Atribui as amostras do bloco a name (e aos rótulos externos)."""
+        with self._lock:
+            self._labels.append(name)
+        self._sample()
+        try:
+            yield
+        finally:
+            self._sample()
+            with self._lock:
+                self._labels.remove(name)
+    
+    def peak(self, name: str) -> int:
+        """Pico de RSS, em bytes, observado com o rótulo ativo."""
+        return self.peaks.get(name, 0)
+    
+    def peak_megabytes(self, name: str) -> float:
+        return self.peak(name) / 1_000_000
+    
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+    
+    def _sample(self) -> None:
+        rss = current_rss()
+        with self._lock:
+            for name in self._labels:
+                if rss > self.peaks.get(name, 0):
+                    self.peaks[name] = rss
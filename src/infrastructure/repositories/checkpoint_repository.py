@@ -0,0 +1,114 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import (
+    BigInteger, Column, DateTime, Integer, MetaData, String, Table, Text, select
+)
+from sqlalchemy.engine import Connection, Engine
+from src.domain.interfaces.checkpoint_repository import ICheckpointRepository
+from src.infrastructure.serializers import json_codec
+
+# Status de cada faixa no checkpoint
+STATUS_IN_PROGRESS = 'in_progress'
+STATUS_COMPLETED = 'completed'
+STATUS_FAILED = 'failed'
+
+class CheckpointRepository(ICheckpointRepository):
+    """Checkpoints da migração em uma tabela de controle no banco de destino.
+    
+    Cada linha guarda a última posição confirmada (chave ou offset) de uma faixa
+    de uma tabela. Como o progresso é gravado na mesma transação do batch, a
+    retomada nunca duplica nem perde registros.
+    """
+    
+    def __init__(self, engine: Engine, schema: Optional[str] = None,
+                 table_name: str = 'migration_checkpoint'):
+        self.engine = engine
+        self.table = Table(
+            table_name,
+            MetaData(schema=schema),
+            Column('table_name', String(255), primary_key=True),
+            Column('shard', Integer, primary_key=True, autoincrement=False),
+            Column('status', String(20), nullable=False),
+            Column('position_kind', String(10), nullable=False),
+            Column('position', Text),
+            Column('range_start', Text),
+            Column('range_end', Text),
+            Column('rows_loaded', BigInteger, nullable=False, default=0),
+            Column('updated_at', DateTime, nullable=False),
+        )
+    
+    def ensure_table(self) -> None:
+        """Cria a tabela de controle, se ainda não existir."""
+        self.table.create(self.engine, checkfirst=True)
+    
+    def get_checkpoints(self, table_name: str) -> Dict[int, Dict[str, Any]]:
+        """Obtém os checkpoints de uma tabela, indexados pela faixa (shard)."""
+        checkpoints: Dict[int, Dict[str, Any]] = {}
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(self.table).where(self.table.c.table_name == table_name)
+            ).mappings()
+            for row in rows:
+                checkpoints[row['shard']] = {
+                    'status': row['status'],
+                    'position_kind': row['position_kind'],
+                    'position': self._decode(row['position']),
+                    'key_range': (self._decode(row['range_start']), self._decode(row['range_end'])),
+                    'rows_loaded': row['rows_loaded'],
+                }
+        return checkpoints
+    
+    def start_table(self, table_name: str, position_kind: str,
+                    key_ranges: List[Optional[Tuple[Any, Any]]]) -> None:
+        """Reinicia os checkpoints de uma tabela com uma linha por faixa planejada.
+        
+        Gravar todas as faixas de início garante que a retomada use exatamente
+        a mesma divisão, mesmo para faixas que não chegaram a carregar nada.
+        """
+        with self.engine.begin() as conn:
+            conn.execute(self.table.delete().where(self.table.c.table_name == table_name))
+            for shard, key_range in enumerate(key_ranges):
+                self.save_progress(conn, table_name, shard, position_kind, None, 0, key_range)
+    
+    def save_progress(self, conn: Connection, table_name: str, shard: int, position_kind: str,
+                      position: Any, rows_loaded: int,
+                      key_range: Optional[Tuple[Any, Any]] = None) -> None:
+        """Grava o progresso de uma faixa na transação de conn (UPDATE ou INSERT)."""
+        lower, upper = key_range if key_range is not None else (None, None)
+        values = {
+            'status': STATUS_IN_PROGRESS,
+            'position_kind': position_kind,
+            'position': json_codec.dumps(position),
+            'range_start': json_codec.dumps(lower),
+            'range_end': json_codec.dumps(upper),
+            'rows_loaded': rows_loaded,
+            'updated_at': datetime.now(),
+        }
+        result = conn.execute(
+            self.table.update()
+            .where(self.table.c.table_name == table_name, self.table.c.shard == shard)
+            .values(**values)
+        )
+        if result.rowcount == 0:
+            conn.execute(self.table.insert().values(table_name=table_name, shard=shard, **values))
+    
+    def mark_table(self, table_name: str, status: str) -> None:
+        """Atualiza o status de todas as faixas de uma tabela.
+        
+        Tabelas sem nenhum batch gravado (ex.: vazias) ganham uma linha própria.
+        """
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                self.table.update()
+                .where(self.table.c.table_name == table_name)
+                .values(status=status, updated_at=datetime.now())
+            )
+            if result.rowcount == 0:
+                conn.execute(self.table.insert().values(
+                    table_name=table_name, shard=0, status=status, position_kind='none',
+                    rows_loaded=0, updated_at=datetime.now()
+                ))
+    
+    @staticmethod
+    def _decode(value: Optional[str]) -> Any:
+        return json_codec.loads(value) if value is not None else None
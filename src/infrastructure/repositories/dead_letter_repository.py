@@ -0,0 +1,97 @@
+import os
+import threading
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Tuple
+from sqlalchemy import Table
+from src.domain.interfaces.dead_letter_repository import IDeadLetterRepository
+from src.infrastructure.serializers import json_codec
+
+_EXTENSION = '.jsonl'
+# Linhas que voltaram a falhar durante um reprocessamento ainda não concluído
+_RETRY_SUFFIX = '.retry'
+
+class DeadLetterRepository(IDeadLetterRepository):
+    """Linhas rejeitadas na carga, em um arquivo JSONL por tabela.
+    
+    Cada linha do arquivo guarda a linha original (coluna -> valor, com os
+    tipos preservados pelo json_codec), o erro do banco e o horário, para que
+    possa ser reprocessada depois da correção. Durante o reprocessamento as
+    linhas que falham de novo vão para um arquivo à parte, que só substitui o
+    da tabela em archive, depois que as linhas recuperadas foram confirmadas.
+    """
+    
+    def __init__(self, directory: str = 'dead_letters') -> None:
+        self.directory = directory
+        self._lock = threading.Lock()
+    
+    def write(self, table: Table, rejected: List[Tuple[Any, str]]) -> None:
+        """Acrescenta as linhas rejeitadas ao arquivo da tabela."""
+        self._append(self._path(table.name), table, rejected)
+    
+    def write_retry(self, table: Table, rejected: List[Tuple[Any, str]]) -> None:
+        """Acrescenta as linhas que falharam de novo no reprocessamento em andamento."""
+        self._append(self._path(table.name) + _RETRY_SUFFIX, table, rejected)
+    
+    def _append(self, path: str, table: Table, rejected: List[Tuple[Any, str]]) -> None:
+        if not rejected:
+            return
+        
+        column_names = [col.name for col in table.columns]
+        rejected_at = datetime.now().isoformat()
+        lines = []
+        for row, error in rejected:
+            values = dict(row) if isinstance(row, Mapping) else dict(zip(column_names, row))
+            lines.append(json_codec.dumps({
+                'table': table.name,
+                'error': error,
+                'rejected_at': rejected_at,
+                'row': values,
+            }))
+        
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+    
+    def tables(self) -> List[str]:
+        """Tabelas com arquivo de linhas rejeitadas pendente."""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(
+            name[:-len(_EXTENSION)] for name in os.listdir(self.directory)
+            if name.endswith(_EXTENSION)
+        )
+    
+    def read(self, table_name: str) -> Iterator[Tuple[Dict[str, Any], str]]:
+        """Lê as linhas rejeitadas de uma tabela na ordem em que foram gravadas."""
+        path = self._path(table_name)
+        if not os.path.exists(path):
+            return
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json_codec.loads(line)
+                    yield entry['row'], entry['error']
+    
+    def begin_replay(self, table_name: str) -> None:
+        """Descarta as falhas de um reprocessamento anterior interrompido antes de archive."""
+        path = self._path(table_name) + _RETRY_SUFFIX
+        with self._lock:
+            if os.path.exists(path):
+                os.remove(path)
+    
+    def archive(self, table_name: str) -> None:
+        """Renomeia o arquivo da tabela, mantendo-o como histórico do reprocessamento.
+        
+        As linhas gravadas por write_retry passam a ser as pendentes da tabela.
+        """
+        path = self._path(table_name)
+        with self._lock:
+            if os.path.exists(path):
+                os.replace(path, f"{path}.{datetime.now():%Y%m%d%H%M%S%f}.replayed")
+            if os.path.exists(path + _RETRY_SUFFIX):
+                os.replace(path + _RETRY_SUFFIX, path)
+    
+    def _path(self, table_name: str) -> str:
+        return os.path.join(self.directory, f"{table_name}{_EXTENSION}")
@@ -0,0 +1,130 @@
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Set
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+from src.domain.interfaces.load_session import ILoadSession, LoadSessionError
+
+class LoadSession(ILoadSession):
+    """Conexão fixa para a carga de uma tabela (ou faixa), com commit a cada N batches.
+    
+    A conexão é obtida no primeiro batch e recebe uma vez os parâmetros de
+    sessão (ex.: session_replication_role, synchronous_commit, work_mem).
+    Com commit_every > 1 cada batch roda em um savepoint: o batch com erro é
+    desfeito sem perder os anteriores, que são confirmados juntos (com os
+    seus checkpoints) a cada commit_every batches e no fechamento.
+    """
+    
+    def __init__(self, engine: Engine, settings: Dict[str, str], commit_every: int = 1,
+                 binder: Optional[Callable[[Optional['LoadSession']], None]] = None,
+                 rejected_settings: Optional[Set[str]] = None) -> None:
+        self.engine = engine
+        self.settings = settings
+        self.commit_every = max(1, commit_every)
+        # Associa/desassocia a sessão à thread atual no repositório
+        self._binder = binder
+        # Parâmetros recusados pelo servidor (ex.: sem permissão); não são repetidos
+        self._rejected_settings = rejected_settings if rejected_settings is not None else set()
+        self._conn: Optional[Connection] = None
+        self._pending = 0
+        # Ações que dependem dos batches pendentes (ex.: gravar dead letters)
+        self._on_commit: List[Callable[[], None]] = []
+        self._lock = threading.RLock()
+    
+    def bind(self) -> None:
+        if self._binder is not None:
+            self._binder(self)
+    
+    @contextmanager
+    def transaction(self) -> Iterator[Connection]:
+        with self._lock:
+            conn = self._connection()
+            if not conn.in_transaction():
+                conn.begin()
+            savepoint = conn.begin_nested() if self.commit_every > 1 else None
+            try:
+                yield conn
+            except BaseException:
+                if savepoint is not None and savepoint.is_active:
+                    savepoint.rollback()
+                else:
+                    conn.rollback()
+                raise
+            if savepoint is not None:
+                savepoint.commit()
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                self._commit()
+    
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if not self._pending:
+                callback()
+            else:
+                self._on_commit.append(callback)
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._binder is not None:
+                self._binder(None)
+            if self._conn is None:
+                return
+            try:
+                if self._pending:
+                    self._commit()
+            finally:
+                self._release()
+    
+    def _connection(self) -> Connection:
+        if self._conn is None:
+            self._conn = self.engine.connect()
+            self._apply_settings(self._conn)
+        return self._conn
+    
+    def _apply_settings(self, conn: Connection) -> None:
+        """Aplica os parâmetros no nível da sessão (valem para as próximas transações)."""
+        if conn.dialect.name != 'postgresql':
+            return
+        for name, value in self.settings.items():
+            if name in self._rejected_settings:
+                continue
+            try:
+                conn.execute(text("SELECT set_config(:name, :value, false)"),
+                             {'name': name, 'value': str(value)})
+                conn.commit()
+            except SQLAlchemyError as e:
+                conn.rollback()
+                self._rejected_settings.add(name)
+                print(f"Parâmetro de sessão {name} = {value} recusado: {e}")
+    
+    def _commit(self) -> None:
+        callbacks, self._on_commit = self._on_commit, []
+        try:
+            self._conn.commit()
+        except SQLAlchemyError as e:
+            lost = self._pending
+            self._pending = 0
+            raise LoadSessionError(
+                f"Falha ao confirmar {lost} batches pendentes da sessão de carga: {e}"
+            ) from e
+        self._pending = 0
+        for callback in callbacks:
+            callback()
+    
+    def _release(self) -> None:
+        """Desfaz os parâmetros de sessão antes de devolver a conexão ao pool."""
+        conn, self._conn = self._conn, None
+        # Batches não confirmados: as ações que dependiam deles são descartadas
+        self._on_commit = []
+        try:
+            if conn.in_transaction():
+                conn.rollback()
+            if conn.dialect.name == 'postgresql' and self.settings:
+                conn.execute(text("RESET ALL"))
+                conn.commit()
+        except SQLAlchemyError:
+            # Conexão inutilizável: descartada em vez de voltar ao pool
+            conn.invalidate()
+        finally:
+            conn.close()
@@ -0,0 +1,39 @@
+import os
+import pickle
+from typing import Any, Dict, Optional
+from sqlalchemy import MetaData
+
+class ReflectionSnapshot:
+    """Arquivo com os metadados refletidos da origem, reaproveitados entre execuções.
+    
+    O snapshot guarda a chave com que foi gerado (banco, impressão digital do
+    schema, filtros de tabelas); só é usado se a chave atual for idêntica.
+    """
+    
+    def __init__(self, path: Optional[str]) -> None:
+        self.path = path
+    
+    def load(self, key: Dict[str, Any]) -> Optional[MetaData]:
+        if not self.path or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+            print(f"Ignorando snapshot de metadados em {self.path}: {e}")
+            return None
+        if snapshot.get('key') != key:
+            return None
+        return snapshot['metadata']
+    
+    def save(self, key: Dict[str, Any], metadata: MetaData) -> None:
+        """Grava o snapshot de forma atômica (arquivo temporário renomeado)."""
+        if not self.path:
+            return
+        temporary = f"{self.path}.tmp"
+        try:
+            with open(temporary, 'wb') as f:
+                pickle.dump({'key': key, 'metadata': metadata}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, self.path)
+        except (OSError, pickle.PicklingError) as e:
+            print(f"Não foi possível gravar o snapshot de metadados em {self.path}: {e}")
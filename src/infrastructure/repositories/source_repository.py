@@ -1,25 +1,201 @@
-from typing import List, Dict, Any, Optional
-from sqlalchemy import Table, MetaData, select, text, func
+from fnmatch import fnmatch
+from typing import List, Dict, Any, Callable, Optional, Sequence, Tuple, Iterator, Union
+import sqlalchemy
+from sqlalchemy import (
+    Table, MetaData, UniqueConstraint, select, text, func, and_, or_, case, cast, literal,
+    literal_column, event, inspect
+)
+from sqlalchemy.dialects import mssql
 from sqlalchemy.engine import Engine
+from sqlalchemy.sql import Select, sqltypes
+from sqlalchemy.sql.elements import ColumnElement
 from src.domain.interfaces.source_repository import ISourceRepository
+from src.infrastructure.processors.batch_sizer import fetch_within_budget
+from src.infrastructure.repositories.reflection_snapshot import ReflectionSnapshot
+
+# Localizador físico de linhas do SQL Server, usado como chave em tabelas heap
+PHYSLOC_COLUMN = '%%physloc%%'
+PHYSLOC_LABEL = '__physloc__'
+
+# Coluna extra no fim da linha com o tamanho de um LOB (valores grandes são lidos à parte)
+LOB_LENGTH_LABEL = '__lob_length_{}__'
+
+def lob_column_names(table: Table) -> List[str]:
+    """Colunas de tamanho ilimitado: (N)VARCHAR(MAX), VARBINARY(MAX), TEXT, NTEXT, IMAGE e XML."""
+    return [
+        col.name for col in table.columns
+        if isinstance(col.type, (sqltypes.String, sqltypes._Binary))
+        and not isinstance(col.type, mssql.TIMESTAMP)
+        and getattr(col.type, 'length', None) is None
+    ]
+
+def build_keyset_query(
+    table: Table,
+    key_columns: List[str],
+    batch_size: int,
+    last_key: Optional[Sequence[Any]] = None,
+    key_range: Optional[Tuple[Any, Any]] = None,
+    query: Optional[Select] = None
+) -> Select:
+    """Monta a consulta paginada por chave: WHERE (chave) > último ORDER BY chave.
+    
+    key_range restringe a primeira coluna da chave ao intervalo [início, fim).
+    query substitui o SELECT de todas as colunas da tabela.
+    """
+    key_exprs: List[ColumnElement] = [
+        literal_column(PHYSLOC_COLUMN) if name == PHYSLOC_COLUMN else table.c[name]
+        for name in key_columns
+    ]
+
+    if query is None:
+        query = select(table)
+    if PHYSLOC_COLUMN in key_columns:
+        # Coluna extra no fim da linha; não faz parte dos dados migrados
+        query = query.add_columns(literal_column(PHYSLOC_COLUMN).label(PHYSLOC_LABEL))
+
+    if last_key is not None:
+        query = query.where(_keyset_predicate(key_exprs, last_key))
+    if key_range is not None:
+        query = query.where(*_key_range_predicates(key_exprs[0], key_range))
+
+    return query.order_by(*key_exprs).limit(batch_size)
+
+def build_table_filter(include: Sequence[str], exclude: Sequence[str]
+                       ) -> Optional[Callable[[str, MetaData], bool]]:
+    """Filtro de tabelas no formato de MetaData.reflect(only=...).
+    
+    include e exclude aceitam nomes ou padrões (fnmatch, sem diferenciar
+    maiúsculas); sem include todas as tabelas não excluídas são aceitas.
+    """
+    if not include and not exclude:
+        return None
+    include = [pattern.lower() for pattern in include]
+    exclude = [pattern.lower() for pattern in exclude]
+    
+    def accept(table_name: str, metadata: Optional[MetaData] = None) -> bool:
+        name = table_name.lower()
+        if include and not any(fnmatch(name, pattern) for pattern in include):
+            return False
+        return not any(fnmatch(name, pattern) for pattern in exclude)
+    
+    return accept
+
+def _key_range_predicates(column: ColumnElement, key_range: Tuple[Any, Any]) -> List[ColumnElement]:
+    """Condições de uma faixa [início, fim) da chave; None deixa o lado aberto."""
+    lower, upper = key_range
+    predicates = []
+    if lower is not None:
+        predicates.append(column >= lower)
+    if upper is not None:
+        predicates.append(column < upper)
+    return predicates
+
+def _keyset_predicate(key_exprs: List[ColumnElement], last_key: Sequence[Any]) -> ColumnElement:
+    """Expande (a, b) > (x, y) em a > x OR (a = x AND b > y).
+
+    O SQL Server não suporta comparação de tuplas, então a expansão é explícita.
+    O termo a >= x na frente permite seek no índice da primeira coluna.
+    """
+    clauses = []
+    for position, expr in enumerate(key_exprs):
+        equal_prefix = [key_exprs[i] == last_key[i] for i in range(position)]
+        clauses.append(and_(*equal_prefix, expr > last_key[position]))
+
+    if len(key_exprs) == 1:
+        return clauses[0]
+    return and_(key_exprs[0] >= last_key[0], or_(*clauses))
 
 class SourceRepository(ISourceRepository):
     """Repositório para operações de leitura no banco de origem."""
     
-    def __init__(self, engine: Engine):
+    def __init__(self, engine: Engine, include_tables: Sequence[str] = (),
+                 exclude_tables: Sequence[str] = (), snapshot_path: Optional[str] = None):
         self.engine = engine
         self.metadata = MetaData()
+        self.include_tables = list(include_tables)
+        self.exclude_tables = list(exclude_tables)
+        self._table_filter = build_table_filter(self.include_tables, self.exclude_tables)
+        self.snapshot = ReflectionSnapshot(snapshot_path)
         self._tables_cache: Optional[Dict[str, Table]] = None
         self._sorted_tables_cache: Optional[List[Table]] = None
         self._reflected: bool = False
+        event.listen(self.engine, 'before_cursor_execute', self._apply_cursor_arraysize)
+    
+    @staticmethod
+    def _apply_cursor_arraysize(conn, cursor, statement, parameters, context, executemany) -> None:
+        """Aplica o arraysize pedido via execution_options ao cursor do driver."""
+        arraysize = context.execution_options.get('arraysize') if context is not None else None
+        if arraysize:
+            cursor.arraysize = arraysize
     
     def _ensure_metadata_reflected(self) -> None:
-        """Garante que os metadados foram refletidos do banco."""
-        if not self._reflected:
-            self.metadata.reflect(self.engine)
-            self._tables_cache = dict(self.metadata.tables)
-            self._sorted_tables_cache = list(self.metadata.sorted_tables)
-            self._reflected = True
+        """Garante que os metadados foram refletidos do banco.
+        
+        Reflete apenas as tabelas aceitas pelos filtros (e as referenciadas por
+        suas FKs, necessárias para a ordenação, mas fora da migração). Se o
+        schema não mudou desde a última execução usa o snapshot em disco.
+        """
+        if self._reflected:
+            return
+        
+        fingerprint = self._schema_fingerprint()
+        key = self._snapshot_key(fingerprint) if fingerprint is not None else None
+        metadata = self.snapshot.load(key) if key is not None else None
+        if metadata is None:
+            metadata = MetaData()
+            metadata.reflect(self.engine, only=self._table_filter)
+            if key is not None:
+                self.snapshot.save(key, metadata)
+        else:
+            print(f"Metadados de {len(metadata.tables)} tabelas carregados do snapshot")
+        
+        self.metadata = metadata
+        self._tables_cache = {
+            name: table for name, table in metadata.tables.items() if self._is_selected(table.name)
+        }
+        self._sorted_tables_cache = [
+            table for table in metadata.sorted_tables if self._is_selected(table.name)
+        ]
+        self._reflected = True
+    
+    def _is_selected(self, table_name: str) -> bool:
+        return self._table_filter is None or self._table_filter(table_name)
+    
+    def _schema_fingerprint(self) -> Optional[str]:
+        """Impressão digital do schema: muda a cada DDL em tabelas, views e constraints.
+        
+        No SQL Server usa a quantidade e a última modify_date dos objetos de
+        usuário (criar ou alterar índices também atualiza a da tabela). Em
+        outros bancos retorna None e o snapshot não é usado.
+        """
+        if self.engine.dialect.name != 'mssql' or not self.snapshot.path:
+            return None
+        query = text("""
+            SELECT DB_NAME(), COUNT_BIG(*), MAX(modify_date)
+            FROM sys.objects
+            WHERE is_ms_shipped = 0
+              AND type IN ('U', 'V', 'PK', 'UQ', 'F', 'D', 'C')
+        """)
+        with self.engine.connect() as conn:
+            database, objects, modified = conn.execute(query).one()
+        return f"{database}:{objects}:{modified.isoformat() if modified else ''}"
+    
+    def _snapshot_key(self, fingerprint: str) -> Dict[str, Any]:
+        return {
+            'url': self.engine.url.render_as_string(hide_password=True),
+            'fingerprint': fingerprint,
+            'include': sorted(self.include_tables),
+            'exclude': sorted(self.exclude_tables),
+            'sqlalchemy': sqlalchemy.__version__,
+        }
+    
+    def share_metadata(self, other: 'SourceRepository') -> None:
+        """Reaproveita os metadados já refletidos por outro repositório."""
+        other._ensure_metadata_reflected()
+        self.metadata = other.metadata
+        self._tables_cache = other._tables_cache
+        self._sorted_tables_cache = other._sorted_tables_cache
+        self._reflected = True
     
     def get_table_metadata(self, table_name: str) -> Table:
         """Obtém os metadados de uma tabela específica."""
@@ -49,31 +225,443 @@ class SourceRepository(ISourceRepository):
             count_query = select(func.count()).select_from(table)
             return conn.execute(count_query).scalar() or 0
     
+    def get_estimated_counts(self) -> Dict[str, int]:
+        """Estima os registros de todas as tabelas com uma única consulta ao catálogo.
+        
+        No SQL Server soma sys.dm_db_partition_stats do heap ou índice clusterizado;
+        no PostgreSQL usa pg_class.reltuples ou, se maior (tabela ainda não
+        analisada), n_live_tup de pg_stat_user_tables. Em outros bancos retorna
+        vazio e o chamador recorre ao COUNT(*).
+        """
+        dialect = self.engine.dialect.name
+        if dialect == 'mssql':
+            query = text("""
+                SELECT t.name AS table_name, SUM(p.row_count) AS row_count
+                FROM sys.dm_db_partition_stats p
+                JOIN sys.tables t ON t.object_id = p.object_id
+                WHERE p.index_id IN (0, 1) AND t.schema_id = SCHEMA_ID()
+                GROUP BY t.name
+            """)
+        elif dialect == 'postgresql':
+            query = text("""
+                SELECT c.relname AS table_name,
+                       GREATEST(c.reltuples::bigint, COALESCE(s.n_live_tup, 0)) AS row_count
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+                WHERE c.relkind IN ('r', 'p') AND n.nspname = current_schema()
+            """)
+        else:
+            return {}
+        
+        with self.engine.connect() as conn:
+            return {row.table_name: int(row.row_count or 0) for row in conn.execute(query)}
+    
+    def has_rows(self, table: Table) -> bool:
+        """Verifica se a tabela tem ao menos um registro, sem contá-los."""
+        with self.engine.connect() as conn:
+            query = select(literal_column('1')).select_from(table).limit(1)
+            return conn.execute(query).first() is not None
+    
     def fetch_batch(
         self, 
         table: Table, 
         order_column: str, 
         batch_size: int, 
-        offset: int
+        offset: int,
+        max_bytes: Optional[int] = None,
+        lob_inline_bytes: Optional[int] = None
     ) -> List[Any]:
-        """Busca um lote de dados da tabela."""
+        """Busca um lote de dados da tabela.
+        
+        max_bytes limita o lote também em bytes; com lob_inline_bytes os LOBs
+        maiores que o limite vêm vazios (ver get_deferred_lobs).
+        """
         with self.engine.connect() as conn:
             query = (
-                select(table)
+                self._select_table(table, lob_inline_bytes)
                 .order_by(text(order_column))
                 .limit(batch_size)
                 .offset(offset)
             )
             result = conn.execute(query)
-            return result.fetchall()
+            return fetch_within_budget(result.fetchmany, batch_size, max_bytes,
+                                       self._lob_positions(table))
+    
+    def fetch_batch_after(
+        self,
+        table: Table,
+        key_columns: List[str],
+        batch_size: int,
+        last_key: Optional[Sequence[Any]] = None,
+        key_range: Optional[Tuple[Any, Any]] = None,
+        max_bytes: Optional[int] = None,
+        lob_inline_bytes: Optional[int] = None
+    ) -> List[Any]:
+        """Busca o lote seguinte à última chave lida (paginação keyset)."""
+        with self.engine.connect() as conn:
+            query = build_keyset_query(table, key_columns, batch_size, last_key, key_range,
+                                       self._select_table(table, lob_inline_bytes))
+            result = conn.execute(query)
+            return fetch_within_budget(result.fetchmany, batch_size, max_bytes,
+                                       self._lob_positions(table))
+    
+    def stream_batches(
+        self,
+        table: Table,
+        batch_size: Union[int, Callable[[], int]],
+        key_columns: Optional[List[str]] = None,
+        arraysize: Optional[int] = None,
+        key_range: Optional[Tuple[Any, Any]] = None,
+        last_key: Optional[Sequence[Any]] = None,
+        max_bytes: Optional[int] = None,
+        lob_inline_bytes: Optional[int] = None
+    ) -> Iterator[List[Any]]:
+        """Lê a tabela com uma única consulta em cursor de streaming.
+        
+        Os lotes são entregues conforme chegam do servidor, mantendo em memória
+        apenas um lote por vez. Com colunas de chave a leitura é ordenada por
+        elas; o %%physloc%% não é usado para ordenar, pois exigiria um sort.
+        key_range limita a leitura a uma faixa da primeira coluna da chave e
+        last_key retoma a leitura após a chave informada. batch_size pode ser uma
+        função, consultada antes de cada lote (tamanho adaptativo); max_bytes
+        encerra o lote antes disso quando as linhas passam do teto de memória.
+        """
+        next_size = batch_size if callable(batch_size) else (lambda: batch_size)
+        initial_size = next_size()
+        positions = self._lob_positions(table)
+        query = self._select_table(table, lob_inline_bytes)
+        if key_columns and PHYSLOC_COLUMN not in key_columns:
+            key_exprs = [table.c[name] for name in key_columns]
+            query = query.order_by(*key_exprs)
+            if key_range is not None:
+                query = query.where(*_key_range_predicates(key_exprs[0], key_range))
+            if last_key is not None:
+                query = query.where(_keyset_predicate(key_exprs, last_key))
+        
+        with self.engine.connect() as conn:
+            stream_conn = conn.execution_options(
+                stream_results=True,
+                yield_per=initial_size,
+                arraysize=arraysize or initial_size
+            )
+            result = stream_conn.execute(query)
+            size = initial_size
+            while True:
+                partition = fetch_within_budget(result.fetchmany, size, max_bytes, positions)
+                if not partition:
+                    break
+                yield partition
+                size = next_size()
+    
+    def get_shard_boundaries(self, table: Table, key_column: str, shards: int,
+                             key_range: Optional[Tuple[Any, Any]] = None) -> List[Any]:
+        """Calcula até shards-1 fronteiras que dividem a tabela em faixas da chave.
+        
+        No SQL Server usa o histograma de estatísticas da coluna (sys.dm_db_stats_histogram),
+        escolhendo fronteiras com volumes de linhas parecidos. Sem histograma, interpola
+        linearmente entre MIN e MAX para chaves numéricas ou de data; chaves sem
+        aritmética (ex.: strings) usam quantis lidos do índice. key_range limita o
+        cálculo a uma faixa [início, fim) da chave.
+        """
+        if shards < 2:
+            return []
+        
+        boundaries: List[Any] = []
+        if self.engine.dialect.name == 'mssql' and key_range is None:
+            boundaries = self._histogram_boundaries(table, key_column, shards)
+        if not boundaries:
+            boundaries = self._min_max_boundaries(table, key_column, shards, key_range)
+        if boundaries is None:
+            boundaries = self._quantile_boundaries(table, key_column, shards, key_range)
+        
+        return sorted(set(boundaries))
+    
+    def _histogram_boundaries(self, table: Table, key_column: str, shards: int) -> List[Any]:
+        """Fronteiras por quantis do histograma da estatística liderada pela coluna."""
+        column = table.c[key_column]
+        column_type = column.type.compile(dialect=self.engine.dialect)
+        object_name = f"{table.schema}.{table.name}" if table.schema else table.name
+        query = text(f"""
+            SELECT s.stats_id,
+                   CAST(h.range_high_key AS {column_type}) AS range_high_key,
+                   h.equal_rows + h.range_rows AS step_rows
+            FROM sys.stats s
+            JOIN sys.stats_columns sc
+              ON sc.object_id = s.object_id AND sc.stats_id = s.stats_id
+             AND sc.stats_column_id = 1
+            JOIN sys.columns c
+              ON c.object_id = sc.object_id AND c.column_id = sc.column_id
+            CROSS APPLY sys.dm_db_stats_histogram(s.object_id, s.stats_id) h
+            WHERE s.object_id = OBJECT_ID(:object_name) AND c.name = :column_name
+            ORDER BY s.stats_id, h.step_number
+        """)
+        
+        with self.engine.connect() as conn:
+            steps = conn.execute(
+                query, {'object_name': object_name, 'column_name': key_column}
+            ).fetchall()
+        if not steps:
+            return []
+        
+        # Usa apenas a primeira estatística encontrada para a coluna
+        first_stats_id = steps[0].stats_id
+        steps = [step for step in steps if step.stats_id == first_stats_id]
+        
+        total_rows = sum(step.step_rows for step in steps)
+        boundaries: List[Any] = []
+        cumulative = 0.0
+        next_target = 1
+        for step in steps:
+            cumulative += step.step_rows
+            while next_target < shards and cumulative >= total_rows * next_target / shards:
+                boundaries.append(step.range_high_key)
+                next_target += 1
+        
+        return [boundary for boundary in boundaries if boundary is not None]
+    
+    def _min_max_boundaries(self, table: Table, key_column: str, shards: int,
+                            key_range: Optional[Tuple[Any, Any]] = None) -> Optional[List[Any]]:
+        """Fronteiras equidistantes entre MIN e MAX da coluna; None se o tipo não permitir."""
+        column = table.c[key_column]
+        query = select(func.min(column), func.max(column))
+        if key_range is not None:
+            query = query.where(*_key_range_predicates(column, key_range))
+        with self.engine.connect() as conn:
+            lowest, highest = conn.execute(query).one()
+        
+        if lowest is None or highest is None or lowest == highest:
+            return []
+        
+        try:
+            step = (highest - lowest) / shards
+            boundaries = [lowest + step * i for i in range(1, shards)]
+        except TypeError:
+            # Tipo sem aritmética (ex.: strings): não há como interpolar
+            return None
+        
+        if isinstance(lowest, int):
+            boundaries = [int(boundary) for boundary in boundaries]
+        return boundaries
+    
+    def _quantile_boundaries(self, table: Table, key_column: str, shards: int,
+                             key_range: Optional[Tuple[Any, Any]] = None) -> List[Any]:
+        """Fronteiras a cada total/shards linhas na ordem da chave (lê só a coluna da chave)."""
+        column = table.c[key_column]
+        predicates = _key_range_predicates(column, key_range) if key_range is not None else []
+        with self.engine.connect() as conn:
+            total = conn.execute(select(func.count()).select_from(table).where(*predicates)).scalar()
+            if not total or total < shards:
+                return []
+            
+            step = -(-total // shards)
+            ranked = select(
+                column.label('key'),
+                func.row_number().over(order_by=column).label('position')
+            ).where(*predicates).subquery()
+            query = select(ranked.c.key).where(ranked.c.position % step == 0).order_by(ranked.c.position)
+            return [row.key for row in conn.execute(query)]
+    
+    def get_change_column(self, table: Table, configured: Optional[str] = None) -> Optional[str]:
+        """Obtém a coluna que registra alterações nas linhas (sincronização incremental).
+        
+        Uma coluna configurada para a tabela tem prioridade; senão é usada a
+        coluna rowversion/timestamp do SQL Server, se existir.
+        """
+        if configured:
+            if configured not in table.c:
+                raise ValueError(f"Coluna '{configured}' não existe em {table.name}")
+            return configured
+        
+        for col in table.columns:
+            if isinstance(col.type, mssql.TIMESTAMP):
+                return col.name
+        return None
+    
+    def get_max_change_value(self, table: Table, change_column: str) -> Any:
+        """Maior valor da coluna de alteração já confirmado na origem.
+        
+        Para rowversion considera apenas valores abaixo de MIN_ACTIVE_ROWVERSION(),
+        pois transações ainda abertas podem confirmar versões menores que o MAX.
+        """
+        column = table.c[change_column]
+        query = select(func.max(column))
+        if isinstance(column.type, mssql.TIMESTAMP) and self.engine.dialect.name == 'mssql':
+            query = query.where(column < func.min_active_rowversion())
+        
+        with self.engine.connect() as conn:
+            return conn.execute(query).scalar()
+    
+    def fetch_changes_after(
+        self,
+        table: Table,
+        key_columns: List[str],
+        batch_size: int,
+        low: Any,
+        high: Any,
+        last_key: Optional[Sequence[Any]] = None,
+        max_bytes: Optional[int] = None,
+        lob_inline_bytes: Optional[int] = None
+    ) -> List[Any]:
+        """Busca o próximo lote de linhas alteradas no intervalo (low, high].
+        
+        key_columns começa pela coluna de alteração, seguida da chave primária
+        como desempate; low None lê desde o início.
+        """
+        change_column = table.c[key_columns[0]]
+        query = build_keyset_query(table, key_columns, batch_size, last_key,
+                                   query=self._select_table(table, lob_inline_bytes))
+        if low is not None:
+            query = query.where(change_column > low)
+        query = query.where(change_column <= high)
+        
+        with self.engine.connect() as conn:
+            result = conn.execute(query)
+            return fetch_within_budget(result.fetchmany, batch_size, max_bytes,
+                                       self._lob_positions(table))
+    
+    def get_pagination_key(self, table: Table) -> List[str]:
+        """Obtém as colunas que identificam unicamente as linhas para paginação.
+
+        Ordem de preferência: chave primária, índice/constraint único sem colunas
+        nulas e, em tabelas heap do SQL Server, o localizador físico %%physloc%%.
+        Lista vazia indica que não há chave utilizável (paginação por offset).
+        """
+        pk_columns = self.get_primary_key_columns(table)
+        if pk_columns:
+            return pk_columns
+    
+        candidates = [index.columns for index in table.indexes if index.unique]
+        candidates += [
+            constraint.columns for constraint in table.constraints
+            if isinstance(constraint, UniqueConstraint)
+        ]
+        candidates = [
+            list(columns) for columns in candidates
+            if len(columns) > 0 and all(not col.nullable for col in columns)
+        ]
+        if candidates:
+            best = min(candidates, key=lambda cols: (len(cols), [c.name for c in cols]))
+            return [col.name for col in best]
+    
+        if self.engine.dialect.name == 'mssql':
+            return [PHYSLOC_COLUMN]
+    
+        return []
+    
+    def get_row_key(self, row: Any, key_columns: List[str]) -> Tuple[Any, ...]:
+        """Extrai de uma linha os valores da chave de paginação."""
+        mapping = row._mapping
+        return tuple(
+            mapping[PHYSLOC_LABEL if name == PHYSLOC_COLUMN else name]
+            for name in key_columns
+        )
     
     def get_primary_key_columns(self, table: Table) -> List[str]:
         """Obtém colunas de chave primária."""
         return [col.name for col in table.primary_key]
     
+    def get_lob_columns(self, table: Table) -> List[str]:
+        """Colunas LOB da tabela, cujos valores grandes podem ser lidos em partes."""
+        return lob_column_names(table)
+    
+    def get_deferred_lobs(self, table: Table, rows: Sequence[Any],
+                          lob_inline_bytes: Optional[int]) -> List[Tuple[Tuple[Any, ...], str]]:
+        """LOBs que vieram vazios no lote (maiores que lob_inline_bytes): (chave primária, coluna)."""
+        lob_columns = self.get_lob_columns(table)
+        if not rows or not lob_inline_bytes or not lob_columns:
+            return []
+        
+        key_columns = self.get_primary_key_columns(table)
+        labels = [(name, LOB_LENGTH_LABEL.format(name)) for name in lob_columns]
+        deferred = []
+        for row in rows:
+            mapping = row._mapping
+            for name, label in labels:
+                length = mapping.get(label)
+                if length is not None and length > lob_inline_bytes:
+                    deferred.append((tuple(mapping[key] for key in key_columns), name))
+        return deferred
+    
+    def fetch_lob_chunks(self, table: Table, column_name: str, key: Sequence[Any],
+                         chunk_size: int) -> Iterator[Any]:
+        """Lê o valor de um LOB em partes de chunk_size (SUBSTRING), localizando a linha pela chave primária.
+        
+        Nas colunas de texto o tamanho das partes é contado em caracteres.
+        """
+        column = self._lob_source(table.c[column_name])
+        predicates = [
+            table.c[name] == value
+            for name, value in zip(self.get_primary_key_columns(table), key)
+        ]
+        with self.engine.connect() as conn:
+            start = 1
+            while True:
+                query = select(func.substring(column, start, chunk_size)).where(*predicates)
+                chunk = conn.execute(query).scalar()
+                if not chunk:
+                    return
+                yield chunk
+                if len(chunk) < chunk_size:
+                    return
+                start += len(chunk)
+    
+    def _select_table(self, table: Table, lob_inline_bytes: Optional[int] = None) -> Select:
+        """SELECT de todas as colunas da tabela.
+        
+        Com lob_inline_bytes os LOBs maiores que o limite vêm vazios (o valor
+        seria grande demais para o lote) e o tamanho de cada LOB vai em uma
+        coluna extra no fim da linha, usada por get_deferred_lobs.
+        """
+        lob_columns = self.get_lob_columns(table) if lob_inline_bytes else []
+        if not lob_columns:
+            return select(table)
+        
+        columns: List[ColumnElement] = []
+        for col in table.columns:
+            if col.name in lob_columns:
+                source = self._lob_source(col)
+                empty = literal(b'' if isinstance(col.type, sqltypes._Binary) else '', col.type)
+                col = case((self._lob_length(source) > lob_inline_bytes, empty),
+                           else_=source).label(col.name)
+            columns.append(col)
+        lengths = [
+            self._lob_length(self._lob_source(table.c[name])).label(LOB_LENGTH_LABEL.format(name))
+            for name in lob_columns
+        ]
+        return select(*columns, *lengths)
+    
+    def _lob_source(self, column: ColumnElement) -> ColumnElement:
+        """Expressão do LOB usada em DATALENGTH, SUBSTRING e CASE.
+        
+        No SQL Server XML não aceita SUBSTRING e os tipos legados (TEXT,
+        NTEXT, IMAGE) são lidos como os equivalentes (MAX); nas demais
+        origens a coluna é usada como está.
+        """
+        if self.engine.dialect.name != 'mssql':
+            return column
+        if isinstance(column.type, (mssql.XML, sqltypes.UnicodeText)):
+            return cast(column, mssql.NVARCHAR())
+        if isinstance(column.type, sqltypes.Text):
+            return cast(column, mssql.VARCHAR())
+        if isinstance(column.type, mssql.IMAGE):
+            return cast(column, mssql.VARBINARY('max'))
+        return column
+    
+    def _lob_length(self, column: ColumnElement) -> ColumnElement:
+        # DATALENGTH conta bytes no SQL Server (LEN ignora espaços finais e não aceita binários)
+        if self.engine.dialect.name == 'mssql':
+            return func.datalength(column)
+        return func.length(column)
+    
+    def _lob_positions(self, table: Table) -> List[int]:
+        """Posições das colunas LOB na linha, medidas uma a uma no teto de bytes do lote."""
+        lob_columns = self.get_lob_columns(table)
+        return [position for position, col in enumerate(table.columns) if col.name in lob_columns]
+    
     def table_exists(self, table_name: str) -> bool:
         """Verifica se uma tabela existe."""
-        return self.engine.dialect.has_table(self.engine, table_name)
+        return inspect(self.engine).has_table(table_name)
     
     def get_sorted_tables(self) -> List[Table]:
         """Obtém lista de tabelas ordenadas por dependências."""
@@ -0,0 +1,191 @@
+from typing import List, Dict, Any, Callable, Optional, Sequence, Tuple, Iterator, Union
+from sqlalchemy import Table, MetaData
+from src.config.settings import Config
+from src.domain.interfaces.source_repository import ISourceRepository
+from src.domain.interfaces.staging_repository import IStagingRepository
+from src.infrastructure.processors.batch_sizer import fetch_within_budget
+from src.infrastructure.repositories.source_repository import lob_column_names
+from src.infrastructure.serializers import json_codec
+
+class StagedSourceRepository(ISourceRepository):
+    """Origem lida dos arquivos do staging em vez do SQL Server (carga com --load-from).
+    
+    Expõe as tabelas extraídas por completo com os metadados gravados na
+    extração. As linhas são posicionais: a leitura é por offset, que no
+    staging é um acesso direto ao chunk, e a posição do checkpoint é o
+    número de linhas já lidas. Com columnar (padrão: ROW_FORMAT 'arrow')
+    os batches são RecordBatches fatiados dos arquivos, entregues ao
+    transformador colunar e ao COPY sem passar por linhas Python.
+    """
+    
+    def __init__(self, staging: IStagingRepository, columnar: Optional[bool] = None) -> None:
+        self.staging = staging
+        self.columnar = Config.ROW_FORMAT == 'arrow' if columnar is None else columnar
+        self.metadata: MetaData = staging.load_metadata()
+        self._entries = staging.tables()
+        missing = sorted(set(self._entries) - set(self.metadata.tables))
+        if missing:
+            raise ValueError(f"Tabelas do manifesto sem metadados no staging: {', '.join(missing)}")
+    
+    def get_table_metadata(self, table_name: str) -> Table:
+        """Obtém os metadados de uma tabela extraída."""
+        if table_name not in self._entries:
+            raise ValueError(f"Tabela '{table_name}' não encontrada no staging")
+        return self.metadata.tables[table_name]
+    
+    def get_all_tables_metadata(self) -> Dict[str, Table]:
+        return {name: self.metadata.tables[name] for name in self._entries}
+    
+    def get_tables_in_order(self) -> List[str]:
+        """Tabelas extraídas ordenadas por dependências (filhas primeiro, como na origem)."""
+        return [table.name for table in reversed(self.metadata.sorted_tables)
+                if table.name in self._entries]
+    
+    def get_sorted_tables(self) -> List[Table]:
+        return [table for table in self.metadata.sorted_tables if table.name in self._entries]
+    
+    def count_records(self, table: Table) -> int:
+        return self._entries[table.name]['rows']
+    
+    def get_estimated_counts(self) -> Dict[str, int]:
+        """Linhas de cada tabela segundo o manifesto (exatas, não estimadas)."""
+        return {name: entry['rows'] for name, entry in self._entries.items()}
+    
+    def has_rows(self, table: Table) -> bool:
+        return self._entries[table.name]['rows'] > 0
+    
+    def table_exists(self, table_name: str) -> bool:
+        return table_name in self._entries
+    
+    def fetch_batch(
+        self,
+        table: Table,
+        order_column: str,
+        batch_size: int,
+        offset: int,
+        max_bytes: Optional[int] = None,
+        lob_inline_bytes: Optional[int] = None
+    ) -> List[Any]:
+        """Lê batch_size linhas a partir de offset, na ordem em que foram extraídas.
+        
+        Os LOBs estão nos arquivos e vêm sempre inteiros (lob_inline_bytes não se aplica).
+        """
+        return self._read_within_budget(table, offset, batch_size, max_bytes)
+    
+    def fetch_batch_after(
+        self,
+        table: Table,
+        key_columns: List[str],
+        batch_size: int,
+        last_key: Optional[Sequence[Any]] = None,
+        key_range: Optional[Tuple[Any, Any]] = None,
+        max_bytes: Optional[int] = None,
+        lob_inline_bytes: Optional[int] = None
+    ) -> List[Any]:
+        raise NotImplementedError("O staging é lido por offset (get_pagination_key vazio)")
+    
+    def stream_batches(
+        self,
+        table: Table,
+        batch_size: Union[int, Callable[[], int]],
+        key_columns: Optional[List[str]] = None,
+        arraysize: Optional[int] = None,
+        key_range: Optional[Tuple[Any, Any]] = None,
+        last_key: Optional[Sequence[Any]] = None,
+        max_bytes: Optional[int] = None,
+        lob_inline_bytes: Optional[int] = None
+    ) -> Iterator[List[Any]]:
+        """Lê a tabela inteira em sequência; key_range, last_key e lob_inline_bytes não se aplicam."""
+        next_size = batch_size if callable(batch_size) else (lambda: batch_size)
+        offset = 0
+        while True:
+            batch = self._read_within_budget(table, offset, next_size(), max_bytes)
+            if not batch:
+                break
+            offset += len(batch)
+            yield batch
+    
+    def get_shard_boundaries(self, table: Table, key_column: str, shards: int,
+                             key_range: Optional[Tuple[Any, Any]] = None) -> List[Any]:
+        return []
+    
+    def get_change_column(self, table: Table, configured: Optional[str] = None) -> Optional[str]:
+        """Coluna de alteração registrada na extração (a configuração atual não é usada)."""
+        watermark = self._entries[table.name].get('watermark')
+        return watermark['column'] if watermark else None
+    
+    def get_max_change_value(self, table: Table, change_column: str) -> Any:
+        """Marca d'água lida na origem antes da extração da tabela."""
+        return json_codec.loads(self._entries[table.name]['watermark']['value'])
+    
+    def fetch_changes_after(
+        self,
+        table: Table,
+        key_columns: List[str],
+        batch_size: int,
+        low: Any,
+        high: Any,
+        last_key: Optional[Sequence[Any]] = None,
+        max_bytes: Optional[int] = None,
+        lob_inline_bytes: Optional[int] = None
+    ) -> List[Any]:
+        raise NotImplementedError("A sincronização incremental lê do SQL Server, não do staging")
+    
+    def get_pagination_key(self, table: Table) -> List[str]:
+        return []
+    
+    def get_row_key(self, row: Any, key_columns: List[str]) -> Tuple[Any, ...]:
+        raise NotImplementedError("O staging não usa chave de paginação")
+    
+    def get_primary_key_columns(self, table: Table) -> List[str]:
+        return [col.name for col in table.primary_key]
+    
+    def get_lob_columns(self, table: Table) -> List[str]:
+        return lob_column_names(table)
+    
+    def get_deferred_lobs(self, table: Table, rows: Sequence[Any],
+                          lob_inline_bytes: Optional[int]) -> List[Tuple[Tuple[Any, ...], str]]:
+        """Nenhum: os LOBs gravados no staging são lidos inteiros com a linha."""
+        return []
+    
+    def fetch_lob_chunks(self, table: Table, column_name: str, key: Sequence[Any],
+                         chunk_size: int) -> Iterator[Any]:
+        raise NotImplementedError("Os LOBs do staging são lidos inteiros com a linha")
+    
+    def _read_within_budget(self, table: Table, offset: int, limit: int,
+                            max_bytes: Optional[int]) -> Any:
+        """Lê até limit linhas a partir de offset, parando no teto de bytes do lote."""
+        if self.columnar:
+            return self._read_batch_within_budget(table, offset, limit, max_bytes)
+        read = 0
+        
+        def read_next(count: int) -> List[Any]:
+            nonlocal read
+            rows = self.staging.read_rows(table.name, offset + read, count)
+            read += len(rows)
+            return rows
+        
+        positions = [
+            position for position, col in enumerate(table.columns)
+            if col.name in lob_column_names(table)
+        ]
+        return fetch_within_budget(read_next, limit, max_bytes, positions)
+    
+    def _read_batch_within_budget(self, table: Table, offset: int, limit: int,
+                                  max_bytes: Optional[int]) -> Any:
+        """RecordBatch de até limit linhas, cortado no maior prefixo que cabe em max_bytes.
+        
+        A fatia não copia dados e o tamanho dos buffers é exato, inclusive
+        dos LOBs; o corte mantém ao menos uma linha.
+        """
+        batch = self.staging.read_batch(table.name, offset, limit)
+        if not max_bytes or batch.num_rows < 2 or batch.nbytes <= max_bytes:
+            return batch
+        low, high = 1, batch.num_rows
+        while low < high:
+            middle = (low + high + 1) // 2
+            if batch.slice(0, middle).nbytes <= max_bytes:
+                low = middle
+            else:
+                high = middle - 1
+        return batch.slice(0, low)
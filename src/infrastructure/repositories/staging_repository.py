@@ -0,0 +1,232 @@
+import bisect
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import MetaData, Table
+from src.domain.interfaces.staging_repository import IStagingRepository
+from src.infrastructure.repositories.reflection_snapshot import ReflectionSnapshot
+from src.infrastructure.serializers.arrow_codec import ArrowBatchCodec, pa, pq, require_pyarrow
+
+_MANIFEST = 'manifest.json'
+_METADATA = 'metadata.pickle'
+# Versão do layout dos arquivos; o manifesto de outra versão não é lido
+_FORMAT_VERSION = 1
+_EXTENSIONS = {'arrow': '.arrow', 'parquet': '.parquet'}
+_COMPRESSIONS = ('zstd', 'lz4', 'none')
+
+class StagingRepository(IStagingRepository):
+    """Tabelas extraídas em arquivos colunares comprimidos, com um manifesto.
+    
+    Cada tabela fica em <diretório>/<tabela>/part-NNNNN.arrow (Arrow IPC) ou
+    .parquet, divididos a cada file_rows linhas; cada batch da origem vira um
+    RecordBatch (Arrow) ou row group (Parquet). O manifest.json lista, por
+    tabela, os arquivos, as linhas de cada chunk e a marca d'água lida antes
+    da extração; metadata.pickle guarda os metadados refletidos da origem.
+    Uma tabela só entra no manifesto depois que todos os arquivos foram
+    gravados. A leitura usa memory map: sem compressão os buffers Arrow são
+    usados direto do arquivo (zero-copy).
+    """
+    
+    def __init__(self, directory: str, file_format: str = 'arrow',
+                 compression: str = 'zstd', file_rows: int = 1_000_000) -> None:
+        require_pyarrow()
+        if file_format not in _EXTENSIONS:
+            raise ValueError(f"Formato de staging '{file_format}' não suportado. "
+                             f"Formatos válidos: {sorted(_EXTENSIONS)}")
+        if compression not in _COMPRESSIONS:
+            raise ValueError(f"Compressão '{compression}' não suportada. "
+                             f"Valores válidos: {list(_COMPRESSIONS)}")
+        self.directory = directory
+        self.file_format = file_format
+        self.compression = compression
+        self.file_rows = max(1, file_rows)
+        self._snapshot = ReflectionSnapshot(os.path.join(directory, _METADATA))
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        # Leitores abertos e último chunk lido, por thread
+        self._local = threading.local()
+    
+    def save_metadata(self, metadata: MetaData) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self._snapshot.save({'version': _FORMAT_VERSION}, metadata)
+    
+    def load_metadata(self) -> MetaData:
+        metadata = self._snapshot.load({'version': _FORMAT_VERSION})
+        if metadata is None:
+            raise ValueError(f"Metadados da origem não encontrados em {self.directory}")
+        return metadata
+    
+    def write_table(self, table: Table, batches: Iterable[List[Any]],
+                    watermark: Optional[Dict[str, Any]] = None) -> int:
+        """Grava a tabela do zero (arquivos de uma extração anterior são removidos)."""
+        codec = ArrowBatchCodec(table)
+        table_dir = os.path.join(self.directory, table.name)
+        # A entrada anterior sai do manifesto antes dos arquivos serem apagados
+        self._update_manifest(table.name, None)
+        shutil.rmtree(table_dir, ignore_errors=True)
+        os.makedirs(table_dir)
+        
+        files: List[Dict[str, Any]] = []
+        writer = None
+        try:
+            for batch in batches:
+                if not batch:
+                    continue
+                if writer is None:
+                    name = f"part-{len(files):05d}{_EXTENSIONS[self.file_format]}"
+                    writer = self._open_writer(os.path.join(table_dir, name), codec.schema)
+                    files.append({'path': f"{table.name}/{name}", 'rows': 0, 'chunks': []})
+                writer.write_batch(codec.encode(batch))
+                files[-1]['rows'] += len(batch)
+                files[-1]['chunks'].append(len(batch))
+                if files[-1]['rows'] >= self.file_rows:
+                    writer.close()
+                    writer = None
+        finally:
+            if writer is not None:
+                writer.close()
+        
+        for entry in files:
+            entry['bytes'] = os.path.getsize(os.path.join(self.directory, entry['path']))
+        rows = sum(entry['rows'] for entry in files)
+        self._update_manifest(table.name, {
+            'rows': rows,
+            'bytes': sum(entry['bytes'] for entry in files),
+            'format': self.file_format,
+            'compression': self.compression,
+            'extracted_at': datetime.now().isoformat(),
+            'watermark': watermark,
+            'files': files,
+        })
+        return rows
+    
+    def tables(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return dict(self._read_manifest()['tables'])
+    
+    def read_rows(self, table_name: str, offset: int, limit: int) -> List[Any]:
+        """Lê as linhas [offset, offset + limit) dos chunks que as contêm."""
+        return ArrowBatchCodec.decode(self.read_batch(table_name, offset, limit))
+    
+    def read_batch(self, table_name: str, offset: int, limit: int) -> 'pa.RecordBatch':
+        """Lê as linhas [offset, offset + limit) como um RecordBatch, sem criar linhas Python.
+        
+        Dentro de um chunk o resultado é uma fatia dos buffers do arquivo
+        (sem cópia); só batches que cruzam chunks são concatenados.
+        """
+        entry = self.tables().get(table_name)
+        if entry is None:
+            raise ValueError(f"Tabela '{table_name}' não encontrada no staging")
+        
+        chunks = self._chunk_index(table_name, entry)
+        starts = [start for start, _, _, _ in chunks]
+        pieces: List[Any] = []
+        read = 0
+        position = bisect.bisect_right(starts, offset) - 1
+        while limit > read and 0 <= position < len(chunks):
+            start, count, path, index = chunks[position]
+            skip = max(0, offset + read - start)
+            take = min(count - skip, limit - read)
+            piece = self._read_chunk(path, index).slice(skip, take)
+            pieces.append(pa.Table.from_batches([piece]) if isinstance(piece, pa.RecordBatch)
+                          else piece)
+            read += take
+            position += 1
+        
+        if not pieces:
+            schema = self._chunk_schema(chunks) if chunks else pa.schema([])
+            return pa.RecordBatch.from_pylist([], schema=schema)
+        combined = pieces[0] if len(pieces) == 1 else pa.concat_tables(pieces)
+        batches = combined.combine_chunks().to_batches()
+        return batches[0] if batches else pa.RecordBatch.from_pylist([], schema=combined.schema)
+    
+    def _open_writer(self, path: str, schema: 'pa.Schema') -> Any:
+        compression = None if self.compression == 'none' else self.compression
+        if self.file_format == 'parquet':
+            return pq.ParquetWriter(path, schema, compression=compression or 'none')
+        return pa.ipc.new_file(path, schema,
+                               options=pa.ipc.IpcWriteOptions(compression=compression))
+    
+    def _chunk_index(self, table_name: str, entry: Dict[str, Any]
+                     ) -> List[Tuple[int, int, str, int]]:
+        """(primeira linha, linhas, arquivo, índice no arquivo) de cada chunk da tabela."""
+        cache = self._thread_cache('indexes')
+        chunks = cache.get(table_name)
+        if chunks is None:
+            chunks = []
+            start = 0
+            for file_entry in entry['files']:
+                path = os.path.join(self.directory, file_entry['path'])
+                for index, count in enumerate(file_entry['chunks']):
+                    chunks.append((start, count, path, index))
+                    start += count
+            cache[table_name] = chunks
+        return chunks
+    
+    def _read_chunk(self, path: str, index: int) -> Any:
+        """RecordBatch (Arrow) ou tabela do row group (Parquet) de um chunk.
+        
+        O último chunk lido fica em cache: batches da carga menores que os
+        chunks não descomprimem o mesmo chunk a cada leitura.
+        """
+        last = getattr(self._local, 'last_chunk', None)
+        if last is not None and last[0] == (path, index):
+            return last[1]
+        readers = self._thread_cache('readers')
+        reader = readers.get(path)
+        if reader is None:
+            if path.endswith(_EXTENSIONS['parquet']):
+                reader = pq.ParquetFile(path, memory_map=True)
+            else:
+                reader = pa.ipc.open_file(pa.memory_map(path, 'r'))
+            readers[path] = reader
+        if path.endswith(_EXTENSIONS['parquet']):
+            chunk = reader.read_row_group(index)
+        else:
+            chunk = reader.get_batch(index)
+        self._local.last_chunk = ((path, index), chunk)
+        return chunk
+    
+    def _chunk_schema(self, chunks: List[Tuple[int, int, str, int]]) -> 'pa.Schema':
+        _, _, path, index = chunks[0]
+        return self._read_chunk(path, index).schema
+    
+    def _thread_cache(self, name: str) -> Dict[str, Any]:
+        cache = getattr(self._local, name, None)
+        if cache is None:
+            cache = {}
+            setattr(self._local, name, cache)
+        return cache
+    
+    def _read_manifest(self) -> Dict[str, Any]:
+        if self._manifest is None:
+            path = os.path.join(self.directory, _MANIFEST)
+            manifest: Dict[str, Any] = {'version': _FORMAT_VERSION, 'tables': {}}
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as f:
+                    manifest = json.load(f)
+                if manifest.get('version') != _FORMAT_VERSION:
+                    raise ValueError(f"Manifesto de staging versão {manifest.get('version')} "
+                                     f"não suportado (esperada {_FORMAT_VERSION})")
+            self._manifest = manifest
+        return self._manifest
+    
+    def _update_manifest(self, table_name: str, entry: Optional[Dict[str, Any]]) -> None:
+        """Registra (ou, com entry None, remove) a tabela e regrava o manifesto de forma atômica."""
+        with self._lock:
+            manifest = self._read_manifest()
+            if entry is None:
+                if manifest['tables'].pop(table_name, None) is None:
+                    return
+            else:
+                manifest['tables'][table_name] = entry
+            manifest['updated_at'] = datetime.now().isoformat()
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, _MANIFEST)
+            temporary = f"{path}.tmp"
+            with open(temporary, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2, ensure_ascii=False)
+            os.replace(temporary, path)
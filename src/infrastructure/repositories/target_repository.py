@@ -1,49 +1,481 @@
-from typing import List, Dict, Any, Optional
-from sqlalchemy import Table, MetaData, select, func, text
-from sqlalchemy.engine import Engine
-from sqlalchemy.exc import SQLAlchemyError
+import re
+import threading
+from collections.abc import Mapping
+from typing import Callable, ContextManager, Iterable, List, Dict, Any, Optional, Sequence, Set, Tuple
+from sqlalchemy import Table, MetaData, Integer, select, func, text, inspect, literal_column
+from sqlalchemy.sql import sqltypes
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import Engine, Connection
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.schema import AddConstraint, CreateIndex
 from src.domain.interfaces.target_repository import ITargetRepository
+from src.infrastructure.loaders.copy_encoder import TextCopyEncoder
+from src.infrastructure.loaders.binary_copy_encoder import BinaryCopyEncoder
+from src.infrastructure.loaders.arrow_copy_encoder import ArrowCopyEncoder
+from src.infrastructure.serializers.arrow_codec import ArrowBatchCodec, is_record_batch
+from src.infrastructure.repositories.load_session import LoadSession
+
+# Contexto do erro do COPY: "COPY tabela, line 42, column nome: ..."
+_COPY_LINE_PATTERN = re.compile(r'\bline (\d+)')
+# Erro do COPY para strings com NUL, que o INSERT acusa com ValueError
+_COPY_NUL_PATTERN = re.compile(r'invalid byte sequence for encoding "[^"]+": 0x00')
+# Linhas por COPY ao isolar rejeições: limita o que é reenviado após cada uma
+_COPY_WINDOW_ROWS = 1000
+
+# Marcador de parâmetro posicional de cada paramstyle da DBAPI
+_POSITIONAL_MARKERS = {'qmark': '?', 'format': '%s', 'pyformat': '%s'}
+# Bind processors do INSERT posicional: (índice da coluna, conversão do valor)
+_BindProcessors = List[Tuple[int, Callable[[Any], Any]]]
 
 class TargetRepository(ITargetRepository):
     """Repositório para operações de escrita no banco de destino."""
     
-    def __init__(self, engine: Engine, schema: Optional[str] = None):
+    def __init__(self, engine: Engine, schema: Optional[str] = None,
+                 maintenance_settings: Optional[Dict[str, str]] = None,
+                 session_settings: Optional[Dict[str, str]] = None,
+                 commit_every: int = 1):
         self.engine = engine
         self.schema = schema
+        # Parâmetros de sessão (ex.: maintenance_work_mem) das operações de estrutura
+        self.maintenance_settings = maintenance_settings or {}
+        # Parâmetros das sessões de carga (ex.: synchronous_commit) e batches por commit
+        self.session_settings = session_settings or {}
+        self.commit_every = commit_every
+        # session_replication_role das próximas sessões de carga (replica desliga FKs e triggers)
+        self._replication_role: Optional[str] = None
+        self._rejected_settings: Set[str] = set()
+        # Sessão de carga associada a cada thread
+        self._local = threading.local()
         self.metadata = MetaData(schema=schema)
+        self.copy_encoder = TextCopyEncoder()
+        self._binary_encoders: Dict[str, Optional[BinaryCopyEncoder]] = {}
+        self._naive_timestamptz_tables: Set[str] = set()
+        self._arrow_encoder: Optional[ArrowCopyEncoder] = None
+        self._positional_inserts: Dict[str, Tuple[str, _BindProcessors]] = {}
+        # Tabelas já refletidas do destino; refeitas só após mudanças de estrutura
+        self._reflected_tables: Dict[str, Table] = {}
+        self._reflection_lock = threading.Lock()
     
     def get_table_metadata(self, table_name: str) -> Table:
-        """Obtém os metadados de uma tabela."""
-        metadata = MetaData(schema=self.schema)
-        return Table(
-            table_name, 
-            metadata, 
-            autoload_with=self.engine,
-            schema=self.schema
-        )
+        """Obtém os metadados de uma tabela (refletidos uma vez e reaproveitados)."""
+        table = self._reflected_tables.get(table_name)
+        if table is None:
+            metadata = MetaData(schema=self.schema)
+            table = Table(
+                table_name, 
+                metadata, 
+                autoload_with=self.engine,
+                schema=self.schema
+            )
+            with self._reflection_lock:
+                table = self._reflected_tables.setdefault(table_name, table)
+        return table
+    
+    def _forget_table_metadata(self, table_name: str) -> None:
+        """Descarta a reflexão da tabela após uma mudança de estrutura."""
+        with self._reflection_lock:
+            self._reflected_tables.pop(table_name, None)
+    
+    def load_session(self) -> LoadSession:
+        """Nova sessão de carga; dentro de 'with' (ou após bind) as cargas da thread a usam."""
+        settings = dict(self.session_settings)
+        if self._replication_role is not None:
+            settings['session_replication_role'] = self._replication_role
+        return LoadSession(self.engine, settings, self.commit_every,
+                           binder=self._bind_session, rejected_settings=self._rejected_settings)
+    
+    def _bind_session(self, session: Optional[LoadSession]) -> None:
+        self._local.session = session
+    
+    def after_commit(self, callback: Callable[[], None]) -> None:
+        """Executa callback quando os batches já gravados pela thread estiverem confirmados.
+        
+        Sem sessão de carga cada batch é confirmado na sua transação, então
+        callback roda na hora; com commit_every > 1 espera o próximo commit.
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            callback()
+        else:
+            session.on_commit(callback)
+    
+    def _transaction(self) -> ContextManager[Connection]:
+        """Transação de um batch: na sessão de carga da thread ou em uma conexão do pool."""
+        session = getattr(self._local, 'session', None)
+        if session is not None:
+            return session.transaction()
+        return self.engine.begin()
     
     def create_table(self, table: Table) -> bool:
         """Cria uma tabela no banco de destino."""
         try:
             table.create(self.engine, checkfirst=True)
+            self._forget_table_metadata(table.name)
             return True
         except SQLAlchemyError as e:
             print(f"Erro ao criar tabela {table.name}: {e}")
             return False
     
-    def insert_batch(self, table: Table, data: List[Dict[str, Any]]) -> bool:
-        """Insere um lote de dados na tabela."""
+    def insert_batch(self, table: Table, data: List[Any],
+                     on_loaded: Optional[Callable[[Connection], None]] = None) -> bool:
+        """Insere um lote de dados na tabela.
+        
+        As linhas podem ser dicionários ou sequências na ordem das colunas.
+        on_loaded é chamado na mesma transação, após a gravação do lote
+        (ex.: para registrar o checkpoint de forma atômica).
+        """
         if not data:
             return True
         
         try:
-            with self.engine.begin() as conn:
-                conn.execute(table.insert(), data)
+            with self._transaction() as conn:
+                self._insert_rows(conn, table, data)
+                if on_loaded is not None:
+                    on_loaded(conn)
             return True
         except SQLAlchemyError as e:
             print(f"Erro ao inserir dados em {table.name}: {e}")
             return False
     
+    def insert_isolating(self, table: Table, data: List[Any],
+                         on_loaded: Optional[Callable[[Connection, int], None]] = None
+                         ) -> Optional[List[Tuple[int, str]]]:
+        """Insere o lote isolando por bisseção as linhas rejeitadas pelo banco.
+        
+        Tudo roda em uma transação: a parte que falha é desfeita até o seu
+        savepoint e dividida ao meio, até restarem linhas individuais. Com k
+        linhas ruins são O(k log n) tentativas e todas as linhas boas são
+        gravadas. on_loaded recebe a conexão e o número de linhas gravadas.
+        Retorna (posição no lote, erro) de cada linha rejeitada, ou None se a
+        transação como um todo falhar.
+        """
+        if not data:
+            return []
+        
+        rejected: List[Tuple[int, str]] = []
+        try:
+            with self._transaction() as conn:
+                self._insert_bisecting(conn, table, data, 0, rejected)
+                if on_loaded is not None:
+                    on_loaded(conn, len(data) - len(rejected))
+            return rejected
+        except SQLAlchemyError as e:
+            print(f"Erro ao inserir dados em {table.name}: {e}")
+            return None
+    
+    def upsert_batch(self, table: Table, data: List[Any],
+                     key_columns: List[str],
+                     on_loaded: Optional[Callable[[Connection], None]] = None) -> bool:
+        """Insere ou atualiza um lote pela chave (INSERT ... ON CONFLICT DO UPDATE)."""
+        if not data:
+            return True
+        
+        if not isinstance(data[0], Mapping):
+            column_names = [col.name for col in table.columns]
+            data = [dict(zip(column_names, row)) for row in data]
+        
+        if self.engine.dialect.name != 'postgresql':
+            print(f"Upsert não suportado no dialeto {self.engine.dialect.name}")
+            return False
+        
+        statement = postgresql.insert(table)
+        update_columns = {
+            col.name: statement.excluded[col.name]
+            for col in table.columns if col.name not in key_columns
+        }
+        if update_columns:
+            statement = statement.on_conflict_do_update(
+                index_elements=key_columns, set_=update_columns
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=key_columns)
+        
+        try:
+            with self._transaction() as conn:
+                conn.execute(statement, data)
+                if on_loaded is not None:
+                    on_loaded(conn)
+            return True
+        except SQLAlchemyError as e:
+            print(f"Erro ao atualizar dados em {table.name}: {e}")
+            return False
+    
+    def write_lob(self, conn: Connection, table: Table, column_name: str,
+                  key_columns: List[str], key: Sequence[Any], chunks: Iterable[Any]) -> int:
+        """Grava o valor de um LOB, recebido em partes, na linha com a chave informada.
+        
+        Roda na transação de conn (a do batch). No PostgreSQL as partes são
+        escritas em um large object temporário e copiadas para a coluna com
+        lo_get (convert_from para texto), sem montar o valor inteiro no Python;
+        em outros bancos as partes são concatenadas e gravadas com um UPDATE.
+        """
+        column = table.c[column_name]
+        binary = isinstance(column.type, sqltypes._Binary)
+        where = [table.c[name] == value for name, value in zip(key_columns, key)]
+        written = 0
+        
+        if conn.dialect.name != 'postgresql':
+            parts = []
+            for chunk in chunks:
+                parts.append(chunk)
+                written += len(chunk)
+            value = (b'' if binary else '').join(parts)
+            conn.execute(table.update().where(*where).values({column_name: value}))
+            return written
+        
+        # Criado na transação do batch: se ela for desfeita, o large object também é
+        lob = conn.connection.driver_connection.lobject(0, 'wb')
+        for chunk in chunks:
+            data = chunk if isinstance(chunk, (bytes, bytearray, memoryview)) else chunk.encode('utf-8')
+            lob.write(data)
+            written += len(data)
+        value = func.lo_get(lob.oid)
+        if not binary:
+            value = func.convert_from(value, 'UTF8')
+        conn.execute(table.update().where(*where).values({column_name: value}))
+        lob.unlink()
+        return written
+    
+    def copy_batch(self, table: Table, data: List[Any], binary: bool = False,
+                   on_loaded: Optional[Callable[[Connection], None]] = None) -> bool:
+        """Carrega um lote via COPY FROM STDIN em uma única transação.
+        
+        Com binary=True usa o formato binário quando todas as colunas têm codificação
+        suportada; caso contrário recai no formato texto. on_loaded é chamado na
+        mesma transação do COPY. Uma linha rejeitada faz o lote inteiro falhar;
+        copy_isolating grava as demais.
+        """
+        if not data:
+            return True
+        
+        if self.engine.dialect.name != 'postgresql':
+            return self.insert_batch(table, data, on_loaded)
+        
+        try:
+            with self._transaction() as conn:
+                copy_sql, encoder = self._copy_statement(conn, table, data, binary)
+                column_names = [col.name for col in table.columns]
+                cursor = conn.connection.driver_connection.cursor()
+                try:
+                    self._copy_expert(conn, cursor, copy_sql, encoder.encode(data, column_names))
+                finally:
+                    cursor.close()
+                if on_loaded is not None:
+                    on_loaded(conn)
+            return True
+        except SQLAlchemyError as e:
+            if _COPY_NUL_PATTERN.search(str(e)):
+                # Mesmo erro do INSERT, para que o lote seja limpo e repetido
+                raise ValueError(f"COPY de {table.name} rejeitou caractere NUL (0x00)") from e
+            print(f"Erro ao carregar dados em {table.name} via COPY: {e}")
+            return False
+    
+    def copy_isolating(self, table: Table, data: List[Any], binary: bool = False,
+                       on_loaded: Optional[Callable[[Connection, int], None]] = None
+                       ) -> Optional[List[Tuple[int, str]]]:
+        """Carrega o lote via COPY separando as linhas rejeitadas pelo banco.
+        
+        Equivalente a insert_isolating para o caminho COPY: on_loaded recebe a
+        conexão e o número de linhas gravadas. Retorna (posição no lote, erro)
+        de cada linha rejeitada, ou None se a transação como um todo falhar.
+        """
+        if not data:
+            return []
+        
+        if self.engine.dialect.name != 'postgresql':
+            return self.insert_isolating(table, data, on_loaded)
+        
+        rejected: List[Tuple[int, str]] = []
+        try:
+            with self._transaction() as conn:
+                self._copy_rows(conn, table, data, binary, rejected)
+                if on_loaded is not None:
+                    on_loaded(conn, len(data) - len(rejected))
+            return rejected
+        except SQLAlchemyError as e:
+            print(f"Erro ao carregar dados em {table.name} via COPY: {e}")
+            return None
+    
+    def _copy_statement(self, conn: Connection, table: Table, data: List[Any],
+                        binary: bool) -> Tuple[str, Any]:
+        """Monta o comando COPY e escolhe o codificador do lote.
+        
+        Batches Arrow (RecordBatch) são sempre enviados no formato texto.
+        """
+        preparer = conn.dialect.identifier_preparer
+        copy_sql = (
+            f"COPY {preparer.format_table(table)} "
+            f"({', '.join(preparer.quote(col.name) for col in table.columns)}) FROM STDIN"
+        )
+        if is_record_batch(data):
+            if self._arrow_encoder is None:
+                self._arrow_encoder = ArrowCopyEncoder()
+            return copy_sql, self._arrow_encoder
+        
+        encoder = self._binary_encoder(table) if binary else None
+        if encoder is not None:
+            if encoder.accepts(data, [col.name for col in table.columns]):
+                return copy_sql + " WITH (FORMAT binary)", encoder
+            if table.fullname not in self._naive_timestamptz_tables:
+                self._naive_timestamptz_tables.add(table.fullname)
+                print(f"Tabela {table.name} tem timestamptz sem fuso; lotes assim usam formato texto")
+        return copy_sql, self.copy_encoder
+    
+    def _copy_rows(self, conn: Connection, table: Table, data: List[Any],
+                   binary: bool, rejected: List[Tuple[int, str]]) -> None:
+        """Executa o COPY em janelas dentro da transação de conn, pulando linhas rejeitadas.
+        
+        Cada janela de _COPY_WINDOW_ROWS linhas roda em um savepoint. Quando o
+        PostgreSQL rejeita uma linha, o erro informa o número dela: as anteriores
+        da janela são regravadas, a rejeitada vai para rejected e o COPY continua
+        na seguinte. Cada rejeição reenvia no máximo uma janela, e não o lote todo.
+        Sem o número da linha, a janela é isolada por bisseção com INSERT.
+        """
+        column_names = [col.name for col in table.columns]
+        copy_sql, encoder = self._copy_statement(conn, table, data, binary)
+        cursor = conn.connection.driver_connection.cursor()
+        
+        try:
+            start = 0
+            while start < len(data):
+                end = min(start + _COPY_WINDOW_ROWS, len(data))
+                savepoint = conn.begin_nested()
+                try:
+                    self._copy_expert(conn, cursor, copy_sql,
+                                      encoder.encode(data[start:end], column_names))
+                    savepoint.commit()
+                    start = end
+                    continue
+                except DBAPIError as e:
+                    savepoint.rollback()
+                    rejected_line = self._rejected_copy_line(e.orig)
+                    error = str(e.orig).strip()
+                
+                if rejected_line is None:
+                    self._insert_bisecting(conn, table, data[start:end], start, rejected)
+                    start = end
+                    continue
+                
+                position = start + rejected_line - 1
+                if position > start:
+                    # Linhas anteriores à rejeitada já foram aceitas pelo banco
+                    with conn.begin_nested():
+                        self._copy_expert(conn, cursor, copy_sql,
+                                          encoder.encode(data[start:position], column_names))
+                rejected.append((position, error))
+                start = position + 1
+        finally:
+            cursor.close()
+    
+    @staticmethod
+    def _copy_expert(conn: Connection, cursor: Any, copy_sql: str, payload: Any) -> None:
+        """Executa o COPY no cursor do driver, com o mesmo tipo de erro do SQLAlchemy."""
+        try:
+            cursor.copy_expert(copy_sql, payload)
+        except conn.dialect.loaded_dbapi.Error as e:
+            raise DBAPIError.instance(
+                copy_sql, None, e, conn.dialect.loaded_dbapi.Error, dialect=conn.dialect
+            ) from e
+    
+    def _insert_rows(self, conn: Connection, table: Table, rows: List[Any]) -> None:
+        """Executa o INSERT do lote; sequências vão como parâmetros posicionais.
+        
+        Linhas posicionais são enviadas direto ao executemany do driver, sem
+        montar um dicionário por linha, passando só pelos bind processors das
+        colunas que os têm; um RecordBatch é convertido em tuplas.
+        """
+        if is_record_batch(rows):
+            rows = ArrowBatchCodec.decode(rows)
+        marker = _POSITIONAL_MARKERS.get(conn.dialect.paramstyle)
+        if isinstance(rows[0], Mapping) or marker is None:
+            if not isinstance(rows[0], Mapping):
+                column_names = [col.name for col in table.columns]
+                rows = [dict(zip(column_names, row)) for row in rows]
+            conn.execute(table.insert(), rows)
+            return
+        
+        statement, processors = self._positional_insert(conn, table, marker)
+        if processors:
+            rows = [self._process_row(row, processors) for row in rows]
+        
+        cursor = conn.connection.driver_connection.cursor()
+        try:
+            cursor.executemany(statement, rows)
+        except conn.dialect.loaded_dbapi.Error as e:
+            # Mesmo tipo de erro do caminho via SQLAlchemy
+            raise DBAPIError.instance(
+                statement, None, e, conn.dialect.loaded_dbapi.Error, dialect=conn.dialect
+            ) from e
+        finally:
+            cursor.close()
+    
+    def _positional_insert(self, conn: Connection, table: Table, marker: str
+                           ) -> Tuple[str, _BindProcessors]:
+        """Obtém (e guarda) o INSERT posicional da tabela e os bind processors das colunas.
+        
+        Os processors são os mesmos que o SQLAlchemy aplicaria no caminho por
+        dicionários (ex.: Decimal e date no SQLite, JSON serializado, UUID).
+        """
+        cached = self._positional_inserts.get(table.fullname)
+        if cached is None:
+            preparer = conn.dialect.identifier_preparer
+            statement = (
+                f"INSERT INTO {preparer.format_table(table)} "
+                f"({', '.join(preparer.quote(col.name) for col in table.columns)}) "
+                f"VALUES ({', '.join([marker] * len(table.columns))})"
+            )
+            processors = []
+            for index, col in enumerate(table.columns):
+                processor = col.type.dialect_impl(conn.dialect).bind_processor(conn.dialect)
+                if processor is not None:
+                    processors.append((index, processor))
+            cached = self._positional_inserts[table.fullname] = (statement, processors)
+        return cached
+    
+    @staticmethod
+    def _process_row(row: Sequence[Any], processors: _BindProcessors) -> List[Any]:
+        values = list(row)
+        for index, processor in processors:
+            values[index] = processor(values[index])
+        return values
+    
+    def _insert_bisecting(self, conn: Connection, table: Table, rows: List[Any],
+                          offset: int, rejected: List[Tuple[int, str]]) -> None:
+        """Insere rows sob um savepoint; se falhar, repete com cada metade."""
+        savepoint = conn.begin_nested()
+        try:
+            self._insert_rows(conn, table, rows)
+        except (SQLAlchemyError, ValueError) as e:
+            savepoint.rollback()
+            if len(rows) == 1:
+                error = getattr(e, 'orig', None) or e
+                rejected.append((offset, str(error).strip()))
+                return
+            middle = len(rows) // 2
+            self._insert_bisecting(conn, table, rows[:middle], offset, rejected)
+            self._insert_bisecting(conn, table, rows[middle:], offset + middle, rejected)
+            return
+        savepoint.commit()
+    
+    def _binary_encoder(self, table: Table) -> Optional[BinaryCopyEncoder]:
+        """Obtém (e guarda) o codificador binário da tabela, se os tipos permitirem."""
+        key = table.fullname
+        if key not in self._binary_encoders:
+            if BinaryCopyEncoder.supports(table):
+                self._binary_encoders[key] = BinaryCopyEncoder.for_table(table)
+            else:
+                print(f"Tabela {table.name} tem tipos sem COPY binário; usando formato texto")
+                self._binary_encoders[key] = None
+        return self._binary_encoders[key]
+    
+    @staticmethod
+    def _rejected_copy_line(error: Exception) -> Optional[int]:
+        """Extrai do erro do COPY o número (1-based) da linha rejeitada."""
+        diag = getattr(error, 'diag', None)
+        context = getattr(diag, 'context', None) or str(error)
+        match = _COPY_LINE_PATTERN.search(context)
+        return int(match.group(1)) if match else None
+    
     def count_records(self, table: Table) -> int:
         """Conta registros na tabela."""
         try:
@@ -53,6 +485,134 @@ class TargetRepository(ITargetRepository):
         except SQLAlchemyError:
             return 0
     
+    def has_rows(self, table: Table) -> bool:
+        """Verifica se a tabela tem ao menos um registro, sem contá-los."""
+        with self.engine.connect() as conn:
+            query = select(literal_column('1')).select_from(table).limit(1)
+            return conn.execute(query).first() is not None
+    
+    def build_table_structure(self, table: Table) -> bool:
+        """Completa uma tabela criada sem estrutura: LOGGED, chave primária e índices.
+        
+        table é a definição final (PK e índices); o que já existe no destino é
+        mantido, então a operação pode ser repetida. Roda com os parâmetros de
+        manutenção configurados, que valem só para a transação.
+        """
+        try:
+            with self.engine.begin() as conn:
+                self._apply_maintenance_settings(conn)
+                if conn.dialect.name == 'postgresql':
+                    table_name = self._qualified_name(conn, table)
+                    persistence = conn.execute(
+                        text("SELECT relpersistence FROM pg_class WHERE oid = to_regclass(:name)"),
+                        {'name': table_name}
+                    ).scalar()
+                    if persistence == 'u':
+                        conn.execute(text(f"ALTER TABLE {table_name} SET LOGGED"))
+                
+                inspector = inspect(conn)
+                existing_pk = inspector.get_pk_constraint(table.name, schema=table.schema)
+                if table.primary_key.columns and not existing_pk.get('constrained_columns'):
+                    conn.execute(AddConstraint(table.primary_key))
+                
+                existing_indexes = {
+                    index['name'] for index in inspector.get_indexes(table.name, schema=table.schema)
+                }
+                for index in table.indexes:
+                    if index.name not in existing_indexes:
+                        conn.execute(CreateIndex(index))
+            self._forget_table_metadata(table.name)
+            return True
+        except SQLAlchemyError as e:
+            print(f"Erro ao criar chave primária/índices de {table.name}: {e}")
+            return False
+    
+    def add_foreign_keys(self, table: Table) -> bool:
+        """Cria as FKs da definição final que ainda não existem no destino.
+        
+        Cada FK é criada NOT VALID e validada em seguida; se os dados violarem a
+        FK ela permanece NOT VALID (vale para novas linhas) e o erro é reportado.
+        Em outros bancos a FK é criada já validada.
+        """
+        success = True
+        with self.engine.connect() as conn:
+            existing = {fk['name'] for fk in inspect(conn).get_foreign_keys(table.name, schema=table.schema)}
+        
+        for constraint in table.foreign_key_constraints:
+            if constraint.name in existing:
+                continue
+            try:
+                with self.engine.begin() as conn:
+                    self._apply_maintenance_settings(conn)
+                    conn.execute(AddConstraint(constraint))
+                if self.engine.dialect.name != 'postgresql':
+                    continue
+                with self.engine.begin() as conn:
+                    self._apply_maintenance_settings(conn)
+                    conn.execute(text(
+                        f"ALTER TABLE {self._qualified_name(conn, table)} "
+                        f"VALIDATE CONSTRAINT {conn.dialect.identifier_preparer.quote(constraint.name)}"
+                    ))
+            except SQLAlchemyError as e:
+                print(f"Erro na FK {constraint.name} de {table.name}: {e}")
+                success = False
+        return success
+    
+    def analyze_table(self, table: Table) -> bool:
+        """Atualiza as estatísticas do planejador para a tabela (só no PostgreSQL)."""
+        if self.engine.dialect.name != 'postgresql':
+            return True
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text(f"ANALYZE {self._qualified_name(conn, table)}"))
+            return True
+        except SQLAlchemyError as e:
+            print(f"Erro no ANALYZE de {table.name}: {e}")
+            return False
+    
+    def reset_sequences(self, table: Table) -> bool:
+        """Ajusta as sequências (SERIAL/IDENTITY) da tabela para continuar após o maior valor.
+        
+        Só o PostgreSQL tem sequências; nos demais bancos não há o que ajustar.
+        """
+        if self.engine.dialect.name != 'postgresql':
+            return True
+        try:
+            with self.engine.begin() as conn:
+                table_name = self._qualified_name(conn, table)
+                for column in table.columns:
+                    if not isinstance(column.type, Integer):
+                        continue
+                    sequence = conn.execute(
+                        text("SELECT pg_get_serial_sequence(:table_name, :column_name)"),
+                        {'table_name': table_name, 'column_name': column.name}
+                    ).scalar()
+                    if sequence is None:
+                        continue
+                    conn.execute(
+                        select(func.setval(
+                            sequence,
+                            func.greatest(func.coalesce(func.max(column), 0) + 1, 1),
+                            False
+                        )).select_from(table)
+                    )
+            return True
+        except SQLAlchemyError as e:
+            print(f"Erro ao ajustar sequências de {table.name}: {e}")
+            return False
+    
+    def _apply_maintenance_settings(self, conn: Connection) -> None:
+        """Aplica os parâmetros de manutenção apenas na transação corrente (só no PostgreSQL)."""
+        if conn.dialect.name != 'postgresql':
+            return
+        for name, value in self.maintenance_settings.items():
+            conn.execute(text("SELECT set_config(:name, :value, true)"),
+                         {'name': name, 'value': str(value)})
+    
+    @staticmethod
+    def _qualified_name(conn: Connection, table: Table) -> str:
+        return conn.dialect.identifier_preparer.format_table(table)
+    
     def truncate_table(self, table_name: str) -> bool:
         """Limpa todos os dados de uma tabela."""
         try:
@@ -68,27 +628,19 @@ class TargetRepository(ITargetRepository):
             return False
     
     def disable_constraints(self) -> None:
-        """Desabilita constraints para PostgreSQL."""
+        """Desabilita constraints para PostgreSQL nas sessões de carga abertas a seguir.
+        
+        O parâmetro vale por conexão: é aplicado por cada sessão de carga na
+        conexão que grava os batches.
+        """
         if self.engine.dialect.name == 'postgresql':
-            try:
-                with self.engine.begin() as conn:
-                    conn.execute(text("SET session_replication_role = replica;"))
-            except SQLAlchemyError as e:
-                print(f"Erro ao desabilitar constraints: {e}")
+            self._replication_role = 'replica'
     
     def enable_constraints(self) -> None:
-        """Habilita constraints para PostgreSQL."""
+        """Habilita constraints para PostgreSQL nas sessões de carga abertas a seguir."""
         if self.engine.dialect.name == 'postgresql':
-            try:
-                with self.engine.begin() as conn:
-                    conn.execute(text("SET session_replication_role = origin;"))
-            except SQLAlchemyError as e:
-                print(f"Erro ao habilitar constraints: {e}")
+            self._replication_role = None
     
     def table_exists(self, table_name: str) -> bool:
         """Verifica se uma tabela existe."""
-        return self.engine.dialect.has_table(
-            self.engine, 
-            table_name, 
-            schema=self.schema
-        )
\ No newline at end of file
+        return inspect(self.engine).has_table(table_name, schema=self.schema)
\ No newline at end of file
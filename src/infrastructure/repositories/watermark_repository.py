@@ -0,0 +1,57 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import Column, DateTime, MetaData, String, Table, Text, select
+from sqlalchemy.engine import Engine
+from src.domain.interfaces.watermark_repository import IWatermarkRepository
+from src.infrastructure.serializers import json_codec
+
+class WatermarkRepository(IWatermarkRepository):
+    """Marcas d'água da sincronização incremental em uma tabela de controle no destino.
+    
+    Para cada tabela guarda a coluna de alteração (rowversion ou data) e o maior
+    valor já copiado; a próxima sincronização lê apenas linhas acima dele.
+    """
+    
+    def __init__(self, engine: Engine, schema: Optional[str] = None,
+                 table_name: str = 'migration_watermark'):
+        self.engine = engine
+        self.table = Table(
+            table_name,
+            MetaData(schema=schema),
+            Column('table_name', String(255), primary_key=True),
+            Column('column_name', String(255), nullable=False),
+            Column('watermark', Text),
+            Column('updated_at', DateTime, nullable=False),
+        )
+    
+    def ensure_table(self) -> None:
+        """Cria a tabela de controle, se ainda não existir."""
+        self.table.create(self.engine, checkfirst=True)
+    
+    def get_watermark(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """Obtém a coluna e o último valor sincronizado de uma tabela."""
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(self.table).where(self.table.c.table_name == table_name)
+            ).mappings().first()
+        if row is None:
+            return None
+        
+        return {
+            'column_name': row['column_name'],
+            'value': json_codec.loads(row['watermark']) if row['watermark'] is not None else None,
+        }
+    
+    def save_watermark(self, table_name: str, column_name: str, value: Any) -> None:
+        """Grava o último valor sincronizado de uma tabela (UPDATE ou INSERT)."""
+        values = {
+            'column_name': column_name,
+            'watermark': json_codec.dumps(value),
+            'updated_at': datetime.now(),
+        }
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                self.table.update().where(self.table.c.table_name == table_name).values(**values)
+            )
+            if result.rowcount == 0:
+                conn.execute(self.table.insert().values(table_name=table_name, **values))
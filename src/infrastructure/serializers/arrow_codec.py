@@ -0,0 +1,106 @@
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from sqlalchemy import Table
+from sqlalchemy.dialects import mssql
+from sqlalchemy.sql import sqltypes
+from sqlalchemy.types import TypeEngine
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # dependência opcional: staging colunar e ROW_FORMAT 'arrow'
+    pa = pc = pq = None
+
+# Converte o valor lido da origem antes de montar o array Arrow
+ValueEncoder = Callable[[Any], Any]
+
+def require_pyarrow() -> None:
+    """Falha com uma mensagem clara quando o staging ou o formato 'arrow' é usado sem o pyarrow."""
+    if pa is None:
+        raise RuntimeError("O staging colunar e o ROW_FORMAT 'arrow' requerem o pyarrow: "
+                           "pip install pyarrow")
+
+def is_record_batch(value: Any) -> bool:
+    """Indica se o batch está no formato colunar (RecordBatch) em vez de linhas."""
+    return pa is not None and isinstance(value, pa.RecordBatch)
+
+def _text(value: Any) -> Any:
+    return None if value is None else str(value)
+
+def _binary(value: Any) -> Any:
+    # memoryview/bytearray de alguns drivers viram bytes
+    if value is None or isinstance(value, bytes):
+        return value
+    return bytes(value)
+
+def arrow_type(type_: TypeEngine) -> Tuple['pa.DataType', Optional[ValueEncoder]]:
+    """Tipo Arrow de uma coluna da origem e o conversor dos seus valores, se houver.
+    
+    Texto e binário usam as variantes large_* (offsets de 64 bits), para que
+    batches com LOBs não passem do limite de 2 GB por array. Tipos sem
+    equivalente (sql_variant, hierarchyid, UUID) são gravados como texto,
+    que o destino converte na carga como faz com os valores da origem.
+    """
+    if isinstance(type_, sqltypes.Boolean):
+        return pa.bool_(), None
+    if isinstance(type_, sqltypes.SmallInteger):
+        return pa.int16(), None
+    if isinstance(type_, sqltypes.Integer):
+        return pa.int64(), None
+    if isinstance(type_, sqltypes.Float):
+        return pa.float64(), None
+    if isinstance(type_, sqltypes.Numeric):
+        # Sem precisão declarada a escala varia por valor: o texto preserva o valor exato
+        if type_.precision is not None and type_.precision <= 38:
+            return pa.decimal128(type_.precision, type_.scale or 0), None
+        return pa.large_string(), _text
+    if isinstance(type_, mssql.MONEY):
+        return pa.decimal128(19, 4), None
+    if isinstance(type_, mssql.SMALLMONEY):
+        return pa.decimal128(10, 4), None
+    if isinstance(type_, sqltypes.DateTime):
+        # DATETIMEOFFSET reflete com timezone=False, mas vira timestamptz no
+        # destino: sem tz o pyarrow descartaria o offset dos valores
+        aware = type_.timezone or isinstance(type_, mssql.DATETIMEOFFSET)
+        return pa.timestamp('us', tz='UTC' if aware else None), None
+    if isinstance(type_, sqltypes.Date):
+        return pa.date32(), None
+    if isinstance(type_, sqltypes.Time):
+        return pa.time64('us'), None
+    if isinstance(type_, (sqltypes.LargeBinary, sqltypes._Binary)):
+        return pa.large_binary(), _binary
+    if isinstance(type_, sqltypes.String) and not isinstance(type_, sqltypes.Uuid):
+        return pa.large_string(), None
+    return pa.large_string(), _text
+
+class ArrowBatchCodec:
+    """Converte batches de linhas da origem em RecordBatches Arrow e de volta.
+    
+    O schema vem dos tipos refletidos da tabela, não dos valores: todos os
+    batches de uma tabela têm o mesmo schema, inclusive os só com nulos.
+    """
+    
+    def __init__(self, table: Table) -> None:
+        require_pyarrow()
+        fields = []
+        self._encoders: List[Optional[ValueEncoder]] = []
+        for column in table.columns:
+            type_, encoder = arrow_type(column.type)
+            fields.append(pa.field(column.name, type_, nullable=True))
+            self._encoders.append(encoder)
+        self.schema = pa.schema(fields)
+    
+    def encode(self, rows: Sequence[Sequence[Any]]) -> 'pa.RecordBatch':
+        """Monta o RecordBatch de um batch de linhas (tuplas na ordem das colunas)."""
+        columns = list(zip(*rows)) if rows else [()] * len(self._encoders)
+        arrays = []
+        for values, field, encoder in zip(columns, self.schema, self._encoders):
+            if encoder is not None:
+                values = [encoder(value) for value in values]
+            arrays.append(pa.array(values, type=field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+    
+    @staticmethod
+    def decode(batch: 'pa.RecordBatch') -> List[Tuple[Any, ...]]:
+        """Linhas (tuplas) de um RecordBatch, no formato entregue pela origem."""
+        return list(zip(*(column.to_pylist() for column in batch.columns)))
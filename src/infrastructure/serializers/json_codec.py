@@ -0,0 +1,56 @@
+import base64
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Dict
+from uuid import UUID
+
+# Tipos sem representação JSON nativa viram {"$type": nome, "value": texto}
+_TYPE_KEY = '$type'
+_VALUE_KEY = 'value'
+
+_ENCODERS: Dict[type, Callable[[Any], Any]] = {
+    datetime: lambda value: ('datetime', value.isoformat()),
+    date: lambda value: ('date', value.isoformat()),
+    time: lambda value: ('time', value.isoformat()),
+    Decimal: lambda value: ('decimal', str(value)),
+    bytes: lambda value: ('bytes', base64.b64encode(value).decode('ascii')),
+    bytearray: lambda value: ('bytes', base64.b64encode(bytes(value)).decode('ascii')),
+    memoryview: lambda value: ('bytes', base64.b64encode(bytes(value)).decode('ascii')),
+    UUID: lambda value: ('uuid', str(value)),
+}
+
+_DECODERS: Dict[str, Callable[[str], Any]] = {
+    'datetime': datetime.fromisoformat,
+    'date': date.fromisoformat,
+    'time': time.fromisoformat,
+    'decimal': Decimal,
+    'bytes': base64.b64decode,
+    'uuid': UUID,
+}
+
+def _default(value: Any) -> Any:
+    encoder = _ENCODERS.get(type(value))
+    if encoder is None:
+        # Subclasses (ex.: Timestamp de drivers) usam o codificador da base
+        for base, candidate in _ENCODERS.items():
+            if isinstance(value, base):
+                encoder = candidate
+                break
+    if encoder is None:
+        raise TypeError(f"Tipo {type(value).__name__} não serializável em JSON")
+    type_name, encoded = encoder(value)
+    return {_TYPE_KEY: type_name, _VALUE_KEY: encoded}
+
+def _object_hook(obj: Dict[str, Any]) -> Any:
+    if _TYPE_KEY in obj and len(obj) == 2:
+        return _DECODERS[obj[_TYPE_KEY]](obj[_VALUE_KEY])
+    return obj
+
+def dumps(value: Any) -> str:
+    """Serializa valores de banco (chaves, marcas d'água) preservando o tipo."""
+    return json.dumps(value, default=_default, ensure_ascii=False)
+
+def loads(text: str) -> Any:
+    """Inverso de dumps; tuplas voltam como listas."""
+    return json.loads(text, object_hook=_object_hook)
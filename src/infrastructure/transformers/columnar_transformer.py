@@ -0,0 +1,87 @@
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+import threading
+from sqlalchemy import Table
+from src.infrastructure.serializers.arrow_codec import (
+    ArrowBatchCodec, is_record_batch, pa, pc, require_pyarrow
+)
+
+# Espaços removidos por str.strip(): o trim vetorizado precisa do mesmo conjunto
+_WHITESPACE = (
+    '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005'
+    '\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000'
+)
+
+class ColumnarTransformer:
+    """Equivalente do DataTransformer para batches Arrow (ROW_FORMAT 'arrow').
+    
+    As linhas da origem viram um RecordBatch uma vez, logo após a leitura; a
+    limpeza de NUL e as conversões são operações sobre colunas inteiras
+    (pyarrow.compute) em vez de chamadas Python por valor. Os valores
+    resultantes são os mesmos do caminho por linhas.
+    """
+    
+    def __init__(self) -> None:
+        require_pyarrow()
+        self._codecs: Dict[str, ArrowBatchCodec] = {}
+        self._lock = threading.Lock()
+    
+    def to_batch(self, table: Table, rows: Sequence[Sequence[Any]]) -> 'pa.RecordBatch':
+        """Converte as linhas lidas da tabela de origem em um RecordBatch.
+        
+        Batches já colunares (lidos do staging) são usados como estão.
+        """
+        if is_record_batch(rows):
+            return rows
+        codec = self._codecs.get(table.fullname)
+        if codec is None:
+            with self._lock:
+                codec = self._codecs.setdefault(table.fullname, ArrowBatchCodec(table))
+        column_count = len(codec.schema)
+        if rows and len(rows[0]) > column_count:
+            # Colunas extras no fim da linha (ex.: %%physloc%%) são descartadas
+            rows = [row[:column_count] for row in rows]
+        return codec.encode(rows)
+    
+    @staticmethod
+    def to_rows(batch: 'pa.RecordBatch') -> List[Tuple[Any, ...]]:
+        """Linhas posicionais do batch, para os caminhos que gravam linha a linha."""
+        return ArrowBatchCodec.decode(batch)
+    
+    @staticmethod
+    def coerce_batch(plan: List[Tuple[int, str, Callable[[Any], Any]]],
+                     batch: 'pa.RecordBatch') -> 'pa.RecordBatch':
+        """Aplica o plano de conversão do DataTransformer às colunas do batch.
+        
+        Colunas já gravadas como texto pelo codec (UUID, sql_variant) têm o
+        valor que os conversores produziriam; as demais, se houver, são
+        convertidas valor a valor.
+        """
+        for position, _, coerce in plan:
+            column = batch.column(position)
+            if pa.types.is_large_string(column.type) or pa.types.is_string(column.type):
+                continue
+            values = pa.array([coerce(value) for value in column.to_pylist()])
+            batch = batch.set_column(position, batch.schema.field(position).with_type(values.type),
+                                     values)
+        return batch
+    
+    @staticmethod
+    def clean_batch(batch: 'pa.RecordBatch') -> Tuple['pa.RecordBatch', Dict[str, int]]:
+        """Remove NUL (e, como no caminho por linhas, as bordas em branco) dos textos afetados.
+        
+        Retorna o novo batch e quantos valores foram limpos em cada coluna
+        (apenas colunas com ocorrências).
+        """
+        counts: Dict[str, int] = {}
+        for position, field in enumerate(batch.schema):
+            if not (pa.types.is_large_string(field.type) or pa.types.is_string(field.type)):
+                continue
+            column = batch.column(position)
+            affected = pc.match_substring(column, '\x00')
+            cleaned = pc.sum(affected).as_py()
+            if not cleaned:
+                continue
+            stripped = pc.utf8_trim(pc.replace_substring(column, '\x00', ''), characters=_WHITESPACE)
+            batch = batch.set_column(position, field, pc.if_else(affected, stripped, column))
+            counts[field.name] = cleaned
+        return batch, counts
@@ -1,8 +1,16 @@
-from typing import Dict, Any, List, Tuple
+from typing import Callable, Dict, Any, List, Optional, Tuple
+import threading
+from sqlalchemy import Column, Table
+from sqlalchemy import types as sqltypes
 
 class DataTransformer:
     def __init__(self) -> None:
         self._transformations_applied: int = 0
+        # Plano por tabela: apenas as colunas de texto, únicas que podem conter NUL
+        self._plans: Dict[str, List[Tuple[int, str]]] = {}
+        # Plano por tabela: colunas cujo valor lido precisa de conversão para o destino
+        self._coercion_plans: Dict[str, List[Tuple[int, str, Callable[[Any], Any]]]] = {}
+        self._lock = threading.Lock()
     
     def clean_null_characters(self, value: Any) -> Any:
         """Remove caracteres NUL (0x00) de strings."""
@@ -24,11 +32,75 @@ class DataTransformer:
                 
                 if original_value != transformed_value:
                     has_transformations = True
-                    
+                
                 transformed_row[key] = transformed_value
             transformed_batch.append(transformed_row)
         
         return transformed_batch, has_transformations
     
+    def get_cleaning_plan(self, table: Table) -> List[Tuple[int, str]]:
+        """Posição e nome das colunas de texto, calculados uma vez a partir dos tipos refletidos."""
+        plan = self._plans.get(table.fullname)
+        if plan is None:
+            plan = [
+                (position, col.name) for position, col in enumerate(table.columns)
+                if isinstance(col.type, sqltypes.String)
+            ]
+            self._plans[table.fullname] = plan
+        return plan
+    
+    def clean_batch(self, table: Table, batch_data: List[Any]) -> Dict[str, int]:
+        """Remove NUL das colunas de texto do plano, alterando o batch no lugar.
+        
+        Percorre coluna a coluna, sem tocar nas demais. Linhas em dicionário são
+        alteradas diretamente; linhas posicionais (tuplas) com ocorrências são
+        trocadas no batch por uma lista com os valores limpos. Retorna quantos
+        valores foram limpos em cada coluna (apenas colunas com ocorrências).
+        """
+        counts: Dict[str, int] = {}
+        by_name = bool(batch_data) and isinstance(batch_data[0], dict)
+        for position, column in self.get_cleaning_plan(table):
+            key = column if by_name else position
+            cleaned = 0
+            for index, row in enumerate(batch_data):
+                value = row[key]
+                if value.__class__ is str and '\x00' in value:
+                    if not isinstance(row, (dict, list)):
+                        row = batch_data[index] = list(row)
+                    row[key] = value.replace('\x00', '').strip()
+                    cleaned += 1
+            if cleaned:
+                counts[column] = cleaned
+        
+        if counts:
+            with self._lock:
+                self._transformations_applied += sum(counts.values())
+        return counts
+    
+    def get_coercion_plan(
+        self, table: Table, coercer_for: Callable[[Column], Optional[Callable[[Any], Any]]]
+    ) -> List[Tuple[int, str, Callable[[Any], Any]]]:
+        """Posição, nome e conversor das colunas da origem que precisam de conversão."""
+        plan = self._coercion_plans.get(table.fullname)
+        if plan is None:
+            plan = []
+            for position, col in enumerate(table.columns):
+                coercer = coercer_for(col)
+                if coercer is not None:
+                    plan.append((position, col.name, coercer))
+            self._coercion_plans[table.fullname] = plan
+        return plan
+    
+    @staticmethod
+    def coerce_batch(plan: List[Tuple[int, str, Callable[[Any], Any]]], batch_data: List[Any]) -> None:
+        """Aplica os conversores do plano ao batch, no lugar (como clean_batch)."""
+        by_name = bool(batch_data) and isinstance(batch_data[0], dict)
+        for index, row in enumerate(batch_data):
+            if not isinstance(row, (dict, list)):
+                row = batch_data[index] = list(row)
+            for position, column, coerce in plan:
+                key = column if by_name else position
+                row[key] = coerce(row[key])
+    
     def get_transformations_count(self) -> int:
         return self._transformations_applied
\ No newline at end of file
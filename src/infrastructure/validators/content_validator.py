@@ -0,0 +1,283 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set, Tuple
+from sqlalchemy import Table, select, func, literal_column, and_, or_
+from sqlalchemy.engine import Engine
+from src.domain.interfaces.source_repository import ISourceRepository
+from src.infrastructure.validators.value_normalizer import ValueNormalizer
+
+# Faixa [início, fim) da chave primária; cada lado é uma tupla de valores da
+# chave (ordem lexicográfica) ou None, que deixa o lado aberto
+KeyRange = Tuple[Optional[Tuple[Any, ...]], Optional[Tuple[Any, ...]]]
+
+STATUS_MATCH = 'match'
+STATUS_MISMATCH = 'mismatch'
+STATUS_COUNT_ONLY = 'count_only'
+
+class ContentValidator:
+    """Compara o conteúdo de origem e destino por hashes calculados no servidor.
+    
+    A tabela é dividida em buckets por faixas da chave primária e cada banco
+    devolve apenas a quantidade e a soma dos hashes das linhas de cada bucket.
+    Só os buckets diferentes são subdivididos; abaixo de leaf_rows linhas são
+    comparados chave a chave (chave e hash, nunca a linha inteira). Linhas
+    cujo texto teve NUL removido na carga são listadas à parte (cleaned), sem
+    contar como divergência. Chaves
+    compostas são divididas pela tupla inteira, de modo que uma coluna líder
+    com poucos valores distintos não gera buckets grandes demais.
+    """
+    
+    def __init__(self, source_repository: ISourceRepository, source_engine: Engine,
+                 target_engine: Engine, buckets: int = 64, leaf_rows: int = 1000,
+                 max_reported: int = 100) -> None:
+        self.source_repository = source_repository
+        self.source_engine = source_engine
+        self.target_engine = target_engine
+        self.buckets = max(2, buckets)
+        self.leaf_rows = leaf_rows
+        self.max_reported = max_reported
+        self.normalizer = ValueNormalizer()
+    
+    def validate_table(self, source_table: Table, target_table: Table) -> Dict[str, Any]:
+        """Valida uma tabela; retorna status, totais e as chaves divergentes encontradas."""
+        result: Dict[str, Any] = {
+            'table': source_table.name,
+            'status': STATUS_MATCH,
+            'source_rows': 0,
+            'target_rows': 0,
+            'buckets_compared': 0,
+            'missing': [],
+            'extra': [],
+            'different': [],
+            'missing_count': 0,
+            'extra_count': 0,
+            'different_count': 0,
+            'cleaned': [],
+            'cleaned_count': 0,
+        }
+        
+        if not (self.normalizer.supports(self.source_engine.dialect)
+                and self.normalizer.supports(self.target_engine.dialect)):
+            # Sem hash no servidor para o banco: apenas a contagem
+            result['status'] = STATUS_COUNT_ONLY
+            result['source_rows'] = self._count(self.source_engine, source_table)
+            result['target_rows'] = self._count(self.target_engine, target_table)
+            if result['source_rows'] != result['target_rows']:
+                result['status'] = STATUS_MISMATCH
+            return result
+        
+        kinds = {
+            name: kind for name, kind in self.normalizer.column_kinds(target_table).items()
+            if name in source_table.c
+        }
+        hashes = (
+            self.normalizer.row_hash(self.source_engine.dialect, source_table, kinds),
+            self.normalizer.row_hash(self.target_engine.dialect, target_table, kinds),
+        )
+        cleaned_flag = self.normalizer.cleaned_flag(self.source_engine.dialect, kinds)
+        pk_columns = self.source_repository.get_primary_key_columns(source_table)
+        tables = (source_table, target_table)
+        
+        if not pk_columns:
+            # Sem chave não há faixas nem linhas identificáveis: um único bucket
+            (source, target), = self._digests(tables, hashes, None, [(None, None)])
+            result['buckets_compared'] = 1
+            result['source_rows'], result['target_rows'] = source[0], target[0]
+            if source != target:
+                result['status'] = STATUS_MISMATCH
+            return result
+        
+        ranges = self._split(source_table, pk_columns, (None, None))
+        leaves: List[KeyRange] = []
+        top_level = True
+        while ranges:
+            digests = self._digests(tables, hashes, pk_columns, ranges)
+            result['buckets_compared'] += len(ranges)
+            if top_level:
+                result['source_rows'] = sum(source[0] for source, _ in digests)
+                result['target_rows'] = sum(target[0] for _, target in digests)
+                top_level = False
+            
+            next_ranges: List[KeyRange] = []
+            for key_range, (source, target) in zip(ranges, digests):
+                if source == target:
+                    continue
+                sub_ranges: List[KeyRange] = []
+                if max(source[0], target[0]) > self.leaf_rows:
+                    sub_ranges = self._split(source_table, pk_columns, key_range)
+                if len(sub_ranges) > 1:
+                    next_ranges.extend(sub_ranges)
+                else:
+                    leaves.append(key_range)
+            ranges = next_ranges
+        
+        missing: Dict[Tuple[Any, ...], int] = {}
+        extra: Dict[Tuple[Any, ...], int] = {}
+        different: List[Tuple[Any, ...]] = []
+        cleaned: List[Tuple[Any, ...]] = []
+        cleaned_keys: Set[Tuple[Any, ...]] = set()
+        for key_range in leaves:
+            source_rows, target_rows, range_cleaned = self._row_hashes(
+                tables, hashes, pk_columns, key_range, cleaned_flag
+            )
+            cleaned_keys |= range_cleaned
+            for key, row_hash in source_rows.items():
+                if key not in target_rows:
+                    missing[key] = row_hash
+                elif target_rows[key] != row_hash:
+                    (cleaned if key in cleaned_keys else different).append(key)
+            for key, row_hash in target_rows.items():
+                if key not in source_rows:
+                    extra[key] = row_hash
+        
+        # Com collations diferentes uma chave pode cair em faixas diferentes em
+        # cada banco: aparece como ausente em uma folha e extra em outra
+        for key in [key for key in missing if key in extra]:
+            if missing.pop(key) != extra.pop(key):
+                (cleaned if key in cleaned_keys else different).append(key)
+        
+        for name, keys in (('missing', list(missing)), ('extra', list(extra)),
+                           ('different', different), ('cleaned', cleaned)):
+            result[name] = keys[:self.max_reported]
+            result[f'{name}_count'] = len(keys)
+        
+        if (missing or extra or different
+                or result['source_rows'] != result['target_rows']):
+            result['status'] = STATUS_MISMATCH
+        return result
+    
+    def _split(self, source_table: Table, pk_columns: List[str],
+               key_range: KeyRange) -> List[KeyRange]:
+        """Divide a faixa em até self.buckets faixas, com fronteiras calculadas na origem."""
+        lower, upper = key_range
+        if len(pk_columns) == 1:
+            # Chave simples: histograma ou MIN/MAX, sem percorrer a faixa
+            column_range = (lower[0] if lower else None, upper[0] if upper else None)
+            boundaries = [(boundary,) for boundary in self.source_repository.get_shard_boundaries(
+                source_table, pk_columns[0], self.buckets,
+                None if key_range == (None, None) else column_range
+            )]
+        else:
+            boundaries = self._key_quantiles(source_table, pk_columns, key_range)
+        boundaries = [boundary for boundary in boundaries if boundary != lower]
+        return list(zip([lower] + boundaries, boundaries + [upper]))
+    
+    def _key_quantiles(self, table: Table, pk_columns: List[str],
+                       key_range: KeyRange) -> List[Tuple[Any, ...]]:
+        """Fronteiras a cada total/buckets linhas na ordem da chave composta inteira.
+        
+        Calculadas no servidor lendo só as colunas da chave; voltam apenas as
+        fronteiras, não as chaves da faixa.
+        """
+        columns = [table.c[name] for name in pk_columns]
+        predicates = self._range_predicates(table, pk_columns, key_range)
+        with self.source_engine.connect() as conn:
+            total = conn.execute(select(func.count()).select_from(table).where(*predicates)).scalar()
+            if not total or total < self.buckets:
+                return []
+            
+            step = -(-total // self.buckets)
+            ranked = select(
+                *columns, func.row_number().over(order_by=columns).label('key_position')
+            ).where(*predicates).subquery()
+            query = (
+                select(*[ranked.c[name] for name in pk_columns])
+                .where(ranked.c.key_position % step == 0)
+                .order_by(ranked.c.key_position)
+            )
+            return [tuple(row) for row in conn.execute(query)]
+    
+    def _digests(self, tables: Tuple[Table, Table], hashes: Tuple[str, str],
+                 pk_columns: Optional[List[str]], ranges: List[KeyRange]
+                 ) -> List[Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """(quantidade, soma dos hashes) de cada faixa, calculados nos dois bancos ao mesmo tempo."""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            source = executor.submit(self._side_digests, self.source_engine, tables[0],
+                                     hashes[0], pk_columns, ranges)
+            target = executor.submit(self._side_digests, self.target_engine, tables[1],
+                                     hashes[1], pk_columns, ranges)
+            return list(zip(source.result(), target.result()))
+    
+    def _side_digests(self, engine: Engine, table: Table, row_hash: str,
+                      pk_columns: Optional[List[str]], ranges: List[KeyRange]) -> List[Tuple[int, int]]:
+        count, digest = self.normalizer.bucket_aggregates(engine.dialect, row_hash)
+        query = select(literal_column(count), literal_column(digest)).select_from(table)
+        digests: List[Tuple[int, int]] = []
+        with engine.connect() as conn:
+            for key_range in ranges:
+                bucket_query = query
+                if pk_columns:
+                    bucket_query = query.where(*self._range_predicates(table, pk_columns, key_range))
+                rows, total = conn.execute(bucket_query).one()
+                digests.append((int(rows), int(total)))
+        return digests
+    
+    def _row_hashes(self, tables: Tuple[Table, Table], hashes: Tuple[str, str],
+                    pk_columns: List[str], key_range: KeyRange, cleaned_flag: Optional[str]
+                    ) -> Tuple[Dict[Tuple[Any, ...], int], Dict[Tuple[Any, ...], int],
+                               Set[Tuple[Any, ...]]]:
+        """Chave e hash de cada linha da faixa, na origem e no destino.
+        
+        Também retorna as chaves da origem com texto limpo na carga (cleaned_flag).
+        """
+        key_count = len(pk_columns)
+        
+        def read(engine: Engine, table: Table, row_hash: str, flag: Optional[str] = None
+                 ) -> Tuple[Dict[Tuple[Any, ...], int], Set[Tuple[Any, ...]]]:
+            extra_columns = [literal_column(row_hash)]
+            if flag is not None:
+                extra_columns.append(literal_column(flag))
+            query = select(
+                *[table.c[name] for name in pk_columns], *extra_columns
+            ).where(*self._range_predicates(table, pk_columns, key_range))
+            rows: Dict[Tuple[Any, ...], int] = {}
+            flagged: Set[Tuple[Any, ...]] = set()
+            with engine.connect() as conn:
+                for row in conn.execute(query):
+                    key = tuple(row[:key_count])
+                    rows[key] = row[key_count]
+                    if flag is not None and row[key_count + 1]:
+                        flagged.add(key)
+            return rows, flagged
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            source = executor.submit(read, self.source_engine, tables[0], hashes[0], cleaned_flag)
+            target = executor.submit(read, self.target_engine, tables[1], hashes[1])
+            (source_rows, flagged), (target_rows, _) = source.result(), target.result()
+            return source_rows, target_rows, flagged
+    
+    @classmethod
+    def _range_predicates(cls, table: Table, pk_columns: List[str], key_range: KeyRange) -> List[Any]:
+        """Condições da faixa [início, fim) da chave; None deixa o lado aberto."""
+        columns = [table.c[name] for name in pk_columns]
+        lower, upper = key_range
+        predicates = []
+        if lower is not None:
+            predicates.append(cls._key_bound(columns, lower, is_lower=True))
+        if upper is not None:
+            predicates.append(cls._key_bound(columns, upper, is_lower=False))
+        return predicates
+    
+    @staticmethod
+    def _key_bound(columns: List[Any], values: Tuple[Any, ...], is_lower: bool) -> Any:
+        """chave >= values (is_lower) ou chave < values, na ordem lexicográfica.
+        
+        O SQL Server não compara tuplas, então a expansão é explícita; o termo
+        na primeira coluna na frente permite seek no índice.
+        """
+        if len(columns) == 1:
+            return columns[0] >= values[0] if is_lower else columns[0] < values[0]
+        
+        clauses = []
+        for position, column in enumerate(columns):
+            equal_prefix = [columns[i] == values[i] for i in range(position)]
+            beyond = column > values[position] if is_lower else column < values[position]
+            clauses.append(and_(*equal_prefix, beyond))
+        if is_lower:
+            clauses.append(and_(*[column == value for column, value in zip(columns, values)]))
+        leading = columns[0] >= values[0] if is_lower else columns[0] <= values[0]
+        return and_(leading, or_(*clauses))
+    
+    @staticmethod
+    def _count(engine: Engine, table: Table) -> int:
+        with engine.connect() as conn:
+            return conn.execute(select(func.count()).select_from(table)).scalar() or 0
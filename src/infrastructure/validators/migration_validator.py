@@ -1,4 +1,4 @@
-from sqlalchemy import Table, select, func
+from sqlalchemy import Table, select, func, inspect
 from sqlalchemy.engine import Engine
 
 class MigrationValidator:
@@ -24,4 +24,4 @@ class MigrationValidator:
     
     def validate_table_exists(self, table_name: str, engine: Engine) -> bool:
         """Verifica se a tabela existe no banco de dados."""
-        return engine.dialect.has_table(engine, table_name)
\ No newline at end of file
+        return inspect(engine).has_table(table_name)
\ No newline at end of file
@@ -0,0 +1,194 @@
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import Column, Table
+from sqlalchemy import types as sqltypes
+from sqlalchemy.engine import Dialect
+
+# Texto de NULL na linha canônica (mesma convenção do COPY)
+NULL_TEXT = '\\N'
+SEPARATOR = '|'
+
+# Como cada tipo do destino é escrito como texto em cada banco. O formato é o
+# mesmo dos dois lados: datas ISO com microssegundos, float arredondado a 6
+# casas, binário em hexadecimal maiúsculo, booleano como 0/1
+_RENDERERS: Dict[str, Dict[str, str]] = {
+    'postgresql': {
+        'integer': "{col}::text",
+        'boolean': "({col})::int::text",
+        'decimal': "{col}::text",
+        'float': "CAST({col} AS NUMERIC(38, 6))::text",
+        'datetime': "to_char({col}, 'YYYY-MM-DD HH24:MI:SS.US')",
+        'datetimetz': "to_char({col} AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI:SS.US')",
+        'date': "to_char({col}, 'YYYY-MM-DD')",
+        'time': "to_char(DATE '2000-01-01' + {col}, 'HH24:MI:SS.US')",
+        'binary': "upper(encode({col}, 'hex'))",
+        'uuid': "upper({col}::text)",
+        'char': "rtrim({col}::text)",
+        'text': "{col}::text",
+    },
+    'mssql': {
+        'integer': "CONVERT(VARCHAR(20), {col})",
+        'boolean': "CONVERT(VARCHAR(1), CAST({col} AS INT))",
+        'decimal': "CONVERT(VARCHAR(40), {col})",
+        'float': "CONVERT(VARCHAR(40), CAST({col} AS DECIMAL(38, 6)))",
+        'datetime': "CONVERT(VARCHAR(26), CAST({col} AS DATETIME2(6)), 121)",
+        'datetimetz': "CONVERT(VARCHAR(26), CAST(SWITCHOFFSET({col}, '+00:00') AS DATETIME2(6)), 121)",
+        'date': "CONVERT(VARCHAR(10), {col}, 23)",
+        'time': "CONVERT(VARCHAR(15), CAST({col} AS TIME(6)))",
+        'binary': "CONVERT(VARCHAR(MAX), {col}, 2)",
+        'uuid': "CONVERT(VARCHAR(36), {col})",
+        'char': "RTRIM({col})",
+        'text': "CAST({col} AS NVARCHAR(MAX))",
+    },
+}
+
+# Colunas do SQL Server gravadas como texto no destino (tabelas criadas antes
+# do mapeamento nativo de tipos): o texto é o str() do valor lido pelo pyodbc
+_MSSQL_AS_TEXT: Dict[str, str] = {
+    'MONEY': "CONVERT(VARCHAR(30), {col}, 2)",
+    'SMALLMONEY': "CONVERT(VARCHAR(30), {col}, 2)",
+    'DATETIME2': ("CASE WHEN DATEPART(MICROSECOND, {col}) = 0 "
+                  "THEN CONVERT(VARCHAR(19), {col}, 120) "
+                  "ELSE CONVERT(VARCHAR(26), CAST({col} AS DATETIME2(6)), 121) END"),
+    'SMALLDATETIME': "CONVERT(VARCHAR(19), {col}, 120)",
+    'DATE': "CONVERT(VARCHAR(10), {col}, 23)",
+    'UNIQUEIDENTIFIER': "CONVERT(VARCHAR(36), {col})",
+}
+
+# MONEY vira NUMERIC(19, 4) no destino; o CONVERT padrão teria só 2 casas
+_MSSQL_AS_DECIMAL: Dict[str, str] = {
+    'MONEY': "CONVERT(VARCHAR(40), CAST({col} AS DECIMAL(19, 4)))",
+    'SMALLMONEY': "CONVERT(VARCHAR(40), CAST({col} AS DECIMAL(10, 4)))",
+}
+
+# DATETIME tem precisão de 1/300 s: o CAST direto para DATETIME2(6) daria
+# .003333/.006667, mas o pyodbc entrega os milissegundos arredondados (.003/.007)
+_MSSQL_AS_DATETIME: Dict[str, str] = {
+    'DATETIME': "CONVERT(VARCHAR(26), CAST(CAST({col} AS DATETIME2(3)) AS DATETIME2(6)), 121)",
+}
+
+# Hash da linha: 7 primeiros bytes do MD5 do texto em UTF-8, como BIGINT
+_ROW_HASH: Dict[str, str] = {
+    'postgresql': "('x' || substr(md5({text}), 1, 14))::bit(56)::bigint",
+    'mssql': ("CONVERT(BIGINT, SUBSTRING(HASHBYTES('MD5', "
+              "CAST({text} COLLATE Latin1_General_100_BIN2_UTF8 AS VARCHAR(MAX))), 1, 7))"),
+}
+
+# Valores por CONCAT_WS: funções do PostgreSQL aceitam até 100 argumentos
+# (FUNC_MAX_ARGS), contando o separador
+_CONCAT_MAX_VALUES = 99
+
+# Texto da origem com NUL: a carga remove o NUL e as bordas em branco do valor
+# (limpeza do DataTransformer), então o hash da linha difere de propósito. O
+# PostgreSQL não guarda NUL em texto
+_HAS_NUL: Dict[str, str] = {
+    'mssql': "CHARINDEX(NCHAR(0), CAST({col} AS NVARCHAR(MAX)) COLLATE Latin1_General_100_BIN2) > 0",
+}
+
+# Agregados de um bucket: quantidade de linhas e soma dos hashes (independe da ordem)
+_BUCKET_AGGREGATES: Dict[str, Tuple[str, str]] = {
+    'postgresql': ("count(*)", "coalesce(sum({hash}), 0)"),
+    'mssql': ("COUNT_BIG(*)", "COALESCE(SUM(CAST({hash} AS DECIMAL(38, 0))), 0)"),
+}
+
+class ValueNormalizer:
+    """Monta, para cada banco, o texto canônico e o hash de uma linha no próprio servidor.
+    
+    O tipo de cada coluna é o do destino, isto é, o resultado do TypeConverter;
+    a origem é escrita como o valor chegou ao destino. Assim linhas iguais
+    produzem o mesmo hash no SQL Server (HASHBYTES) e no PostgreSQL (md5).
+    Requer SQL Server 2019+ (CONCAT_WS e collation UTF-8).
+    """
+    
+    @staticmethod
+    def supports(dialect: Dialect) -> bool:
+        return dialect.name in _RENDERERS
+    
+    @staticmethod
+    def column_kind(column: Column) -> str:
+        """Classifica o tipo da coluna do destino na categoria de formatação."""
+        column_type = column.type
+        if isinstance(column_type, sqltypes.Boolean):
+            return 'boolean'
+        if isinstance(column_type, sqltypes.Integer):
+            return 'integer'
+        if isinstance(column_type, sqltypes.Float):
+            return 'float'
+        if isinstance(column_type, sqltypes.Numeric):
+            return 'decimal'
+        if isinstance(column_type, sqltypes.DateTime):
+            return 'datetimetz' if column_type.timezone else 'datetime'
+        if isinstance(column_type, sqltypes.Date):
+            return 'date'
+        if isinstance(column_type, sqltypes.Time):
+            return 'time'
+        if isinstance(column_type, sqltypes._Binary):
+            return 'binary'
+        if isinstance(column_type, sqltypes.Uuid):
+            return 'uuid'
+        if isinstance(column_type, sqltypes.CHAR):
+            return 'char'
+        return 'text'
+    
+    def column_kinds(self, target_table: Table) -> Dict[str, str]:
+        return {column.name: self.column_kind(column) for column in target_table.columns}
+    
+    def row_text(self, dialect: Dialect, table: Table, kinds: Dict[str, str]) -> str:
+        """Expressão com o texto canônico da linha (colunas separadas por '|').
+        
+        Acima de _CONCAT_MAX_VALUES colunas os CONCAT_WS são aninhados em grupos;
+        como nenhuma parte é NULL, o texto é o mesmo de uma única chamada.
+        """
+        renderers = _RENDERERS[dialect.name]
+        preparer = dialect.identifier_preparer
+        parts: List[str] = []
+        for name, kind in kinds.items():
+            column = preparer.quote(name)
+            template = self._source_template(dialect, table.c[name], kind) or renderers[kind]
+            parts.append(f"COALESCE({template.format(col=column)}, '{NULL_TEXT}')")
+        
+        separator = f"N'{SEPARATOR}'" if dialect.name == 'mssql' else f"'{SEPARATOR}'"
+        while len(parts) > _CONCAT_MAX_VALUES:
+            parts = [
+                self._concat(separator, parts[start:start + _CONCAT_MAX_VALUES])
+                for start in range(0, len(parts), _CONCAT_MAX_VALUES)
+            ]
+        return self._concat(separator, parts)
+    
+    @staticmethod
+    def _concat(separator: str, parts: List[str]) -> str:
+        if len(parts) == 1:
+            return parts[0]
+        return f"CONCAT_WS({separator}, {', '.join(parts)})"
+    
+    def cleaned_flag(self, dialect: Dialect, kinds: Dict[str, str]) -> Optional[str]:
+        """Expressão 1/0 que indica se a carga limpou algum texto da linha (NUL).
+        
+        None quando o banco não guarda NUL em texto ou a tabela não tem texto.
+        """
+        template = _HAS_NUL.get(dialect.name)
+        columns = [name for name, kind in kinds.items() if kind in ('text', 'char')]
+        if template is None or not columns:
+            return None
+        preparer = dialect.identifier_preparer
+        tests = ' OR '.join(template.format(col=preparer.quote(name)) for name in columns)
+        return f"CASE WHEN {tests} THEN 1 ELSE 0 END"
+    
+    def row_hash(self, dialect: Dialect, table: Table, kinds: Dict[str, str]) -> str:
+        """Expressão BIGINT com o hash do texto canônico da linha."""
+        return _ROW_HASH[dialect.name].format(text=self.row_text(dialect, table, kinds))
+    
+    def bucket_aggregates(self, dialect: Dialect, row_hash: str) -> Tuple[str, str]:
+        """Expressões de contagem e soma dos hashes de um bucket."""
+        count, digest = _BUCKET_AGGREGATES[dialect.name]
+        return count, digest.format(hash=row_hash)
+    
+    @staticmethod
+    def _source_template(dialect: Dialect, column: Column, kind: str) -> Optional[str]:
+        """Formato especial de tipos da origem cujo texto padrão difere do destino."""
+        overrides = {
+            'text': _MSSQL_AS_TEXT, 'decimal': _MSSQL_AS_DECIMAL, 'datetime': _MSSQL_AS_DATETIME
+        }.get(kind)
+        if dialect.name != 'mssql' or overrides is None:
+            return None
+        type_name = str(column.type).split('(')[0].upper()
+        return overrides.get(type_name)
@@ -0,0 +1,112 @@
+"""Compara o BinaryCopyEncoder byte a byte com a saída do PostgreSQL.
+
+Os valores esperados foram capturados com
+``COPY (SELECT ...) TO STDOUT (FORMAT binary)`` em um PostgreSQL 16, de modo
+que os testes não dependem de um servidor para rodar.
+"""
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+import pytest
+from sqlalchemy import types as sqltypes
+from src.infrastructure.loaders.binary_copy_encoder import BinaryCopyEncoder
+
+NUMERIC_COPY = (
+    '5047434f50590aff0d0a000000000000000000000100000008000000000000000000010000000c'
+    '0002000000000002007b119400010000000c0002000040000002007b119400010000000a0001ff'
+    'ff00000004000100010000000c0002ffff40000006000108fc00010000000a0001000000000002'
+    '006400010000000a0001000100000000000a000100000018000800040000000904d2162e23340d'
+    '801ed204d2162e232800010000000800000000c00000000001ffffffffffff'
+)
+TIMESTAMP_COPY = (
+    '5047434f50590aff0d0a00000000000000000000010000000800023e1212a88614000100000008'
+    'ffffffffffffffff000100000008fff4c9ee7c0b80000001ffffffffffff'
+)
+TIMESTAMPTZ_COPY = (
+    '5047434f50590aff0d0a00000000000000000000010000000800024a00c9dbc520000100000008'
+    '00000000d693a4000001ffffffffffff'
+)
+DATE_COPY = (
+    '5047434f50590aff0d0a00000000000000000000010000000400000000000100000004ffffffff'
+    '000100000004000022790001ffffffffffff'
+)
+BYTEA_COPY = (
+    '5047434f50590aff0d0a00000000000000000000010000000000010000000300ff100001ffffff'
+    'ffffff'
+)
+TEXT_COPY = (
+    '5047434f50590aff0d0a00000000000000000000010000000000010000001161c3a7c3a36f20e2'
+    '9c9320e697a5e69cac0001ffffffffffff'
+)
+ROW_COPY = (
+    '5047434f50590aff0d0a000000000000000000000400000004000000070000000a53c3a36f2050'
+    '61756c6fffffffff0000000101ffff'
+)
+
+def _encode(column_types, rows, column_names):
+    return BinaryCopyEncoder(column_types).encode(rows, column_names).read()
+
+@pytest.mark.parametrize('type_, values, expected', [
+    pytest.param(
+        sqltypes.Numeric(),
+        [Decimal('0'), Decimal('123.45'), Decimal('-123.45'), Decimal('0.0001'),
+         Decimal('-0.000123'), Decimal('100.00'), Decimal('1E+5'),
+         Decimal('12345678901234567890.123456789'), Decimal('NaN'), None],
+        NUMERIC_COPY, id='numeric'),
+    pytest.param(
+        sqltypes.DateTime(),
+        [datetime(2020, 1, 1, 12, 34, 56, 789012), datetime(1999, 12, 31, 23, 59, 59, 999999),
+         datetime(1900, 1, 1), None],
+        TIMESTAMP_COPY, id='timestamp'),
+    pytest.param(
+        sqltypes.DateTime(timezone=True),
+        [datetime(2020, 6, 1, 12, 0, 0, 500000, tzinfo=timezone(timedelta(hours=3))),
+         datetime(1999, 12, 31, 23, 0, tzinfo=timezone(timedelta(hours=-2))), None],
+        TIMESTAMPTZ_COPY, id='timestamptz'),
+    pytest.param(
+        sqltypes.Date(),
+        [date(2000, 1, 1), date(1999, 12, 31), date(2024, 2, 29), None],
+        DATE_COPY, id='date'),
+    pytest.param(
+        sqltypes.LargeBinary(),
+        [b'', b'\x00\xff\x10', None],
+        BYTEA_COPY, id='bytea'),
+    pytest.param(
+        sqltypes.Text(),
+        ['', 'ação ✓ 日本', None],
+        TEXT_COPY, id='text'),
+])
+def test_coluna_igual_ao_copy_do_postgres(type_, values, expected):
+    rows = [(value,) for value in values]
+    assert _encode([type_], rows, ['v']) == bytes.fromhex(expected)
+
+def test_linha_de_dicionario_com_varias_colunas():
+    types = [sqltypes.Integer(), sqltypes.String(50), sqltypes.Numeric(10, 2), sqltypes.Boolean()]
+    names = ['id', 'cidade', 'valor', 'ativo']
+    rows = [{'id': 7, 'cidade': 'São Paulo', 'valor': None, 'ativo': True}]
+    assert _encode(types, rows, names) == bytes.fromhex(ROW_COPY)
+
+def test_buffer_reutilizado_entre_lotes():
+    encoder = BinaryCopyEncoder([sqltypes.Text()])
+    first = encoder.encode([('ação ✓ 日本',)] * 100, ['v']).read()
+    second = encoder.encode([('',), ('ação ✓ 日本',), (None,)], ['v']).read()
+    assert len(first) > len(second)
+    assert second == bytes.fromhex(TEXT_COPY)
+
+def test_timestamptz_sem_fuso_recai_no_formato_texto():
+    # O COPY texto e o INSERT aplicam o TimeZone da sessão a valores sem fuso;
+    # o binário não tem essa conversão, então o lote não pode usá-lo
+    encoder = BinaryCopyEncoder([sqltypes.Integer(), sqltypes.DateTime(timezone=True)])
+    names = ['id', 'v']
+    aware = (1, datetime(2020, 6, 1, 12, 0, 0, 500000, tzinfo=timezone(timedelta(hours=3))))
+    naive = (2, datetime(2020, 6, 1, 12, 0))
+
+    assert encoder.accepts([aware, (3, None)], names)
+    assert not encoder.accepts([aware, naive], names)
+    assert not encoder.accepts([{'id': 2, 'v': naive[1]}], names)
+    with pytest.raises(ValueError):
+        encoder.encode([naive], names)
+
+def test_timestamp_sem_fuso_continua_binario():
+    encoder = BinaryCopyEncoder([sqltypes.DateTime()])
+    rows = [(datetime(2020, 1, 1, 12, 34, 56, 789012),)]
+    assert encoder.accepts(rows, ['v'])
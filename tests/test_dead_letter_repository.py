@@ -0,0 +1,65 @@
+"""Arquivos do dead letter durante o reprocessamento e gravação após o commit."""
+import os
+from decimal import Decimal
+from sqlalchemy import Column, MetaData, Table, create_engine, types as sqltypes
+from src.infrastructure.repositories.dead_letter_repository import DeadLetterRepository
+from src.infrastructure.repositories.load_session import LoadSession
+
+TABLE = Table(
+    'pedidos', MetaData(),
+    Column('id', sqltypes.Integer, primary_key=True),
+    Column('valor', sqltypes.Numeric(10, 2)),
+)
+
+def _pending(repository):
+    return [row for row, _ in repository.read('pedidos')]
+
+def test_falhas_do_reprocessamento_so_substituem_o_arquivo_no_archive(tmp_path):
+    repository = DeadLetterRepository(str(tmp_path))
+    repository.write(TABLE, [((1, Decimal('1.50')), 'erro 1'), ((2, None), 'erro 2')])
+    
+    repository.begin_replay('pedidos')
+    repository.write_retry(TABLE, [((2, None), 'erro de novo')])
+    # Interrompido antes do archive: as linhas originais continuam pendentes
+    assert repository.tables() == ['pedidos']
+    assert _pending(repository) == [{'id': 1, 'valor': Decimal('1.50')}, {'id': 2, 'valor': None}]
+    
+    repository.archive('pedidos')
+    assert _pending(repository) == [{'id': 2, 'valor': None}]
+    assert len([name for name in os.listdir(tmp_path) if name.endswith('.replayed')]) == 1
+
+def test_begin_replay_descarta_falhas_de_reprocessamento_interrompido(tmp_path):
+    repository = DeadLetterRepository(str(tmp_path))
+    repository.write(TABLE, [((1, None), 'erro')])
+    repository.write_retry(TABLE, [((1, None), 'erro antigo')])
+    
+    repository.begin_replay('pedidos')
+    repository.archive('pedidos')
+    assert repository.tables() == []
+
+def test_archives_seguidos_nao_se_sobrescrevem(tmp_path):
+    repository = DeadLetterRepository(str(tmp_path))
+    for row_id in (1, 2):
+        repository.write(TABLE, [((row_id, None), 'erro')])
+        repository.archive('pedidos')
+    assert len([name for name in os.listdir(tmp_path) if name.endswith('.replayed')]) == 2
+
+def test_on_commit_espera_o_commit_da_sessao(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'destino.db'}")
+    session = LoadSession(engine, {}, commit_every=3)
+    called = []
+    try:
+        for batch in range(2):
+            with session.transaction():
+                pass
+            session.on_commit(lambda batch=batch: called.append(batch))
+        assert called == []
+        with session.transaction():
+            pass
+        assert called == [0, 1]
+        # Sem batches pendentes a ação roda na hora
+        session.on_commit(lambda: called.append('agora'))
+        assert called == [0, 1, 'agora']
+    finally:
+        session.close()
+        engine.dispose()
@@ -0,0 +1,77 @@
+"""Carga por INSERT posicional (ROW_FORMAT 'tuple' e 'arrow') em um destino SQLite.
+
+O SQLite não aceita Decimal, UUID, date nem dict como parâmetro: os valores
+só chegam ao banco se os bind processors das colunas forem aplicados.
+"""
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+import pytest
+from sqlalchemy import Column, MetaData, Table, create_engine, select, types as sqltypes
+from src.infrastructure.repositories.target_repository import TargetRepository
+
+ROWS = [
+    (1, Decimal('-123.45'), uuid.UUID('12345678-1234-5678-1234-567812345678'), date(2024, 2, 29),
+     {'chave': 'ação', 'itens': [1, 2]}),
+    (2, Decimal('0.01'), uuid.UUID('00000000-0000-0000-0000-000000000001'), date(1999, 12, 31),
+     []),
+    (3, None, None, None, None),
+]
+
+@pytest.fixture
+def target(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'destino.db'}")
+    metadata = MetaData()
+    table = Table(
+        'valores', metadata,
+        Column('id', sqltypes.Integer, primary_key=True),
+        Column('valor', sqltypes.Numeric(10, 2)),
+        Column('codigo', sqltypes.Uuid()),
+        Column('dia', sqltypes.Date()),
+        Column('extra', sqltypes.JSON(none_as_null=True)),
+    )
+    metadata.create_all(engine)
+    yield engine, table
+    engine.dispose()
+
+def _loaded(engine, table):
+    with engine.connect() as conn:
+        return [tuple(row) for row in conn.execute(select(table).order_by(table.c.id))]
+
+def test_insert_posicional_aplica_bind_processors(target):
+    engine, table = target
+    assert TargetRepository(engine).insert_batch(table, ROWS)
+    assert _loaded(engine, table) == ROWS
+
+def test_insert_isolating_posicional_aplica_bind_processors(target):
+    engine, table = target
+    rows = ROWS + [(1, Decimal('9.99'), None, None, None)]
+    rejected = TargetRepository(engine).insert_isolating(table, rows)
+    assert [position for position, _ in rejected] == [3]
+    assert _loaded(engine, table) == ROWS
+
+def test_insert_de_record_batch(target):
+    pytest.importorskip('pyarrow')
+    from src.infrastructure.serializers.arrow_codec import ArrowBatchCodec
+    engine, table = target
+    metadata = MetaData()
+    # Tabela com os tipos da origem: o RecordBatch é montado a partir deles
+    source = Table(
+        'valores', metadata,
+        Column('id', sqltypes.Integer),
+        Column('valor', sqltypes.Numeric(10, 2)),
+        Column('dia', sqltypes.Date()),
+        Column('registro', sqltypes.DateTime()),
+    )
+    target_table = Table(
+        'valores_arrow', table.metadata,
+        *(Column(col.name, col.type) for col in source.columns),
+    )
+    target_table.create(engine)
+    rows = [
+        (1, Decimal('-123.45'), date(2024, 2, 29), datetime(2020, 1, 1, 12, 34, 56, 789012)),
+        (2, None, None, None),
+    ]
+    batch = ArrowBatchCodec(source).encode(rows)
+    assert TargetRepository(engine).insert_batch(target_table, batch)
+    assert _loaded(engine, target_table) == rows
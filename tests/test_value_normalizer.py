@@ -0,0 +1,58 @@
+"""Expressões do texto canônico da linha usadas pela validação de conteúdo."""
+from sqlalchemy import Column, MetaData, Table, types as sqltypes
+from sqlalchemy.dialects import mssql, postgresql
+from src.infrastructure.validators.value_normalizer import ValueNormalizer
+
+def _wide_table(columns):
+    return Table(
+        'larga', MetaData(),
+        Column('id', sqltypes.Integer, primary_key=True),
+        *(Column(f'c{index}', sqltypes.Text()) for index in range(columns)),
+    )
+
+def _concat_arguments(expression):
+    """Quantidade de argumentos de cada CONCAT_WS da expressão."""
+    counts = []
+    start = expression.find('CONCAT_WS(')
+    while start != -1:
+        depth, arguments, quoted = 0, 1, False
+        for char in expression[start + len('CONCAT_WS'):]:
+            if char == "'":
+                quoted = not quoted
+            elif quoted:
+                continue
+            elif char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+                if depth == 0:
+                    break
+            elif char == ',' and depth == 1:
+                arguments += 1
+        counts.append(arguments)
+        start = expression.find('CONCAT_WS(', start + 1)
+    return counts
+
+def test_concat_ws_respeita_limite_de_argumentos_do_postgres():
+    table = _wide_table(250)
+    normalizer = ValueNormalizer()
+    for dialect in (postgresql.dialect(), mssql.dialect()):
+        expression = normalizer.row_text(dialect, table, normalizer.column_kinds(table))
+        counts = _concat_arguments(expression)
+        assert len(counts) > 1
+        assert max(counts) <= 100
+
+def test_concat_ws_unico_ate_99_colunas():
+    table = _wide_table(98)
+    normalizer = ValueNormalizer()
+    expression = normalizer.row_text(postgresql.dialect(), table, normalizer.column_kinds(table))
+    assert _concat_arguments(expression) == [100]
+
+def test_marcador_de_linhas_limpas_so_no_sql_server():
+    table = _wide_table(2)
+    normalizer = ValueNormalizer()
+    kinds = normalizer.column_kinds(table)
+    assert normalizer.cleaned_flag(postgresql.dialect(), kinds) is None
+    flag = normalizer.cleaned_flag(mssql.dialect(), kinds)
+    assert flag.count('NCHAR(0)') == 2
+    assert normalizer.cleaned_flag(mssql.dialect(), {'id': 'integer'}) is None